@@ -80,6 +80,9 @@ class PageViewEventAdmin(admin.ModelAdmin):
         "ip_address",
         "user_agent",
         "referrer",
+        "url_dimension",
+        "user_agent_dimension",
+        "referrer_dimension",
         "timestamp",
         "is_unique",
     ]
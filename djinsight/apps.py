@@ -7,4 +7,4 @@ class DjInsightConfig(AppConfig):
 
     def ready(self):
         # Import signal handlers
-        pass
+        from djinsight import signals  # noqa: F401
@@ -0,0 +1,89 @@
+"""
+Read-through cache for per-object statistics and view series.
+
+Entries live on the CACHE_BACKEND cache for CACHE_TTL seconds and are keyed
+by the object's generation: writers call invalidate() for the objects they
+touch, which gives them a new generation and orphans every cached entry at
+once, without having to know which periods were cached.
+"""
+
+import uuid
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from django.core.cache import caches
+
+from djinsight.conf import djinsight_settings
+
+KEY_PREFIX = "djinsight:cache"
+
+ObjectKey = Tuple[int, int]
+
+_MISSING = object()
+
+
+def _cache():
+    return caches[djinsight_settings.CACHE_BACKEND]
+
+
+def _generation_key(content_type_id: int, object_id: int) -> str:
+    return f"{KEY_PREFIX}:gen:{content_type_id}:{object_id}"
+
+
+def get_generation(content_type_id: int, object_id: int) -> str:
+    """Return the object's current generation, starting a new one if it has none."""
+    cache = _cache()
+    key = _generation_key(content_type_id, object_id)
+    generation = cache.get(key)
+    if generation is None:
+        # A missing generation may have been evicted: never reuse an old value
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def cached(
+    content_type_id: int,
+    object_id: int,
+    name: str,
+    compute: Callable[[], Any],
+) -> Any:
+    """
+    Return the cached value ``name`` of an object, computing it on a miss.
+
+    Args:
+        content_type_id: Content type of the object
+        object_id: Primary key of the object
+        name: What is cached, e.g. "stats" or a series description
+        compute: Called without arguments on a miss; may return None
+    """
+    if not djinsight_settings.ENABLE_CACHING:
+        return compute()
+
+    cache = _cache()
+    generation = get_generation(content_type_id, object_id)
+    key = f"{KEY_PREFIX}:{content_type_id}:{object_id}:{generation}:{name}"
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, djinsight_settings.CACHE_TTL)
+    return value
+
+
+def invalidate(objects: Iterable[ObjectKey]) -> None:
+    """Start a new generation for each (content_type_id, object_id)."""
+    if not djinsight_settings.ENABLE_CACHING:
+        return
+
+    generation = uuid.uuid4().hex
+    keys = {
+        _generation_key(content_type_id, object_id): generation
+        for content_type_id, object_id in objects
+    }
+    if keys:
+        _cache().set_many(keys, None)
+
+
+def invalidate_object(content_type_id: int, object_id: Optional[int]) -> None:
+    """Start a new generation for one object."""
+    if object_id is not None:
+        invalidate([(content_type_id, object_id)])
@@ -98,8 +98,32 @@ app.conf.beat_schedule = {
             "days_to_keep": djinsight_settings.CLEANUP_DAYS_TO_KEEP,
         },
     },
+    # No-op unless the event table has been converted with partition_pageviews
+    "create-event-partitions": {
+        "task": "djinsight.tasks.create_event_partitions_task",
+        "schedule": get_schedule_from_env(
+            "DJINSIGHT_PARTITIONS_SCHEDULE",
+            crontab(hour=0, minute=30),
+        ),
+    },
+    "refresh-dashboard-snapshots": {
+        "task": "djinsight.tasks.refresh_dashboard_snapshots_task",
+        "schedule": get_schedule_from_env(
+            "DJINSIGHT_SNAPSHOTS_SCHEDULE",
+            crontab(minute="*/5"),
+        ),
+    },
 }
 
+if djinsight_settings.USE_REDIS:
+    app.conf.beat_schedule["redis-housekeeping"] = {
+        "task": "djinsight.tasks.redis_housekeeping_task",
+        "schedule": get_schedule_from_env(
+            "DJINSIGHT_HOUSEKEEPING_SCHEDULE",
+            crontab(minute="*/15"),
+        ),
+    }
+
 # Timezone configuration
 app.conf.timezone = getattr(settings, "TIME_ZONE", "UTC")
 
@@ -159,4 +183,7 @@ DJINSIGHT_ENABLE_TRACKING = True
 # DJINSIGHT_PROCESS_SCHEDULE = "10"        # Every 10 seconds (default)
 # DJINSIGHT_SUMMARIES_SCHEDULE = "*/10"    # Every 10 minutes (default)
 # DJINSIGHT_CLEANUP_SCHEDULE = "0 1 * * *"  # Daily at 1:00 AM (default)
+# DJINSIGHT_PARTITIONS_SCHEDULE = "30 0 * * *"  # Daily at 0:30 AM (default)
+# DJINSIGHT_SNAPSHOTS_SCHEDULE = "*/5"     # Every 5 minutes (default)
+# DJINSIGHT_HOUSEKEEPING_SCHEDULE = "*/15"  # Every 15 minutes (default, with Redis)
 """
@@ -0,0 +1,120 @@
+"""
+Wire format of the events buffered in Redis.
+
+Events are packed as positional binary records: a fixed header with the
+content type interned to its id, followed by length-prefixed strings. The
+user agent and referrer can be zlib-compressed with REDIS_EVENT_COMPRESS.
+The trailing byte is the is_unique flag, so the record script can append it
+without decoding the record. JSON payloads from older versions (and from
+events without a content_type_id or with ids too large for the header) are
+still decoded.
+"""
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, Tuple
+
+from djinsight.conf import djinsight_settings
+
+VERSION = 1
+
+# version, flags, content_type_id, object_id, timestamp
+HEADER = struct.Struct("<BBIII")
+MAX_HEADER_VALUE = 0xFFFFFFFF
+LENGTH = struct.Struct("<H")
+MAX_LENGTH = 0xFFFF
+
+FLAG_USER_AGENT_ZLIB = 0x01
+FLAG_REFERRER_ZLIB = 0x02
+
+COMPRESSED_FLAGS = {"user_agent": FLAG_USER_AGENT_ZLIB, "referrer": FLAG_REFERRER_ZLIB}
+
+# Values below this size don't shrink under zlib
+COMPRESS_MIN_LENGTH = 64
+
+STRING_FIELDS = ("url", "session_key", "ip_address", "user_agent", "referrer")
+
+
+def pack_event(event_data: Dict[str, Any]) -> Tuple[bytes, bytes, bytes]:
+    """
+    Encode an event without its is_unique flag.
+
+    Returns:
+        (head, unique_suffix, repeat_suffix): the payload is ``head`` followed
+        by the suffix matching the is_unique flag.
+    """
+    content_type_id = event_data.get("content_type_id")
+    header = None
+    if djinsight_settings.REDIS_EVENT_FORMAT == "binary" and content_type_id:
+        header = (
+            content_type_id,
+            int(event_data["object_id"]),
+            int(event_data.get("timestamp") or 0),
+        )
+    if header is None or not all(0 <= value <= MAX_HEADER_VALUE for value in header):
+        data = {key: value for key, value in event_data.items() if key != "is_unique"}
+        return json.dumps(data)[:-1].encode() + b', "is_unique": ', b"true}", b"false}"
+
+    compress = djinsight_settings.REDIS_EVENT_COMPRESS
+    flags = 0
+    parts = []
+    for name in STRING_FIELDS:
+        # Truncate before compressing: a cut zlib stream would not decompress
+        value = (event_data.get(name) or "").encode("utf-8")[:MAX_LENGTH]
+        if compress and name in COMPRESSED_FLAGS and len(value) >= COMPRESS_MIN_LENGTH:
+            compressed = zlib.compress(value)
+            if len(compressed) < len(value):
+                value = compressed
+                flags |= COMPRESSED_FLAGS[name]
+        parts.append(LENGTH.pack(len(value)))
+        parts.append(value)
+
+    return HEADER.pack(VERSION, flags, *header) + b"".join(parts), b"\x01", b"\x00"
+
+
+def encode_event(event_data: Dict[str, Any]) -> bytes:
+    """Encode an event including its is_unique flag."""
+    head, unique_suffix, repeat_suffix = pack_event(event_data)
+    return head + (unique_suffix if event_data.get("is_unique") else repeat_suffix)
+
+
+def decode_event(raw: bytes) -> Dict[str, Any]:
+    """
+    Decode a buffered event.
+
+    Binary records decode to a dict with content_type_id instead of the
+    content_type label; JSON payloads decode as they were written.
+
+    Raises:
+        ValueError: If the payload is malformed
+    """
+    if raw[:1] == b"{":
+        return json.loads(raw.decode("utf-8"))
+
+    try:
+        version, flags, content_type_id, object_id, timestamp = HEADER.unpack_from(raw)
+        if version != VERSION:
+            raise ValueError(f"unknown event format version {version}")
+
+        data = {
+            "content_type_id": content_type_id,
+            "object_id": object_id,
+            "timestamp": timestamp or None,
+        }
+        offset = HEADER.size
+        for name in STRING_FIELDS:
+            (length,) = LENGTH.unpack_from(raw, offset)
+            offset += LENGTH.size
+            value = raw[offset : offset + length]
+            offset += length
+            if flags and flags & COMPRESSED_FLAGS.get(name, 0):
+                value = zlib.decompress(value)
+            data[name] = value.decode("utf-8", "ignore") or None
+
+        if offset != len(raw) - 1:
+            raise ValueError("unexpected event length")
+        data["is_unique"] = raw[offset] == 1
+        return data
+    except (struct.error, zlib.error, IndexError) as e:
+        raise ValueError(f"malformed event: {e}") from e
@@ -15,9 +15,18 @@ class DjInsightSettings:
         "REDIS_PASSWORD": None,
         "REDIS_TIMEOUT": 5,
         "REDIS_CONNECT_TIMEOUT": 5,
+        "REDIS_MAX_CONNECTIONS": None,  # per-process pool size; None means unbounded
         "REDIS_KEY_PREFIX": "djinsight:pageview",
         "REDIS_EXPIRATION": 60 * 60 * 24 * 7,
+        "REDIS_INGEST_MODE": "keys",  # or "stream" (one Redis Stream)
+        "REDIS_EVENT_FORMAT": "json",  # or "binary" (packed records)
+        "REDIS_EVENT_COMPRESS": False,  # zlib-compress long user agents and referrers
+        "REDIS_STREAM_MAXLEN": 1000000,
+        "REDIS_STREAM_GROUP": "djinsight",
+        "REDIS_STREAM_CLAIM_IDLE": 300,  # seconds before stale entries are reclaimed
+        "UNIQUE_VIEWS_MODE": "session",  # "session" (marker key per visitor) or "hll"
         "TRACK_MODELS": [],
+        "TRACK_REGISTERED_ONLY": False,  # Ignore content types not in the registry
         "TRACK_ANONYMOUS": True,
         "TRACK_AUTHENTICATED": True,
         "TRACK_STAFF": True,
@@ -28,7 +37,9 @@ class DjInsightSettings:
         "PROVIDER_CLASS": None,
         "REGISTRY_CLASS": "djinsight.registry.ProviderRegistry",
         "EVENT_PROCESSOR": "djinsight.processors.DefaultEventProcessor",
-        "SESSION_TRACKER": "djinsight.trackers.SessionTracker",
+        "SESSION_TRACKER": "djinsight.trackers.VisitorTracker",
+        "VISITOR_COOKIE_NAME": "djinsight_vid",
+        "VISITOR_COOKIE_AGE": 60 * 60 * 24 * 365,
         "IP_EXTRACTOR": "djinsight.utils.get_client_ip",
         "USER_AGENT_PARSER": "djinsight.utils.parse_user_agent",
         "USE_REDIS": True,
@@ -48,13 +59,20 @@ class DjInsightSettings:
         "CLEANUP_TASK_SOFT_TIME_LIMIT": 3300,
         "SUMMARY_DAYS_BACK": 7,
         "CLEANUP_DAYS_TO_KEEP": 90,
+        "EVENT_PARTITION_INTERVAL": "month",  # or "day"; partitioned PostgreSQL only
+        "EVENT_PARTITIONS_AHEAD": 3,
+        "HOUSEKEEPING_SCAN_COUNT": 1000,
+        "HOUSEKEEPING_TIME_BUDGET": 30,  # seconds per run; the next run resumes
+        "DASHBOARD_SNAPSHOT_MAX_AGE": 60 * 30,  # seconds before a snapshot is ignored
         "CACHE_TTL": 300,
         "ENABLE_CACHING": True,
         "CACHE_BACKEND": "default",
+        "REGISTRY_MAX_AGE": 60,  # seconds between forced registry reloads
         "PRIVACY_MODE": False,
         "ANONYMIZE_IP": False,
         "STORE_USER_AGENT": True,
         "STORE_REFERRER": True,
+        "SLIM_EVENTS": False,  # store URLs, user agents and referrers as keys
         "CELERY_TASK_TIME_LIMIT": 600,
         "CELERY_TASK_SOFT_TIME_LIMIT": 540,
         "MCP_ENABLED": True,
@@ -137,5 +155,17 @@ class DjInsightSettings:
             )
         return prefix
 
+    @property
+    def redis_stream_key(self) -> str:
+        return f"{self.redis_key_prefix}:stream"
+
+    @property
+    def use_redis_stream(self) -> bool:
+        return self.REDIS_INGEST_MODE == "stream"
+
+    @property
+    def use_hll_uniques(self) -> bool:
+        return self.UNIQUE_VIEWS_MODE == "hll"
+
 
 djinsight_settings = DjInsightSettings()
@@ -0,0 +1,214 @@
+"""Cached content type lookups and ContentTypeRegistry tracking decisions."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+
+from djinsight.conf import djinsight_settings
+
+MAX_SIZE = 1024
+REGISTRY_VERSION_KEY = "djinsight:registry:version"
+REGISTRY_CHECK_INTERVAL = 1.0  # seconds between version checks
+
+_lock = threading.Lock()
+_cache: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+_warmed = False
+
+
+class RegistryEntry(NamedTuple):
+    enabled: bool
+    track_anonymous: bool
+    track_authenticated: bool
+
+
+_registry: Optional[Mapping[int, RegistryEntry]] = None
+_registry_version = None
+_registry_checked_at = 0.0
+_registry_loaded_at = 0.0
+
+
+def split_label(label) -> Optional[Tuple[str, str]]:
+    """Split an "app_label.model" string; returns None if it is malformed."""
+    if not label or not isinstance(label, str):
+        return None
+
+    parts = label.split(".")
+    if len(parts) != 2 or not all(parts):
+        return None
+
+    app_label, model = parts
+    return app_label, model.lower()
+
+
+def get_content_type_id(label) -> Optional[int]:
+    """
+    Resolve an "app_label.model" string to a ContentType id.
+
+    Hits an in-process LRU first; it is warmed from ContentTypeRegistry on
+    first use and cleared whenever a ContentType or registry entry changes.
+    Returns None for malformed labels and unknown models.
+    """
+    key = split_label(label)
+    if key is None:
+        return None
+
+    if not _warmed:
+        warm()
+
+    content_type_id = _lookup(key)
+    if content_type_id is not None:
+        return content_type_id
+
+    try:
+        content_type_id = ContentType.objects.get_by_natural_key(*key).id
+    except ContentType.DoesNotExist:
+        return None
+
+    _store(key, content_type_id)
+    return content_type_id
+
+
+async def aget_content_type_id(label) -> Optional[int]:
+    """Async get_content_type_id; only cache misses leave the event loop."""
+    key = split_label(label)
+    if key is None:
+        return None
+
+    if _warmed:
+        content_type_id = _lookup(key)
+        if content_type_id is not None:
+            return content_type_id
+    return await sync_to_async(get_content_type_id)(label)
+
+
+def get_content_type(label) -> Optional[ContentType]:
+    """Resolve an "app_label.model" string to a ContentType instance."""
+    content_type_id = get_content_type_id(label)
+    if content_type_id is None:
+        return None
+    return ContentType.objects.get_for_id(content_type_id)
+
+
+def warm() -> None:
+    """Load the content types of all registered models into the cache."""
+    global _warmed
+
+    from djinsight.models import ContentTypeRegistry
+
+    rows = ContentTypeRegistry.objects.values_list(
+        "content_type_id", "content_type__app_label", "content_type__model"
+    )
+    for content_type_id, app_label, model in rows:
+        _store((app_label, model), content_type_id)
+    _warmed = True
+
+
+def clear() -> None:
+    """Drop all cached entries; the next lookup warms the cache again."""
+    global _warmed
+
+    with _lock:
+        _cache.clear()
+        _warmed = False
+
+
+def _lookup(key: Tuple[str, str]) -> Optional[int]:
+    with _lock:
+        content_type_id = _cache.get(key)
+        if content_type_id is not None:
+            _cache.move_to_end(key)
+        return content_type_id
+
+
+def _store(key: Tuple[str, str], content_type_id: int) -> None:
+    with _lock:
+        _cache[key] = content_type_id
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_SIZE:
+            _cache.popitem(last=False)
+
+
+def get_registry() -> Mapping[int, RegistryEntry]:
+    """
+    Return an immutable snapshot of ContentTypeRegistry keyed by content type id.
+
+    The snapshot is reloaded when this process sees a registry change, or when
+    the version key in the Django cache moves (changes made by other processes).
+    The version key is checked at most every REGISTRY_CHECK_INTERVAL seconds.
+    Because a process-local cache backend never shares that key, the snapshot
+    is also reloaded once it is older than REGISTRY_MAX_AGE seconds.
+    """
+    global _registry, _registry_version, _registry_checked_at, _registry_loaded_at
+
+    registry = _registry
+    checked_at = time.monotonic()
+    if (
+        registry is not None
+        and checked_at - _registry_checked_at < REGISTRY_CHECK_INTERVAL
+    ):
+        return registry
+
+    version = _registry_cache().get(REGISTRY_VERSION_KEY)
+    _registry_checked_at = checked_at
+    if (
+        registry is not None
+        and version == _registry_version
+        and checked_at - _registry_loaded_at < djinsight_settings.REGISTRY_MAX_AGE
+    ):
+        return registry
+
+    from djinsight.models import ContentTypeRegistry
+
+    rows = ContentTypeRegistry.objects.values_list(
+        "content_type_id", "enabled", "track_anonymous", "track_authenticated"
+    )
+    registry = MappingProxyType({row[0]: RegistryEntry(*row[1:]) for row in rows})
+    _registry, _registry_version = registry, version
+    _registry_loaded_at = checked_at
+    return registry
+
+
+async def arefresh_registry() -> None:
+    """Reload the registry snapshot off the event loop if it is due for a check."""
+    if (
+        _registry is None
+        or time.monotonic() - _registry_checked_at >= REGISTRY_CHECK_INTERVAL
+    ):
+        await sync_to_async(get_registry)()
+
+
+def should_track(content_type_id: int, user=None) -> bool:
+    """
+    Decide from the registry snapshot whether to record a view.
+
+    Disabled entries and the track_anonymous/track_authenticated flags always
+    apply; content types without an entry are tracked unless
+    TRACK_REGISTERED_ONLY is set.
+    """
+    entry = get_registry().get(content_type_id)
+    if entry is None:
+        return not djinsight_settings.TRACK_REGISTERED_ONLY
+    if not entry.enabled:
+        return False
+    if user is not None and user.is_authenticated:
+        return entry.track_authenticated
+    return entry.track_anonymous
+
+
+def invalidate_registry() -> None:
+    """Drop the local snapshot and tell other processes to reload theirs."""
+    global _registry
+
+    _registry = None
+    _registry_cache().set(REGISTRY_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _registry_cache():
+    return caches[djinsight_settings.CACHE_BACKEND]
@@ -0,0 +1,212 @@
+"""
+Data behind the Wagtail analytics dashboard, read from the rollup tables.
+
+``build_dashboard_data`` sums ``PageViewStatistics``, the daily and hourly
+summaries and the dimension rollup for a date range, so its cost depends on
+the number of objects and days rather than on the number of events. For the
+preset periods ``refresh_snapshots`` stores the result per content type in
+``AnalyticsSnapshot``, and the dashboard reads that single row while it is
+younger than DASHBOARD_SNAPSHOT_MAX_AGE seconds.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from djinsight.conf import djinsight_settings
+from djinsight.models import (
+    AnalyticsSnapshot,
+    PageViewHourlySummary,
+    PageViewStatistics,
+    PageViewSummary,
+)
+from djinsight.rollups import get_dimension_rows, sum_views_by
+from djinsight.series import as_date, date_range, start_of_day
+
+PERIOD_PRESETS = {
+    "today": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+SNAPSHOT_PERIODS = ("all", *PERIOD_PRESETS)
+
+
+def period_range(period: str, now=None):
+    """Return the (start, end) of a preset period, or (None, None) for all time."""
+    if period not in PERIOD_PRESETS:
+        return None, None
+    now = now or timezone.now()
+    return now - PERIOD_PRESETS[period], now
+
+
+def daily_views(
+    content_type=None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[date, Tuple[int, int]]:
+    """
+    Total and unique views per local day, summed over objects.
+
+    Reads ``PageViewSummary`` with one grouped query and fills the days it
+    doesn't cover yet (such as today) from one grouped ``PageViewHourlySummary``
+    query.
+    """
+    summaries = PageViewSummary.objects.all()
+    if content_type is not None:
+        summaries = summaries.filter(content_type=content_type)
+    if start_date is not None:
+        summaries = summaries.filter(date__gte=start_date)
+    if end_date is not None:
+        summaries = summaries.filter(date__lte=end_date)
+    daily = {
+        day: (total, unique)
+        for day, total, unique in summaries.order_by()
+        .values_list("date")
+        .annotate(total=Sum("total_views"), unique=Sum("unique_views"))
+    }
+
+    if start_date is None:
+        # All time: only days after the last summary are left to fill
+        first_uncovered = max(daily) + timedelta(days=1) if daily else None
+    else:
+        days = date_range(start_date, end_date or timezone.localdate())
+        first_uncovered = next((day for day in days if day not in daily), None)
+        if first_uncovered is None:
+            return daily
+
+    hours = PageViewHourlySummary.objects.all()
+    if content_type is not None:
+        hours = hours.filter(content_type=content_type)
+    if first_uncovered is not None:
+        hours = hours.filter(hour__gte=start_of_day(first_uncovered))
+    if end_date is not None:
+        hours = hours.filter(hour__lt=start_of_day(end_date + timedelta(days=1)))
+    rows = (
+        hours.annotate(day=TruncDate("hour"))
+        .values_list("day")
+        .annotate(total=Sum("total_views"), unique=Sum("unique_views"))
+        .order_by()
+    )
+    for day, total, unique in rows:
+        daily.setdefault(day, (total, unique))
+    return daily
+
+
+def build_chart(content_type=None, start=None, end=None) -> Dict[str, List]:
+    """Gap-filled daily views between ``start`` and ``end`` as labels and series."""
+    start_date = as_date(start) if start else None
+    end_date = as_date(end) if end else None
+    daily = daily_views(content_type, start_date, end_date)
+
+    if start_date:
+        end_date = end_date or timezone.localdate()
+    elif daily:
+        start_date, end_date = min(daily), max(daily)
+    else:
+        end_date = timezone.localdate()
+        start_date = end_date - timedelta(days=30)
+
+    chart = {"labels": [], "views": [], "unique": []}
+    for day in date_range(start_date, end_date):
+        total, unique = daily.get(day, (0, 0))
+        chart["labels"].append(day.strftime("%Y-%m-%d"))
+        chart["views"].append(total)
+        chart["unique"].append(unique)
+    return chart
+
+
+def build_dashboard_data(content_type=None, start=None, end=None) -> Dict:
+    """
+    Compute the dashboard totals, daily chart, traffic sources and devices.
+
+    Args:
+        content_type (ContentType): Restrict to one content type (default: all)
+        start (datetime): Start of the range (default: all time)
+        end (datetime): End of the range (default: now)
+
+    Returns:
+        dict: JSON-serializable payload with total_views, total_unique,
+        total_objects, chart, sources and devices
+    """
+    statistics = PageViewStatistics.objects.all()
+    if content_type is not None:
+        statistics = statistics.filter(content_type=content_type)
+    if start is not None:
+        statistics = statistics.filter(last_viewed_at__gte=start)
+    if end is not None:
+        statistics = statistics.filter(last_viewed_at__lte=end)
+    aggregates = statistics.aggregate(
+        total_views=Sum("total_views"),
+        total_unique=Sum("unique_views"),
+        total_objects=Count("id"),
+    )
+
+    rows = get_dimension_rows(content_type, start, end)
+    sources = sum_views_by(rows, "source_category").most_common()
+    devices = sum_views_by(rows, "device_category").most_common()
+    return {
+        "total_views": aggregates["total_views"] or 0,
+        "total_unique": aggregates["total_unique"] or 0,
+        "total_objects": aggregates["total_objects"],
+        "chart": build_chart(content_type, start, end),
+        "sources": [[name, views] for name, views in sources],
+        "devices": [[name, views] for name, views in devices],
+    }
+
+
+def get_dashboard_data(period: str, content_type=None, start=None, end=None) -> Dict:
+    """
+    Dashboard payload for a preset period from its snapshot, or computed from
+    the rollups for custom ranges and missing or stale snapshots.
+    """
+    if period in SNAPSHOT_PERIODS:
+        max_age = timedelta(seconds=djinsight_settings.DASHBOARD_SNAPSHOT_MAX_AGE)
+        snapshot = AnalyticsSnapshot.objects.filter(
+            period=period,
+            content_type=content_type,
+            computed_at__gte=timezone.now() - max_age,
+        ).first()
+        if snapshot is not None:
+            return snapshot.payload
+        start, end = period_range(period)
+    return build_dashboard_data(content_type, start, end)
+
+
+def refresh_snapshots() -> int:
+    """
+    Recompute the snapshot of every preset period, for all content types
+    together and for each content type with statistics.
+
+    Returns:
+        int: Number of snapshots written
+    """
+    now = timezone.now()
+    content_types = list(
+        ContentType.objects.filter(
+            pk__in=PageViewStatistics.objects.values("content_type")
+        ).order_by("pk")
+    )
+    AnalyticsSnapshot.objects.filter(content_type__isnull=False).exclude(
+        content_type__in=content_types
+    ).delete()
+
+    written = 0
+    for content_type in [None, *content_types]:
+        for period in SNAPSHOT_PERIODS:
+            start, end = period_range(period, now)
+            AnalyticsSnapshot.objects.update_or_create(
+                period=period,
+                content_type=content_type,
+                defaults={
+                    "payload": build_dashboard_data(content_type, start, end),
+                    "computed_at": now,
+                },
+            )
+            written += 1
+    return written
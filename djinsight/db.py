@@ -0,0 +1,196 @@
+"""Database helpers shared by the flusher and the rollup tables."""
+
+from typing import Any, Dict, Iterable, List, Sequence
+
+from django.db import connections, router
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+
+UPSERT_VENDORS = {"postgresql", "sqlite"}
+
+
+def bulk_upsert(
+    model,
+    rows: Iterable[Dict[str, Any]],
+    unique_fields: Sequence[str],
+    increment_fields: Sequence[str] = (),
+    min_fields: Sequence[str] = (),
+    max_fields: Sequence[str] = (),
+    replace_fields: Sequence[str] = (),
+) -> int:
+    """
+    Merge rows into ``model`` keyed by ``unique_fields``.
+
+    Rows are dicts keyed by field attname (``content_type_id`` rather than
+    ``content_type``).
+
+    New keys are inserted as given. For existing keys ``increment_fields`` are
+    added to the stored value, ``min_fields``/``max_fields`` keep the
+    smaller/larger of the stored and new value (ignoring NULLs) and
+    ``replace_fields`` are overwritten.
+
+    On PostgreSQL and SQLite each chunk is one ``INSERT ... ON CONFLICT DO
+    UPDATE`` statement. Other backends use a chunked fallback of one insert,
+    one select and one ``UPDATE ... CASE`` statement per chunk.
+
+    Returns:
+        int: Number of rows merged
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    using = router.db_for_write(model)
+    connection = connections[using]
+    names = [
+        *unique_fields,
+        *increment_fields,
+        *min_fields,
+        *max_fields,
+        *replace_fields,
+    ]
+    fields = {name: model._meta.get_field(name) for name in names}
+    batch_size = max(1, connection.ops.bulk_batch_size(list(fields.values()), rows))
+
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start : start + batch_size]
+        if connection.vendor in UPSERT_VENDORS:
+            _upsert_on_conflict(
+                connection,
+                model,
+                fields,
+                chunk,
+                unique_fields,
+                increment_fields,
+                min_fields,
+                max_fields,
+                replace_fields,
+            )
+        else:
+            _upsert_fallback(
+                using,
+                model,
+                chunk,
+                unique_fields,
+                increment_fields,
+                min_fields,
+                max_fields,
+                replace_fields,
+            )
+
+    return len(rows)
+
+
+def _upsert_on_conflict(
+    connection,
+    model,
+    fields,
+    rows,
+    unique_fields,
+    increment_fields,
+    min_fields,
+    max_fields,
+    replace_fields,
+):
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    columns = {name: qn(field.column) for name, field in fields.items()}
+
+    assignments = []
+    for name in increment_fields:
+        column = columns[name]
+        assignments.append(f"{column} = {table}.{column} + EXCLUDED.{column}")
+    for name, operator in [(n, "<") for n in min_fields] + [
+        (n, ">") for n in max_fields
+    ]:
+        column = columns[name]
+        assignments.append(
+            f"{column} = CASE WHEN {table}.{column} IS NULL "
+            f"OR EXCLUDED.{column} {operator} {table}.{column} "
+            f"THEN EXCLUDED.{column} ELSE {table}.{column} END"
+        )
+    for name in replace_fields:
+        column = columns[name]
+        assignments.append(f"{column} = EXCLUDED.{column}")
+
+    placeholder = "(" + ", ".join(["%s"] * len(fields)) + ")"
+    params = []
+    for row in rows:
+        for name, field in fields.items():
+            params.append(field.get_db_prep_save(row.get(name), connection))
+
+    conflict_target = ", ".join(columns[name] for name in unique_fields)
+    if assignments:
+        action = "DO UPDATE SET " + ", ".join(assignments)
+    else:
+        action = "DO NOTHING"
+
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns.values())}) "
+        f"VALUES {', '.join([placeholder] * len(rows))} "
+        f"ON CONFLICT ({conflict_target}) {action}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _upsert_fallback(
+    using,
+    model,
+    rows,
+    unique_fields,
+    increment_fields,
+    min_fields,
+    max_fields,
+    replace_fields,
+):
+    manager = model._base_manager.using(using)
+
+    # Make sure every key has a row; increments are applied below
+    blanks = []
+    for row in rows:
+        blank = dict(row)
+        for name in increment_fields:
+            blank[name] = 0
+        for name in (*min_fields, *max_fields):
+            blank[name] = None
+        blanks.append(model(**blank))
+    manager.bulk_create(blanks, ignore_conflicts=True)
+
+    key_filter = Q()
+    for row in rows:
+        key_filter |= Q(**{name: row[name] for name in unique_fields})
+    pks = {
+        tuple(values[:-1]): values[-1]
+        for values in manager.filter(key_filter).values_list(*unique_fields, "pk")
+    }
+
+    whens: Dict[str, List[When]] = {}
+    for row in rows:
+        pk = pks.get(tuple(row[name] for name in unique_fields))
+        if pk is None:
+            continue
+        for name in (*increment_fields, *min_fields, *max_fields, *replace_fields):
+            whens.setdefault(name, []).append(When(pk=pk, then=Value(row[name])))
+
+    if not whens:
+        return
+
+    updates = {}
+    for name in increment_fields:
+        updates[name] = F(name) + Case(
+            *whens[name], default=Value(0), output_field=IntegerField()
+        )
+    for name in min_fields:
+        output_field = model._meta.get_field(name)
+        value = Case(*whens[name], default=F(name), output_field=output_field)
+        updates[name] = Least(Coalesce(F(name), value), value)
+    for name in max_fields:
+        output_field = model._meta.get_field(name)
+        value = Case(*whens[name], default=F(name), output_field=output_field)
+        updates[name] = Greatest(Coalesce(F(name), value), value)
+    for name in replace_fields:
+        output_field = model._meta.get_field(name)
+        updates[name] = Case(*whens[name], default=F(name), output_field=output_field)
+
+    manager.filter(pk__in=pks.values()).update(**updates)
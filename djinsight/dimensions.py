@@ -0,0 +1,115 @@
+"""
+Interning of event URLs, user agents and referrers (SLIM_EVENTS).
+
+With SLIM_EVENTS enabled, PageViewEvent rows keep 64-bit keys into the
+UrlDimension, UserAgentDimension and ReferrerDimension tables instead of the
+raw strings. Keys are blake2b hashes of the values, so a batch is interned
+with one ``INSERT ... ON CONFLICT DO NOTHING`` per table, and values this
+process has already written are skipped through an in-process LRU.
+"""
+
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, TextField
+from django.db.models.functions import Coalesce
+
+from djinsight.models import (
+    PageViewEvent,
+    ReferrerDimension,
+    UrlDimension,
+    UserAgentDimension,
+)
+
+# Event field -> dimension model; the event's foreign key is "<field>_dimension"
+DIMENSIONS = {
+    "url": UrlDimension,
+    "user_agent": UserAgentDimension,
+    "referrer": ReferrerDimension,
+}
+
+MAX_SIZE = 10000
+
+_lock = threading.Lock()
+_known: "OrderedDict[Tuple[str, int], None]" = OrderedDict()
+
+
+def value_hash(value: str) -> int:
+    """Return the signed 64-bit blake2b hash used as a dimension key."""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _remember(keys: List[Tuple[str, int]]) -> None:
+    with _lock:
+        for key in keys:
+            _known[key] = None
+            _known.move_to_end(key)
+        while len(_known) > MAX_SIZE:
+            _known.popitem(last=False)
+
+
+def _is_known(key: Tuple[str, int]) -> bool:
+    with _lock:
+        if key in _known:
+            _known.move_to_end(key)
+            return True
+        return False
+
+
+def clear() -> None:
+    """Forget which values have been written."""
+    with _lock:
+        _known.clear()
+
+
+def intern(model, values: Iterable[Optional[str]]) -> Dict[str, int]:
+    """
+    Make sure every non-empty value has a row in ``model``.
+
+    Returns:
+        Mapping of each value to its key
+    """
+    keys = {value: value_hash(value) for value in set(values) if value}
+    label = model._meta.label_lower
+    missing = {
+        key: value for value, key in keys.items() if not _is_known((label, key))
+    }
+    if missing:
+        model.objects.bulk_create(
+            [model(id=key, value=value) for key, value in missing.items()],
+            ignore_conflicts=True,
+        )
+        # Only trust the rows once they are committed
+        known = [(label, key) for key in missing]
+        transaction.on_commit(lambda: _remember(known), using=model.objects.db)
+    return keys
+
+
+def apply_dimensions(events: List[PageViewEvent]) -> None:
+    """Move the URL, user agent and referrer of unsaved events into dimensions."""
+    for field, model in DIMENSIONS.items():
+        keys = intern(model, (getattr(event, field) for event in events))
+        for event in events:
+            setattr(event, f"{field}_dimension_id", keys.get(getattr(event, field)))
+            setattr(event, field, "" if field == "url" else None)
+
+
+def count_values(events, field: str) -> Counter:
+    """
+    Count events per URL, user agent or referrer with one grouped query.
+
+    Reads the dimension of slim events and the raw column of the others.
+    """
+    value = Coalesce(f"{field}_dimension__value", field, output_field=TextField())
+    rows = (
+        events.order_by()
+        .annotate(dimension_value=value)
+        .values_list("dimension_value")
+        .annotate(count=Count("pk"))
+    )
+    return Counter({value: count for value, count in rows})
+
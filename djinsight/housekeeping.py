@@ -0,0 +1,153 @@
+"""
+Incremental housekeeping of the djinsight Redis keyspace.
+
+Each run walks the keyspace with SCAN from the cursor the previous run
+stopped at, one HOUSEKEEPING_SCAN_COUNT chunk at a time, until it completes a
+pass or spends HOUSEKEEPING_TIME_BUDGET seconds. Per chunk it:
+
+* unlinks keys that should carry a TTL but don't (seen-sets, session markers
+  from older versions, pending counters and daily sketches), checking TTLs
+  with one pipeline;
+* unlinks the counters and all-time sketches of objects that were deleted or
+  whose content type is no longer tracked.
+
+Keys are freed with UNLINK, so Redis reclaims the memory off its main thread.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+
+from djinsight.conf import djinsight_settings
+from djinsight.content_types import get_content_type_id, get_registry
+
+logger = logging.getLogger(__name__)
+
+# Key kinds always written with an expiration
+VOLATILE_KINDS = {"seen", "session", "pending", "pending_unique"}
+
+# Key kinds holding per-object state that outlives its TTL-less keys (the
+# counter kinds are only left over from older versions)
+OBJECT_KINDS = {"counter", "unique_counter", "hll"}
+
+# Forget a checkpoint nobody resumed from
+CURSOR_EXPIRATION = 60 * 60 * 24
+
+
+def cursor_key(key_prefix: str) -> str:
+    """Key holding the SCAN cursor of an unfinished housekeeping pass."""
+    return f"{key_prefix}:housekeeping:cursor"
+
+
+def _is_tracked(content_type_id: int) -> bool:
+    entry = get_registry().get(content_type_id)
+    if entry is None:
+        return not djinsight_settings.TRACK_REGISTERED_ONLY
+    return entry.enabled
+
+
+def _dead_objects(objects: Dict[str, Set[str]]) -> Set[Tuple[str, str]]:
+    """Return the (label, object_id) pairs whose object is gone or untracked."""
+    dead = set()
+    for label, object_ids in objects.items():
+        content_type_id = get_content_type_id(label)
+        model = None
+        if content_type_id is not None and _is_tracked(content_type_id):
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            dead.update((label, object_id) for object_id in object_ids)
+            continue
+
+        ids = [int(object_id) for object_id in object_ids if object_id.isdigit()]
+        existing = {
+            str(pk)
+            for pk in model._default_manager.filter(pk__in=ids).values_list(
+                "pk", flat=True
+            )
+        }
+        dead.update((label, object_id) for object_id in object_ids - existing)
+    return dead
+
+
+def _expired_keys(client, keys: List[str]) -> List[str]:
+    if not keys:
+        return []
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.ttl(key)
+    return [key for key, ttl in zip(keys, pipe.execute()) if ttl == -1]
+
+
+def sweep_keys(client, key_prefix: str, keys: List[str]) -> Tuple[int, int]:
+    """
+    Unlink the orphaned and dead keys among one SCAN chunk.
+
+    Returns:
+        (orphaned, compacted): Numbers of keys unlinked for each reason
+    """
+    volatile = []
+    object_keys: Dict[Tuple[str, str], List[str]] = {}
+    objects: Dict[str, Set[str]] = {}
+    for key in keys:
+        parts = key[len(key_prefix) + 1 :].split(":")
+        kind = parts[0]
+        if kind in VOLATILE_KINDS or (kind == "hll" and len(parts) == 4):
+            volatile.append(key)
+        elif kind in OBJECT_KINDS and len(parts) == 3:
+            label, object_id = parts[1], parts[2]
+            object_keys.setdefault((label, object_id), []).append(key)
+            objects.setdefault(label, set()).add(object_id)
+
+    orphaned = _expired_keys(client, volatile)
+    compacted = [
+        key for target in _dead_objects(objects) for key in object_keys[target]
+    ]
+    if orphaned or compacted:
+        client.unlink(*orphaned, *compacted)
+    return len(orphaned), len(compacted)
+
+
+def run_housekeeping(
+    client,
+    time_budget: Optional[float] = None,
+    scan_count: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Sweep the keyspace from the checkpointed cursor until done or out of time.
+
+    Returns:
+        Dict with the numbers of keys scanned, orphaned and compacted, and
+        complete=1 when the pass reached the end of the keyspace
+    """
+    if time_budget is None:
+        time_budget = djinsight_settings.HOUSEKEEPING_TIME_BUDGET
+    scan_count = scan_count or djinsight_settings.HOUSEKEEPING_SCAN_COUNT
+    key_prefix = djinsight_settings.redis_key_prefix
+    checkpoint = cursor_key(key_prefix)
+    deadline = time.monotonic() + time_budget
+
+    cursor = int(client.get(checkpoint) or 0)
+    result = {"scanned": 0, "orphaned": 0, "compacted": 0, "complete": 0}
+    while True:
+        cursor, keys = client.scan(cursor, match=f"{key_prefix}:*", count=scan_count)
+        keys = [key.decode("utf-8") if isinstance(key, bytes) else key for key in keys]
+        orphaned, compacted = sweep_keys(client, key_prefix, keys)
+        result["scanned"] += len(keys)
+        result["orphaned"] += orphaned
+        result["compacted"] += compacted
+        if cursor == 0 or time.monotonic() >= deadline:
+            break
+
+    if cursor == 0:
+        client.delete(checkpoint)
+        result["complete"] = 1
+    else:
+        client.set(checkpoint, cursor, ex=CURSOR_EXPIRATION)
+
+    logger.info(
+        f"Redis housekeeping scanned {result['scanned']} keys, unlinked "
+        f"{result['orphaned']} orphaned and {result['compacted']} stale object keys"
+    )
+    return result
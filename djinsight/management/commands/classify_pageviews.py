@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djinsight.tasks import run_classify_page_views
+
+
+class Command(BaseCommand):
+    help = "Backfill device, traffic source and referrer domain of stored page views"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Number of events updated per query (default: CLEANUP_BATCH_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+
+        try:
+            classified = run_classify_page_views(
+                verbosity=verbosity, batch_size=options["batch_size"]
+            )
+
+            if verbosity >= 1:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Successfully classified {classified} page views"
+                    )
+                )
+
+        except Exception as e:
+            raise CommandError(f"Error classifying page views: {e}")
@@ -13,6 +13,11 @@ class Command(BaseCommand):
             default=7,
             help="Number of days back to process (default: 7)",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every day in the window, not only days with new events",
+        )
 
     def handle(self, *args, **options):
         days_back = options["days_back"]
@@ -26,7 +31,9 @@ class Command(BaseCommand):
             )
 
         try:
-            generated = run_generate_summaries(verbosity=verbosity, days_back=days_back)
+            generated = run_generate_summaries(
+                verbosity=verbosity, days_back=days_back, full=options["full"]
+            )
 
             if verbosity >= 1:
                 self.stdout.write(
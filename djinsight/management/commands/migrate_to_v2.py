@@ -4,6 +4,7 @@ from django.db import transaction
 
 from djinsight.models import (
     ContentTypeRegistry,
+    ContentTypeTotals,
     PageViewEvent,
     PageViewStatistics,
     PageViewSummary,
@@ -219,6 +220,9 @@ class Command(BaseCommand):
 
             self.stdout.write(f'Migrated {count} statistics from {content_type}')
 
+        if not dry_run and count:
+            ContentTypeTotals.rebuild()
+
         return count
 
     def _register_content_types(self, dry_run):
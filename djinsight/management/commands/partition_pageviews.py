@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djinsight.partitions import INTERVALS
+from djinsight.tasks import run_create_partitions
+
+
+class Command(BaseCommand):
+    help = "Create future PageViewEvent partitions (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=None,
+            help="Number of future periods to create (default: EVENT_PARTITIONS_AHEAD)",
+        )
+        parser.add_argument(
+            "--interval",
+            choices=INTERVALS,
+            default=None,
+            help="Partition interval (default: EVENT_PARTITION_INTERVAL)",
+        )
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert the existing event table into a partitioned table",
+        )
+        parser.add_argument(
+            "--confirm",
+            action="store_true",
+            help="Confirm conversion without prompting",
+        )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+
+        if options["convert"] and not options["confirm"]:
+            response = input(
+                "This will convert the page view event table into a partitioned table, "
+                "locking it while the primary key is rebuilt. "
+                "Are you sure you want to continue? [y/N]: "
+            )
+            if response.lower() not in ["y", "yes"]:
+                self.stdout.write(self.style.WARNING("Operation cancelled."))
+                return
+
+        try:
+            created = run_create_partitions(
+                verbosity=verbosity,
+                ahead=options["ahead"],
+                interval=options["interval"],
+                convert=options["convert"],
+            )
+
+            if verbosity >= 1:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Successfully created {len(created)} partitions"
+                    )
+                )
+
+        except Exception as e:
+            raise CommandError(f"Error creating partitions: {e}")
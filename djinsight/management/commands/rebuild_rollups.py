@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djinsight.tasks import run_rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the device/source/referrer rollup from stored page views "
+        "and recompute the content type totals"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days-back",
+            type=int,
+            default=None,
+            help="Number of days back to rebuild (default: all stored events)",
+        )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+
+        try:
+            written = run_rebuild_rollups(
+                verbosity=verbosity, days_back=options["days_back"]
+            )
+
+            if verbosity >= 1:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Successfully wrote {written} rollup rows")
+                )
+
+        except Exception as e:
+            raise CommandError(f"Error rebuilding rollups: {e}")
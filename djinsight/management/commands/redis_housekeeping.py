@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djinsight.tasks import run_redis_housekeeping
+
+
+class Command(BaseCommand):
+    help = "Unlink orphaned and stale djinsight keys from Redis"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--time-budget",
+            type=float,
+            default=None,
+            help="Seconds to spend before checkpointing the scan "
+            "(default: HOUSEKEEPING_TIME_BUDGET)",
+        )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+
+        try:
+            result = run_redis_housekeeping(
+                verbosity=verbosity, time_budget=options["time_budget"]
+            )
+
+            if verbosity >= 1:
+                unlinked = result["orphaned"] + result["compacted"]
+                self.stdout.write(
+                    self.style.SUCCESS(f"Successfully unlinked {unlinked} keys")
+                )
+
+        except Exception as e:
+            raise CommandError(f"Error during Redis housekeeping: {e}")
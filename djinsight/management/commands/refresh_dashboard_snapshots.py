@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djinsight.tasks import run_refresh_dashboard_snapshots
+
+
+class Command(BaseCommand):
+    help = "Precompute the analytics dashboard for every preset period and content type"
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+
+        try:
+            written = run_refresh_dashboard_snapshots(verbosity=verbosity)
+
+            if verbosity >= 1:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Successfully refreshed {written} snapshots")
+                )
+
+        except Exception as e:
+            raise CommandError(f"Error refreshing dashboard snapshots: {e}")
@@ -36,9 +36,7 @@ def get_page_stats(content_type: str, object_id: int) -> Dict:
     except Exception:
         obj_str = None
 
-    stats = PageViewStatistics.objects.filter(
-        content_type=ct, object_id=object_id
-    ).first()
+    stats = PageViewStatistics.get_cached(ct.id, object_id)
 
     if not stats:
         return {
@@ -1,18 +1,12 @@
 """Behavior analysis MCP tools for djinsight."""
 
 import logging
-from collections import Counter
 from typing import Dict
 
-from django.db.models import Count
 from django.db.models.functions import ExtractHour
 
-from djinsight.mcp.utils import (
-    parse_content_type_str,
-    parse_date_range,
-    parse_user_agent_category,
-)
-from djinsight.models import PageViewEvent
+from djinsight.mcp.utils import parse_content_type_str, parse_date_range
+from djinsight.rollups import get_dimension_rows, get_hourly_rows, sum_views_by
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +16,9 @@ def get_device_breakdown(
 ) -> Dict:
     """Get device type breakdown for page views.
 
+    Reads the daily dimension rollup, so the first and last day of the period
+    are counted in full.
+
     Args:
         content_type: Content type string in 'app_label.model' format.
         object_id: Optional object ID to filter by specific object.
@@ -40,20 +37,9 @@ def get_device_breakdown(
     except ValueError as e:
         return {"error": str(e)}
 
-    filters = {
-        "content_type": ct,
-        "timestamp__gte": start,
-        "timestamp__lte": end,
-    }
-    if object_id is not None:
-        filters["object_id"] = object_id
-
-    events = PageViewEvent.objects.filter(**filters)
+    rows = get_dimension_rows(ct, start, end, object_id)
 
-    counter = Counter()
-    for ua in events.values_list("user_agent", flat=True).iterator():
-        category = parse_user_agent_category(ua)
-        counter[category] += 1
+    counter = sum_views_by(rows, "device_category")
 
     total_views = sum(counter.values())
 
@@ -80,6 +66,9 @@ def get_hourly_pattern(
 ) -> Dict:
     """Get hourly traffic distribution for page views.
 
+    Reads the hourly rollup, so the first and last hour of the period are
+    counted in full.
+
     Args:
         content_type: Content type string in 'app_label.model' format.
         object_id: Optional object ID to filter by specific object.
@@ -98,22 +87,10 @@ def get_hourly_pattern(
     except ValueError as e:
         return {"error": str(e)}
 
-    filters = {
-        "content_type": ct,
-        "timestamp__gte": start,
-        "timestamp__lte": end,
-    }
-    if object_id is not None:
-        filters["object_id"] = object_id
-
-    events = PageViewEvent.objects.filter(**filters)
+    rows = get_hourly_rows(ct, start, end, object_id)
+    rows = rows.annotate(hour_of_day=ExtractHour("hour"))
 
-    hourly_data = (
-        events.annotate(hour=ExtractHour("timestamp"))
-        .values("hour")
-        .annotate(count=Count("id"))
-    )
-    counter = {entry["hour"]: entry["count"] for entry in hourly_data}
+    counter = sum_views_by(rows, "hour_of_day")
 
     total_views = sum(counter.values())
 
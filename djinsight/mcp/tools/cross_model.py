@@ -3,10 +3,8 @@
 import logging
 from typing import Dict, List
 
-from django.db.models import Count, Sum
-
 from djinsight.mcp.utils import parse_content_type_str, parse_date_range
-from djinsight.models import PageViewEvent, PageViewStatistics
+from djinsight.models import ContentTypeTotals, PageViewEvent
 
 logger = logging.getLogger(__name__)
 
@@ -14,48 +12,31 @@ logger = logging.getLogger(__name__)
 def get_site_overview() -> Dict:
     """Get site-wide overview of all tracked content.
 
-    Aggregates all PageViewStatistics to provide a high-level summary
-    including totals and a breakdown by content type.
+    Reads the materialized ContentTypeTotals rows to provide a high-level
+    summary including totals and a breakdown by content type.
 
     Returns:
         Dict with total_views, total_unique_views, tracked_objects,
         and by_content_type list.
     """
-    aggregates = PageViewStatistics.objects.aggregate(
-        total_views=Sum("total_views"),
-        total_unique_views=Sum("unique_views"),
-    )
-
-    total_views = aggregates["total_views"] or 0
-    total_unique_views = aggregates["total_unique_views"] or 0
-    tracked_objects = PageViewStatistics.objects.count()
-
-    by_content_type_qs = (
-        PageViewStatistics.objects.values(
-            "content_type__app_label", "content_type__model"
-        )
-        .annotate(
-            total_views=Sum("total_views"),
-            unique_views=Sum("unique_views"),
-            object_count=Count("id"),
-        )
-        .order_by("-total_views")
-    )
+    site = ContentTypeTotals.get_site()
 
     by_content_type = [
         {
-            "content_type": f"{row['content_type__app_label']}.{row['content_type__model']}",
-            "total_views": row["total_views"] or 0,
-            "unique_views": row["unique_views"] or 0,
-            "object_count": row["object_count"],
+            "content_type": f"{row.content_type.app_label}.{row.content_type.model}",
+            "total_views": row.total_views,
+            "unique_views": row.unique_views,
+            "object_count": row.object_count,
         }
-        for row in by_content_type_qs
+        for row in ContentTypeTotals.objects.filter(object_count__gt=0)
+        .select_related("content_type")
+        .order_by("-total_views")
     ]
 
     return {
-        "total_views": total_views,
-        "total_unique_views": total_unique_views,
-        "tracked_objects": tracked_objects,
+        "total_views": site.total_views,
+        "total_unique_views": site.unique_views,
+        "tracked_objects": site.object_count,
         "by_content_type": by_content_type,
     }
 
@@ -1,19 +1,15 @@
 """Referrer analytics tools for the djinsight MCP server."""
 
-from collections import Counter
-
-from djinsight.mcp.utils import (
-    classify_referrer,
-    extract_domain,
-    parse_content_type_str,
-    parse_date_range,
-)
-from djinsight.models import PageViewEvent
+from djinsight.mcp.utils import parse_content_type_str, parse_date_range
+from djinsight.rollups import get_dimension_rows, sum_views_by
 
 
 def get_referrer_stats(content_type, object_id=None, period="month", limit=20):
     """Get top referrers grouped by domain.
 
+    Reads the daily dimension rollup, so the first and last day of the period
+    are counted in full.
+
     Args:
         content_type: 'app_label.model' string.
         object_id: Optional object ID to filter by.
@@ -35,20 +31,9 @@ def get_referrer_stats(content_type, object_id=None, period="month", limit=20):
     except ValueError as e:
         return {"error": str(e)}
 
-    filters = {
-        "content_type": ct,
-        "timestamp__gte": start,
-        "timestamp__lte": end,
-    }
-    if object_id is not None:
-        filters["object_id"] = object_id
-
-    events = PageViewEvent.objects.filter(**filters)
+    rows = get_dimension_rows(ct, start, end, object_id)
 
-    domain_counter = Counter()
-    for referrer in events.values_list("referrer", flat=True).iterator():
-        domain = extract_domain(referrer)
-        domain_counter[domain] += 1
+    domain_counter = sum_views_by(rows, "referrer_domain")
 
     total_referrals = sum(domain_counter.values())
     top_referrers = [
@@ -68,6 +53,9 @@ def get_referrer_stats(content_type, object_id=None, period="month", limit=20):
 def get_traffic_sources(content_type, object_id=None, period="month"):
     """Aggregate page views by traffic source category.
 
+    Reads the daily dimension rollup, so the first and last day of the period
+    are counted in full.
+
     Args:
         content_type: 'app_label.model' string.
         object_id: Optional object ID to filter by.
@@ -86,20 +74,9 @@ def get_traffic_sources(content_type, object_id=None, period="month"):
     except ValueError as e:
         return {"error": str(e)}
 
-    filters = {
-        "content_type": ct,
-        "timestamp__gte": start,
-        "timestamp__lte": end,
-    }
-    if object_id is not None:
-        filters["object_id"] = object_id
-
-    events = PageViewEvent.objects.filter(**filters)
+    rows = get_dimension_rows(ct, start, end, object_id)
 
-    source_counter = Counter()
-    for referrer in events.values_list("referrer", flat=True).iterator():
-        source = classify_referrer(referrer)
-        source_counter[source] += 1
+    source_counter = sum_views_by(rows, "source_category")
 
     total_views = sum(source_counter.values())
     sources = []
@@ -4,30 +4,17 @@ import re
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
 
-from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 
+from djinsight.content_types import get_content_type
+
 
 def parse_content_type_str(content_type_str):
     """Parse 'app_label.model' string into a ContentType instance.
 
     Returns None if the string is invalid or the ContentType doesn't exist.
     """
-    if not content_type_str or not isinstance(content_type_str, str):
-        return None
-
-    parts = content_type_str.split(".")
-    if len(parts) != 2:
-        return None
-
-    app_label, model = parts
-    if not app_label or not model:
-        return None
-
-    try:
-        return ContentType.objects.get(app_label=app_label, model=model)
-    except ContentType.DoesNotExist:
-        return None
+    return get_content_type(content_type_str)
 
 
 def parse_user_agent_category(user_agent):
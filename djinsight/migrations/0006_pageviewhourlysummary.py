@@ -0,0 +1,88 @@
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+
+def backfill_hourly_summaries(apps, schema_editor):
+    """Build hourly buckets for the events of yesterday and today."""
+    PageViewEvent = apps.get_model("djinsight", "PageViewEvent")
+    PageViewHourlySummary = apps.get_model("djinsight", "PageViewHourlySummary")
+
+    since = timezone.now() - timedelta(days=2)
+    rows = (
+        PageViewEvent.objects.filter(timestamp__gte=since)
+        .annotate(bucket=TruncHour("timestamp", tzinfo=dt_timezone.utc))
+        .values("content_type_id", "object_id", "bucket")
+        .annotate(total=Count("id"), unique=Count("id", filter=Q(is_unique=True)))
+        .order_by()
+    )
+    PageViewHourlySummary.objects.bulk_create(
+        [
+            PageViewHourlySummary(
+                content_type_id=row["content_type_id"],
+                object_id=row["object_id"],
+                hour=row["bucket"],
+                total_views=row["total"],
+                unique_views=row["unique"],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("djinsight", "0005_mcpapikey_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageViewHourlySummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("hour", models.DateTimeField(verbose_name="Hour")),
+                (
+                    "total_views",
+                    models.PositiveIntegerField(default=0, verbose_name="Total Views"),
+                ),
+                (
+                    "unique_views",
+                    models.PositiveIntegerField(default=0, verbose_name="Unique Views"),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Page View Hourly Summary",
+                "verbose_name_plural": "Page View Hourly Summaries",
+                "ordering": ["-hour"],
+                "indexes": [
+                    models.Index(fields=["hour"], name="djinsight_p_hour_a7043d_idx"),
+                ],
+                "unique_together": {("content_type", "object_id", "hour")},
+            },
+        ),
+        migrations.RunPython(backfill_hourly_summaries, migrations.RunPython.noop),
+    ]
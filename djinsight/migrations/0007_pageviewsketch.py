@@ -0,0 +1,50 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("djinsight", "0006_pageviewhourlysummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageViewSketch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("period", models.CharField(max_length=10, verbose_name="Period")),
+                ("registers", models.BinaryField(verbose_name="Registers")),
+                (
+                    "unique_views",
+                    models.PositiveIntegerField(default=0, verbose_name="Unique Views"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Page View Sketch",
+                "verbose_name_plural": "Page View Sketches",
+                "unique_together": {("content_type", "object_id", "period")},
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("djinsight", "0007_pageviewsketch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UrlDimension",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("value", models.TextField(verbose_name="Value")),
+            ],
+            options={
+                "verbose_name": "URL",
+                "verbose_name_plural": "URLs",
+            },
+        ),
+        migrations.CreateModel(
+            name="UserAgentDimension",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("value", models.TextField(verbose_name="Value")),
+            ],
+            options={
+                "verbose_name": "User Agent",
+                "verbose_name_plural": "User Agents",
+            },
+        ),
+        migrations.CreateModel(
+            name="ReferrerDimension",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("value", models.TextField(verbose_name="Value")),
+            ],
+            options={
+                "verbose_name": "Referrer",
+                "verbose_name_plural": "Referrers",
+            },
+        ),
+        migrations.AddField(
+            model_name="pageviewevent",
+            name="url_dimension",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="djinsight.urldimension",
+                verbose_name="URL",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pageviewevent",
+            name="user_agent_dimension",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="djinsight.useragentdimension",
+                verbose_name="User Agent",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pageviewevent",
+            name="referrer_dimension",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="djinsight.referrerdimension",
+                verbose_name="Referrer",
+            ),
+        ),
+    ]
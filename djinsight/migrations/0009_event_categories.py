@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("djinsight", "0008_dimensions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pageviewevent",
+            name="device_category",
+            field=models.CharField(
+                blank=True, default="", max_length=16, verbose_name="Device Category"
+            ),
+        ),
+        migrations.AddField(
+            model_name="pageviewevent",
+            name="source_category",
+            field=models.CharField(
+                blank=True, default="", max_length=16, verbose_name="Source Category"
+            ),
+        ),
+        migrations.AddField(
+            model_name="pageviewevent",
+            name="referrer_domain",
+            field=models.CharField(
+                blank=True, default="", max_length=255, verbose_name="Referrer Domain"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pageviewevent",
+            index=models.Index(
+                fields=["content_type", "timestamp", "device_category"],
+                name="djinsight_p_content_d49f88_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pageviewevent",
+            index=models.Index(
+                fields=["content_type", "timestamp", "source_category"],
+                name="djinsight_p_content_c2bc97_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pageviewevent",
+            index=models.Index(
+                fields=["content_type", "timestamp", "referrer_domain"],
+                name="djinsight_p_content_bd5c40_idx",
+            ),
+        ),
+    ]
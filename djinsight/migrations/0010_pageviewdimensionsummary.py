@@ -0,0 +1,78 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("djinsight", "0009_event_categories"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageViewDimensionSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "device_category",
+                    models.CharField(max_length=16, verbose_name="Device Category"),
+                ),
+                (
+                    "source_category",
+                    models.CharField(max_length=16, verbose_name="Source Category"),
+                ),
+                (
+                    "referrer_domain",
+                    models.CharField(max_length=255, verbose_name="Referrer Domain"),
+                ),
+                (
+                    "total_views",
+                    models.PositiveIntegerField(default=0, verbose_name="Total Views"),
+                ),
+                (
+                    "unique_views",
+                    models.PositiveIntegerField(default=0, verbose_name="Unique Views"),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Page View Dimension Summary",
+                "verbose_name_plural": "Page View Dimension Summaries",
+                "ordering": ["-date"],
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "date"],
+                        name="djinsight_p_content_10e47c_idx",
+                    ),
+                    models.Index(fields=["date"], name="djinsight_p_date_722baf_idx"),
+                ],
+                "unique_together": {
+                    (
+                        "content_type",
+                        "object_id",
+                        "date",
+                        "device_category",
+                        "source_category",
+                        "referrer_domain",
+                    )
+                },
+            },
+        ),
+    ]
@@ -0,0 +1,80 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_content_type_totals(apps, schema_editor):
+    """Sum the existing statistics per content type."""
+    PageViewStatistics = apps.get_model("djinsight", "PageViewStatistics")
+    ContentTypeTotals = apps.get_model("djinsight", "ContentTypeTotals")
+
+    rows = (
+        PageViewStatistics.objects.order_by()
+        .values("content_type_id")
+        .annotate(
+            total_views=Sum("total_views"),
+            unique_views=Sum("unique_views"),
+            object_count=Count("id"),
+        )
+    )
+    ContentTypeTotals.objects.bulk_create(
+        [ContentTypeTotals(**row) for row in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("djinsight", "0011_analyticssnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentTypeTotals",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total_views",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Total Views"
+                    ),
+                ),
+                (
+                    "unique_views",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Unique Views"
+                    ),
+                ),
+                (
+                    "object_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Object Count"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "content_type",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Content Type Totals",
+                "verbose_name_plural": "Content Type Totals",
+            },
+        ),
+        migrations.RunPython(backfill_content_type_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("djinsight", "0012_contenttypetotals"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProcessingCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=64, unique=True, verbose_name="Name"),
+                ),
+                ("position", models.BigIntegerField(verbose_name="Position")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Processing Cursor",
+                "verbose_name_plural": "Processing Cursors",
+            },
+        ),
+    ]
@@ -1,11 +1,12 @@
 import secrets
 from datetime import timedelta
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
-from django.db.models import Count, F, Q, Sum
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -36,9 +37,11 @@ class ContentTypeRegistry(models.Model):
 
     @classmethod
     def is_tracked(cls, obj) -> bool:
+        from djinsight.content_types import get_registry
+
         content_type = ContentType.objects.get_for_model(obj)
-        registry = cls.objects.filter(content_type=content_type, enabled=True).first()
-        return registry is not None
+        entry = get_registry().get(content_type.id)
+        return entry is not None and entry.enabled
 
     @classmethod
     def register(cls, model_class, **kwargs):
@@ -83,7 +86,131 @@ class PageViewStatistics(models.Model):
     @classmethod
     def get_for_object(cls, obj) -> Optional['PageViewStatistics']:
         content_type = ContentType.objects.get_for_model(obj)
-        return cls.objects.filter(content_type=content_type, object_id=obj.pk).first()
+        return cls.get_cached(content_type.id, obj.pk)
+
+    @classmethod
+    def get_cached(
+        cls, content_type_id: int, object_id: int
+    ) -> Optional['PageViewStatistics']:
+        """Load the statistics row of an object through the stats cache."""
+        from djinsight.cache import cached
+
+        return cached(
+            content_type_id,
+            object_id,
+            "stats",
+            lambda: cls.objects.filter(
+                content_type_id=content_type_id, object_id=object_id
+            ).first(),
+        )
+
+    @classmethod
+    def get_for_objects(
+        cls, objs: Iterable
+    ) -> Dict[Tuple[int, int], Optional['PageViewStatistics']]:
+        """
+        Load statistics for many objects with a single query.
+
+        Returns a mapping of (content_type_id, object_id) to the statistics row,
+        or None for objects that have not been viewed yet.
+        """
+        objs = [obj for obj in objs if obj is not None and obj.pk is not None]
+        if not objs:
+            return {}
+
+        content_types = ContentType.objects.get_for_models(*{type(obj) for obj in objs})
+        ids_by_content_type: Dict[int, set] = {}
+        for obj in objs:
+            content_type_id = content_types[type(obj)].id
+            ids_by_content_type.setdefault(content_type_id, set()).add(obj.pk)
+
+        result = {
+            (content_type_id, object_id): None
+            for content_type_id, object_ids in ids_by_content_type.items()
+            for object_id in object_ids
+        }
+        query = Q()
+        for content_type_id, object_ids in ids_by_content_type.items():
+            query |= Q(content_type_id=content_type_id, object_id__in=object_ids)
+        for stats in cls.objects.filter(query):
+            result[(stats.content_type_id, stats.object_id)] = stats
+        return result
+
+    @classmethod
+    def bulk_increment(cls, counters, replace_unique: bool = False) -> int:
+        """
+        Apply view deltas for many objects in as few statements as possible.
+
+        Args:
+            counters: Mapping of (content_type_id, object_id) to a dict with
+                total_views, unique_views, first_viewed_at and last_viewed_at,
+                where the timestamps are the earliest and latest views in the delta
+            replace_unique: Store unique_views as an absolute value instead of
+                adding it (used with HyperLogLog unique counting)
+        """
+        from djinsight.db import bulk_upsert
+
+        if not counters:
+            return 0
+
+        # Stored unique counts of the objects that already have a row, to
+        # derive the ContentTypeTotals deltas; object counts drifted by
+        # parallel flushers are reconciled by cleanup_old_data
+        ids_by_content_type: Dict[int, list] = {}
+        for content_type_id, object_id in counters:
+            ids_by_content_type.setdefault(content_type_id, []).append(object_id)
+        query = Q()
+        for content_type_id, object_ids in ids_by_content_type.items():
+            query |= Q(content_type_id=content_type_id, object_id__in=object_ids)
+        stored_unique = {
+            (content_type_id, object_id): unique_views
+            for content_type_id, object_id, unique_views in cls.objects.filter(
+                query
+            ).values_list("content_type_id", "object_id", "unique_views")
+        }
+
+        updated_at = timezone.now()
+        rows = [
+            {
+                "content_type_id": content_type_id,
+                "object_id": object_id,
+                "total_views": delta["total_views"],
+                "unique_views": delta["unique_views"],
+                "first_viewed_at": delta["first_viewed_at"],
+                "last_viewed_at": delta["last_viewed_at"],
+                "updated_at": updated_at,
+            }
+            for (content_type_id, object_id), delta in counters.items()
+        ]
+        if replace_unique:
+            increment_fields = ["total_views"]
+            replace_fields = ["unique_views", "updated_at"]
+        else:
+            increment_fields = ["total_views", "unique_views"]
+            replace_fields = ["updated_at"]
+        merged = bulk_upsert(
+            cls,
+            rows,
+            unique_fields=["content_type_id", "object_id"],
+            increment_fields=increment_fields,
+            min_fields=["first_viewed_at"],
+            max_fields=["last_viewed_at"],
+            replace_fields=replace_fields,
+        )
+
+        deltas: Dict[int, Dict[str, int]] = {}
+        for key, delta in counters.items():
+            totals = deltas.setdefault(
+                key[0], {"total_views": 0, "unique_views": 0, "object_count": 0}
+            )
+            totals["total_views"] += delta["total_views"]
+            totals["unique_views"] += delta["unique_views"]
+            if key not in stored_unique:
+                totals["object_count"] += 1
+            elif replace_unique:
+                totals["unique_views"] -= stored_unique[key]
+        ContentTypeTotals.apply_deltas(deltas)
+        return merged
 
     def increment_view_count(self, unique: bool = False):
         current_time = timezone.now()
@@ -98,6 +225,13 @@ class PageViewStatistics(models.Model):
 
         PageViewStatistics.objects.filter(pk=self.pk).update(**updates)
         self.refresh_from_db()
+        ContentTypeTotals.apply_deltas(
+            {self.content_type_id: {"total_views": 1, "unique_views": int(unique)}}
+        )
+
+        from djinsight.cache import invalidate_object
+
+        invalidate_object(self.content_type_id, self.object_id)
 
     def get_views_for_period(self, start_date, end_date, unique: bool = False):
         queryset = PageViewEvent.objects.filter(
@@ -113,6 +247,168 @@ class PageViewStatistics(models.Model):
         return queryset.count()
 
 
+class ContentTypeTotals(models.Model):
+    """
+    PageViewStatistics summed per content type.
+
+    Kept in step with the statistics by deltas from bulk_increment,
+    DatabaseProvider and the PageViewStatistics signal handlers, so content
+    type totals are read without aggregating every statistics row. Site-wide
+    totals are summed from these rows (one per content type) rather than kept
+    in a row of their own that every view would have to lock.
+    """
+
+    FIELDS = ("total_views", "unique_views", "object_count")
+
+    content_type = models.OneToOneField(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    total_views = models.PositiveBigIntegerField(
+        default=0, verbose_name=_("Total Views")
+    )
+    unique_views = models.PositiveBigIntegerField(
+        default=0, verbose_name=_("Unique Views")
+    )
+    object_count = models.PositiveIntegerField(
+        default=0, verbose_name=_("Object Count")
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Content Type Totals")
+        verbose_name_plural = _("Content Type Totals")
+
+    def __str__(self):
+        label = self.content_type if self.content_type_id else "Site"
+        return f"{label}: {self.total_views} views"
+
+    @classmethod
+    def get_site(cls) -> 'ContentTypeTotals':
+        """Return the site-wide totals as an unsaved row summing every content type."""
+        totals = cls.objects.aggregate(**{field: Sum(field) for field in cls.FIELDS})
+        return cls(**{field: value or 0 for field, value in totals.items()})
+
+    @classmethod
+    def apply_deltas(cls, deltas: Dict[int, Dict[str, int]]) -> None:
+        """
+        Add total_views, unique_views and object_count deltas per content type
+        id to the content type rows.
+
+        Content types without a row get one; negative deltas only update
+        existing rows.
+        """
+        from djinsight.db import bulk_upsert
+
+        deltas = {
+            content_type_id: {field: delta.get(field, 0) for field in cls.FIELDS}
+            for content_type_id, delta in deltas.items()
+        }
+        if not deltas:
+            return
+
+        updated_at = timezone.now()
+        bulk_upsert(
+            cls,
+            [
+                {"content_type_id": content_type_id, **delta, "updated_at": updated_at}
+                for content_type_id, delta in deltas.items()
+                if min(delta.values()) >= 0
+            ],
+            unique_fields=["content_type_id"],
+            increment_fields=cls.FIELDS,
+            replace_fields=["updated_at"],
+        )
+        for content_type_id, delta in deltas.items():
+            if min(delta.values()) < 0:
+                cls.objects.filter(content_type_id=content_type_id).update(
+                    updated_at=updated_at,
+                    **{field: F(field) + value for field, value in delta.items()},
+                )
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recompute every row from PageViewStatistics.
+
+        Returns:
+            int: Number of rows written
+        """
+        rows = (
+            PageViewStatistics.objects.order_by()
+            .values("content_type_id")
+            .annotate(
+                total_views=Sum("total_views"),
+                unique_views=Sum("unique_views"),
+                object_count=Count("id"),
+            )
+        )
+        totals = [cls(**row) for row in rows]
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(totals)
+        return len(totals)
+
+    @classmethod
+    def reconcile_object_counts(cls) -> int:
+        """
+        Reset object_count from the PageViewStatistics rows of each content type.
+
+        bulk_increment counts an object as new when it had no row before the
+        upsert, so flushers merging the same new object in parallel can both
+        count it; this corrects that drift without rewriting the view totals.
+
+        Returns:
+            int: Number of rows corrected
+        """
+        counts = (
+            PageViewStatistics.objects.filter(
+                content_type_id=OuterRef("content_type_id")
+            )
+            .order_by()
+            .values("content_type_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        actual = Coalesce(Subquery(counts), Value(0))
+        return cls.objects.exclude(object_count=actual).update(object_count=actual)
+
+
+class Dimension(models.Model):
+    """
+    Interned string referenced by slim PageViewEvent rows (SLIM_EVENTS).
+
+    The primary key is a 64-bit hash of the value (see djinsight.dimensions),
+    so writers can compute it without looking the value up first.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    value = models.TextField(verbose_name=_("Value"))
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.value
+
+
+class UrlDimension(Dimension):
+    class Meta:
+        verbose_name = _("URL")
+        verbose_name_plural = _("URLs")
+
+
+class UserAgentDimension(Dimension):
+    class Meta:
+        verbose_name = _("User Agent")
+        verbose_name_plural = _("User Agents")
+
+
+class ReferrerDimension(Dimension):
+    class Meta:
+        verbose_name = _("Referrer")
+        verbose_name_plural = _("Referrers")
+
+
 class PageViewEvent(models.Model):
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
@@ -126,6 +422,50 @@ class PageViewEvent(models.Model):
     timestamp = models.DateTimeField(default=timezone.now, db_index=True, verbose_name=_("Timestamp"))
     is_unique = models.BooleanField(default=False, verbose_name=_("Is Unique"))
 
+    # Derived from user_agent and referrer when the event is stored; empty
+    # for events stored by older versions until classify_pageviews runs
+    device_category = models.CharField(
+        max_length=16, blank=True, default="", verbose_name=_("Device Category")
+    )
+    source_category = models.CharField(
+        max_length=16, blank=True, default="", verbose_name=_("Source Category")
+    )
+    referrer_domain = models.CharField(
+        max_length=255, blank=True, default="", verbose_name=_("Referrer Domain")
+    )
+
+    # Set instead of url, user_agent and referrer when SLIM_EVENTS is enabled
+    url_dimension = models.ForeignKey(
+        UrlDimension,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("URL"),
+    )
+    user_agent_dimension = models.ForeignKey(
+        UserAgentDimension,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("User Agent"),
+    )
+    referrer_dimension = models.ForeignKey(
+        ReferrerDimension,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+        verbose_name=_("Referrer"),
+    )
+
     class Meta:
         verbose_name = _("Page View Event")
         verbose_name_plural = _("Page View Events")
@@ -134,12 +474,39 @@ class PageViewEvent(models.Model):
             models.Index(fields=['session_key', 'content_type', 'object_id']),
             models.Index(fields=['timestamp']),
             models.Index(fields=['content_type', 'timestamp']),
+            models.Index(fields=['content_type', 'timestamp', 'device_category']),
+            models.Index(fields=['content_type', 'timestamp', 'source_category']),
+            models.Index(fields=['content_type', 'timestamp', 'referrer_domain']),
         ]
         ordering = ['-timestamp']
 
     def __str__(self):
         return f"{self.content_type} #{self.object_id} at {self.timestamp}"
 
+    def save(self, *args, **kwargs):
+        if not self.device_category:
+            self.classify()
+        super().save(*args, **kwargs)
+
+    def classify(self, user_agent=None, referrer=None) -> None:
+        """
+        Set the device, traffic source and referrer domain columns.
+
+        Reads the raw user_agent and referrer unless values are given (as for
+        slim events, whose raw columns are empty).
+        """
+        from djinsight.mcp.utils import (
+            classify_referrer,
+            extract_domain,
+            parse_user_agent_category,
+        )
+
+        user_agent = self.user_agent if user_agent is None else user_agent
+        referrer = self.referrer if referrer is None else referrer
+        self.device_category = parse_user_agent_category(user_agent)
+        self.source_category = classify_referrer(referrer)
+        self.referrer_domain = extract_domain(referrer)[:255]
+
 
 class PageViewSummary(models.Model):
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
@@ -164,6 +531,159 @@ class PageViewSummary(models.Model):
         return f"{self.content_type} #{self.object_id} - {self.date}: {self.total_views} views"
 
 
+class PageViewHourlySummary(models.Model):
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    hour = models.DateTimeField(verbose_name=_("Hour"))
+
+    total_views = models.PositiveIntegerField(default=0, verbose_name=_("Total Views"))
+    unique_views = models.PositiveIntegerField(
+        default=0, verbose_name=_("Unique Views")
+    )
+
+    class Meta:
+        verbose_name = _("Page View Hourly Summary")
+        verbose_name_plural = _("Page View Hourly Summaries")
+        unique_together = [('content_type', 'object_id', 'hour')]
+        indexes = [
+            models.Index(fields=['hour']),
+        ]
+        ordering = ['-hour']
+
+    def __str__(self):
+        return (
+            f"{self.content_type} #{self.object_id} - {self.hour}: "
+            f"{self.total_views} views"
+        )
+
+
+class PageViewDimensionSummary(models.Model):
+    """
+    Views per object and day, broken down by device, traffic source and
+    referrer domain. Maintained by the flusher alongside the hourly rollup,
+    which answers hour-of-day questions.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    date = models.DateField(verbose_name=_("Date"))
+    device_category = models.CharField(max_length=16, verbose_name=_("Device Category"))
+    source_category = models.CharField(max_length=16, verbose_name=_("Source Category"))
+    referrer_domain = models.CharField(
+        max_length=255, verbose_name=_("Referrer Domain")
+    )
+
+    total_views = models.PositiveIntegerField(default=0, verbose_name=_("Total Views"))
+    unique_views = models.PositiveIntegerField(
+        default=0, verbose_name=_("Unique Views")
+    )
+
+    class Meta:
+        verbose_name = _("Page View Dimension Summary")
+        verbose_name_plural = _("Page View Dimension Summaries")
+        unique_together = [
+            (
+                'content_type',
+                'object_id',
+                'date',
+                'device_category',
+                'source_category',
+                'referrer_domain',
+            )
+        ]
+        indexes = [
+            models.Index(fields=['content_type', 'date']),
+            models.Index(fields=['date']),
+        ]
+        ordering = ['-date']
+
+    def __str__(self):
+        return (
+            f"{self.content_type} #{self.object_id} - {self.date} "
+            f"({self.device_category}, {self.source_category}): "
+            f"{self.total_views} views"
+        )
+
+
+class PageViewSketch(models.Model):
+    """
+    Persisted HyperLogLog of the visitors of an object.
+
+    Used when UNIQUE_VIEWS_MODE is "hll": the flusher merges the Redis
+    sketches into these rows, per day and for all time (period "all").
+    """
+
+    ALL_TIME = "all"
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    period = models.CharField(max_length=10, verbose_name=_("Period"))
+    registers = models.BinaryField(verbose_name=_("Registers"))
+    unique_views = models.PositiveIntegerField(
+        default=0, verbose_name=_("Unique Views")
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Page View Sketch")
+        verbose_name_plural = _("Page View Sketches")
+        unique_together = [('content_type', 'object_id', 'period')]
+
+    def __str__(self):
+        return (
+            f"{self.content_type} #{self.object_id} ({self.period}): "
+            f"~{self.unique_views} visitors"
+        )
+
+
+class AnalyticsSnapshot(models.Model):
+    """
+    Precomputed Wagtail dashboard data for a preset period and content type
+    (all content types when empty), refreshed by refresh_dashboard_snapshots_task.
+    """
+
+    period = models.CharField(max_length=10, verbose_name=_("Period"))
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, null=True, blank=True
+    )
+    payload = models.JSONField(default=dict, verbose_name=_("Payload"))
+    computed_at = models.DateTimeField(verbose_name=_("Computed At"))
+
+    class Meta:
+        verbose_name = _("Analytics Snapshot")
+        verbose_name_plural = _("Analytics Snapshots")
+        unique_together = [('period', 'content_type')]
+
+    def __str__(self):
+        return f"{self.content_type or 'All'} ({self.period}) at {self.computed_at}"
+
+
+class ProcessingCursor(models.Model):
+    """
+    Position of an incremental background job (such as the highest event id
+    summarized), kept in the database so every worker shares it.
+    """
+
+    name = models.CharField(max_length=64, unique=True, verbose_name=_("Name"))
+    position = models.BigIntegerField(verbose_name=_("Position"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Processing Cursor")
+        verbose_name_plural = _("Processing Cursors")
+
+    def __str__(self):
+        return f"{self.name}: {self.position}"
+
+    @classmethod
+    def get_position(cls, name: str) -> Optional[int]:
+        return cls.objects.filter(name=name).values_list("position", flat=True).first()
+
+    @classmethod
+    def set_position(cls, name: str, position: int) -> None:
+        cls.objects.update_or_create(name=name, defaults={"position": position})
+
+
 class StatsQueryMixin:
 
     @classmethod
@@ -172,84 +692,38 @@ class StatsQueryMixin:
 
     @classmethod
     def get_views_today(cls, obj, chart_data: bool = False):
+        from djinsight.series import get_view_series
+
         stats = cls.get_stats_for_object(obj)
         if not stats:
             return [] if chart_data else 0
 
-        today_start = now().replace(hour=0, minute=0, second=0, microsecond=0)
-        content_type = ContentType.objects.get_for_model(obj)
+        current_time = timezone.localtime(now())
+        today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        series = get_view_series(obj, today_start, current_time, granularity="hour")
 
         if chart_data:
-            data = []
-            for hour in range(24):
-                hour_start = today_start.replace(hour=hour)
-                hour_end = hour_start + timedelta(hours=1)
-
-                if hour_end > now():
-                    break
-
-                count = PageViewEvent.objects.filter(
-                    content_type=content_type,
-                    object_id=obj.pk,
-                    timestamp__gte=hour_start,
-                    timestamp__lt=hour_end,
-                ).count()
-
-                data.append({
-                    'date': hour_start.strftime('%Y-%m-%d %H:00'),
-                    'label': f"{hour:02d}:00",
-                    'count': count,
-                })
-            return data
+            # Only complete hours are charted
+            return series[:-1]
 
-        return PageViewEvent.objects.filter(
-            content_type=content_type,
-            object_id=obj.pk,
-            timestamp__gte=today_start,
-        ).count()
+        return sum(entry['count'] for entry in series)
 
     @classmethod
     def get_views_period(cls, obj, days: int, chart_data: bool = False):
+        from djinsight.series import get_view_series
+
         stats = cls.get_stats_for_object(obj)
         if not stats:
             return [] if chart_data else 0
 
-        start_date = now() - timedelta(days=days - 1)
-        content_type = ContentType.objects.get_for_model(obj)
+        end_date = timezone.localtime(now()).date()
+        start_date = end_date - timedelta(days=days - 1)
+        series = get_view_series(obj, start_date, end_date, granularity="day")
 
         if chart_data:
-            data = []
-            current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            for i in range(days):
-                day = current_date + timedelta(days=i)
-                day_end = day + timedelta(days=1)
-
-                summary = PageViewSummary.objects.filter(
-                    content_type=content_type,
-                    object_id=obj.pk,
-                    date=day.date(),
-                ).first()
-
-                count = summary.total_views if summary else PageViewEvent.objects.filter(
-                    content_type=content_type,
-                    object_id=obj.pk,
-                    timestamp__gte=day,
-                    timestamp__lt=day_end,
-                ).count()
-
-                data.append({
-                    'date': day.strftime('%Y-%m-%d'),
-                    'label': day.strftime('%a' if days <= 7 else '%d %b'),
-                    'count': count,
-                })
-            return data
+            return series
 
-        return PageViewEvent.objects.filter(
-            content_type=content_type,
-            object_id=obj.pk,
-            timestamp__gte=start_date,
-        ).count()
+        return sum(entry['count'] for entry in series)
 
     @classmethod
     def get_views_week(cls, obj, chart_data: bool = False):
@@ -261,50 +735,22 @@ class StatsQueryMixin:
 
     @classmethod
     def get_views_year(cls, obj, chart_data: bool = False):
+        from djinsight.series import add_months, get_view_series
+
         stats = cls.get_stats_for_object(obj)
         if not stats:
             return [] if chart_data else 0
 
-        year_start = now().replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        content_type = ContentType.objects.get_for_model(obj)
+        today = timezone.localtime(now()).date()
 
         if chart_data:
-            data = []
-            for i in range(11, -1, -1):
-                month_date = now().replace(day=1) - timedelta(days=i * 30)
-                month_start = month_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-                if month_start.month == 12:
-                    month_end = month_start.replace(year=month_start.year + 1, month=1)
-                else:
-                    month_end = month_start.replace(month=month_start.month + 1)
-
-                summaries = PageViewSummary.objects.filter(
-                    content_type=content_type,
-                    object_id=obj.pk,
-                    date__gte=month_start.date(),
-                    date__lt=month_end.date(),
-                ).aggregate(total=Sum('total_views'))
-
-                count = summaries['total'] or PageViewEvent.objects.filter(
-                    content_type=content_type,
-                    object_id=obj.pk,
-                    timestamp__gte=month_start,
-                    timestamp__lt=month_end,
-                ).count()
-
-                data.append({
-                    'date': month_start.strftime('%Y-%m'),
-                    'label': month_start.strftime('%b %Y'),
-                    'count': count,
-                })
-            return data
+            # The current month and the 11 calendar months before it
+            start_date = add_months(today.replace(day=1), -11)
+            return get_view_series(obj, start_date, today, granularity="month")
 
-        return PageViewEvent.objects.filter(
-            content_type=content_type,
-            object_id=obj.pk,
-            timestamp__gte=year_start,
-        ).count()
+        year_start = today.replace(month=1, day=1)
+        series = get_view_series(obj, year_start, today, granularity="month")
+        return sum(entry['count'] for entry in series)
 
     @classmethod
     def get_unique_views_period(cls, obj, start_date, end_date=None):
@@ -0,0 +1,377 @@
+"""
+Optional PostgreSQL range partitioning of PageViewEvent on ``timestamp``.
+
+Once the table has been converted with ``convert_to_partitioned`` (the
+``partition_pageviews --convert`` command), events live in one partition per
+month or day. ``create_partitions`` keeps EVENT_PARTITIONS_AHEAD periods
+created in advance and retention drops whole partitions instead of deleting
+rows, so it costs a catalog update rather than hours of index churn; only the
+partitions straddling the cutoff are deleted from row by row.
+
+Partition bounds are UTC midnights. Every function here is a no-op on other
+databases and on PostgreSQL tables that have not been converted.
+"""
+
+import re
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from typing import Iterable, List, Optional
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from djinsight.conf import djinsight_settings
+from djinsight.models import PageViewEvent
+
+INTERVALS = ("month", "day")
+
+# start/end are None for MINVALUE/MAXVALUE bounds
+Partition = namedtuple("Partition", "name start end")
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+def _connection():
+    return connections[router.db_for_write(PageViewEvent)]
+
+
+def _table() -> str:
+    return PageViewEvent._meta.db_table
+
+
+def period_start(day: date, interval: str) -> date:
+    """Return the first day of the period containing ``day``."""
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown partition interval: {interval!r}")
+    return day.replace(day=1) if interval == "month" else day
+
+
+def next_period(start: date, interval: str) -> date:
+    """Return the first day of the period following the one starting at ``start``."""
+    if interval == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def partition_name(start: date, interval: str) -> str:
+    """Name of the partition holding the period starting at ``start``."""
+    suffix = start.strftime("%Y%m" if interval == "month" else "%Y%m%d")
+    return f"{_table()}_p{suffix}"
+
+
+def _bound_literal(day: date) -> str:
+    return f"'{day.isoformat()} 00:00:00+00'"
+
+
+def _parse_bound(value: str) -> Optional[datetime]:
+    value = value.strip("'")
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    if re.search(r"[+-]\d\d$", value):
+        value += ":00"
+    return datetime.fromisoformat(value)
+
+
+def is_partitioned(connection=None) -> bool:
+    """Whether PageViewEvent is a partitioned PostgreSQL table."""
+    connection = connection or _connection()
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [connection.ops.quote_name(_table())],
+        )
+        return cursor.fetchone() is not None
+
+
+def default_partition(connection=None) -> Optional[str]:
+    """Name of the DEFAULT partition of PageViewEvent, if it has one."""
+    connection = connection or _connection()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s) "
+            "AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'",
+            [connection.ops.quote_name(_table())],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def get_partitions(connection=None) -> List[Partition]:
+    """List the range partitions of PageViewEvent, ordered by start."""
+    connection = connection or _connection()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [connection.ops.quote_name(_table())],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound)
+        if match:  # skips the DEFAULT partition
+            start, end = (_parse_bound(value) for value in match.groups())
+            partitions.append(Partition(name, start, end))
+    minimum = datetime.min.replace(tzinfo=dt_timezone.utc)
+    return sorted(partitions, key=lambda partition: partition.start or minimum)
+
+
+def missing_periods(
+    partitions: Iterable[Partition],
+    today: date,
+    ahead: int,
+    interval: str,
+) -> List[date]:
+    """
+    Start days of the periods from ``today`` through ``ahead`` periods later
+    that no existing partition overlaps.
+    """
+    partitions = list(partitions)
+    missing = []
+    start = period_start(today, interval)
+    for _ in range(ahead + 1):
+        end = next_period(start, interval)
+        lower = datetime.combine(start, time.min, dt_timezone.utc)
+        upper = datetime.combine(end, time.min, dt_timezone.utc)
+        overlaps = any(
+            (partition.start is None or partition.start < upper)
+            and (partition.end is None or partition.end > lower)
+            for partition in partitions
+        )
+        if not overlaps:
+            missing.append(start)
+        start = end
+    return missing
+
+
+def create_partitions(
+    ahead: Optional[int] = None, interval: Optional[str] = None
+) -> List[str]:
+    """
+    Create the partitions for the current and the next ``ahead`` periods.
+
+    Periods already covered by a partition are skipped, so changing
+    EVENT_PARTITION_INTERVAL only affects partitions created afterwards.
+    Events of a new period that already landed in the DEFAULT partition are
+    moved into the new partition before it is attached.
+
+    Returns:
+        list: Names of the partitions created
+    """
+    connection = _connection()
+    if not is_partitioned(connection):
+        return []
+
+    ahead = djinsight_settings.EVENT_PARTITIONS_AHEAD if ahead is None else ahead
+    interval = interval or djinsight_settings.EVENT_PARTITION_INTERVAL
+    today = timezone.now().astimezone(dt_timezone.utc).date()
+    quote = connection.ops.quote_name
+
+    timestamp_column = quote(PageViewEvent._meta.get_field("timestamp").column)
+    default = default_partition(connection)
+
+    created = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        periods = missing_periods(get_partitions(connection), today, ahead, interval)
+        for start in periods:
+            name = partition_name(start, interval)
+            lower = _bound_literal(start)
+            upper = _bound_literal(next_period(start, interval))
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} "
+                f"(LIKE {quote(_table())} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+            if default:
+                # Attaching fails while the DEFAULT partition holds rows of
+                # the new range, so move them over first
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {quote(default)} "
+                    f"WHERE {timestamp_column} >= {lower} "
+                    f"AND {timestamp_column} < {upper} RETURNING *) "
+                    f"INSERT INTO {quote(name)} SELECT * FROM moved"
+                )
+            cursor.execute(
+                f"ALTER TABLE {quote(_table())} ATTACH PARTITION {quote(name)} "
+                f"FOR VALUES FROM ({lower}) TO ({upper})"
+            )
+            created.append(name)
+    return created
+
+
+def drop_partitions(before: datetime) -> int:
+    """
+    Detach and drop every partition whose rows are all older than ``before``.
+
+    Rows older than ``before`` in a partition straddling it (such as the
+    legacy table attached by convert_to_partitioned) and in the DEFAULT
+    partition are deleted in batches of CLEANUP_BATCH_SIZE; the partition
+    itself is dropped once it is entirely past retention.
+
+    Returns:
+        int: Number of events removed, estimated from the planner statistics
+        for dropped partitions
+    """
+    connection = _connection()
+    if not is_partitioned(connection):
+        return 0
+
+    quote = connection.ops.quote_name
+    dropped = 0
+    straddling = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for partition in get_partitions(connection):
+            if partition.start is not None and partition.start >= before:
+                continue
+            if partition.end is None or partition.end > before:
+                straddling.append(partition.name)
+                continue
+            cursor.execute(
+                "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class "
+                "WHERE oid = to_regclass(%s)",
+                [quote(partition.name)],
+            )
+            dropped += cursor.fetchone()[0]
+            cursor.execute(
+                f"ALTER TABLE {quote(_table())} "
+                f"DETACH PARTITION {quote(partition.name)}"
+            )
+            cursor.execute(f"DROP TABLE {quote(partition.name)}")
+
+    default = default_partition(connection)
+    for name in straddling + ([default] if default else []):
+        dropped += _delete_before(connection, name, before)
+    return dropped
+
+
+def _delete_before(connection, name: str, before: datetime) -> int:
+    """Delete the rows of one partition older than ``before``, in batches."""
+    quote = connection.ops.quote_name
+    timestamp_column = quote(PageViewEvent._meta.get_field("timestamp").column)
+    batch_size = djinsight_settings.CLEANUP_BATCH_SIZE
+    deleted = 0
+    while True:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {quote(name)} WHERE ctid IN ("
+                    f"SELECT ctid FROM {quote(name)} "
+                    f"WHERE {timestamp_column} < %s LIMIT %s)",
+                    [before, batch_size],
+                )
+                count = cursor.rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def convert_to_partitioned(interval: Optional[str] = None) -> List[str]:
+    """
+    Convert PageViewEvent into a partitioned table, in one transaction.
+
+    The existing table is renamed and attached as the partition holding
+    everything before the end of the current period, so no rows are copied;
+    its (id) primary key is dropped, and the only full scans are building
+    its (id, timestamp) primary key index and validating the partition
+    bound. A DEFAULT partition catches events outside the created ranges.
+
+    Returns:
+        list: Names of the partitions created besides the existing table
+
+    Raises:
+        RuntimeError: If the database is not PostgreSQL or the table is
+            already partitioned
+    """
+    connection = _connection()
+    if connection.vendor != "postgresql":
+        raise RuntimeError("Event partitioning requires PostgreSQL")
+    if is_partitioned(connection):
+        raise RuntimeError(f"{_table()} is already partitioned")
+
+    interval = interval or djinsight_settings.EVENT_PARTITION_INTERVAL
+    table = _table()
+    legacy = f"{table}_legacy"
+    sequence = f"{table}_id_seq"
+    quote = connection.ops.quote_name
+    timestamp_column = quote(PageViewEvent._meta.get_field("timestamp").column)
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT MAX(id), MAX({timestamp_column}) FROM {quote(table)}"
+            )
+            max_id, max_timestamp = cursor.fetchone()
+            latest = max(filter(None, [max_timestamp, timezone.now()]))
+            latest_day = latest.astimezone(dt_timezone.utc).date()
+            boundary = next_period(period_start(latest_day, interval), interval)
+
+            # Free the table, index and sequence names for the partitioned table
+            cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE schemaname = current_schema() AND tablename = %s",
+                [legacy],
+            )
+            for (index,) in cursor.fetchall():
+                renamed = quote(index[:56] + "_legacy")
+                cursor.execute(f"ALTER INDEX {quote(index)} RENAME TO {renamed}")
+            # The partitioned table's primary key must include the partition
+            # key; the legacy (id) key would conflict with it once attached
+            cursor.execute(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = to_regclass(%s) AND contype = 'p'",
+                [quote(legacy)],
+            )
+            for (constraint,) in cursor.fetchall():
+                cursor.execute(
+                    f"ALTER TABLE {quote(legacy)} DROP CONSTRAINT {quote(constraint)}"
+                )
+            cursor.execute(
+                f"ALTER TABLE {quote(legacy)} ALTER COLUMN id DROP IDENTITY IF EXISTS"
+            )
+            cursor.execute(f"ALTER TABLE {quote(legacy)} ALTER COLUMN id DROP DEFAULT")
+            cursor.execute(f"DROP SEQUENCE IF EXISTS {quote(sequence)}")
+
+            cursor.execute(
+                f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)}) "
+                f"PARTITION BY RANGE ({timestamp_column})"
+            )
+            cursor.execute(
+                f"CREATE SEQUENCE {quote(sequence)} START WITH {int(max_id or 0) + 1} "
+                f"OWNED BY {quote(table)}.id"
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} ALTER COLUMN id "
+                f"SET DEFAULT nextval('{quote(sequence)}'::regclass)"
+            )
+            # Unique constraints on a partitioned table must include the
+            # partition key; partitions attached later get a matching index
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} ADD PRIMARY KEY (id, {timestamp_column})"
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(legacy)} "
+                f"FOR VALUES FROM (MINVALUE) TO ({_bound_literal(boundary)})"
+            )
+            cursor.execute(
+                f"CREATE TABLE {quote(table + '_default')} "
+                f"PARTITION OF {quote(table)} DEFAULT"
+            )
+
+        # Recreated on the parent, these attach to the renamed legacy indexes
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for statement in schema_editor._model_indexes_sql(PageViewEvent):
+                schema_editor.execute(statement)
+            field = PageViewEvent._meta.get_field("content_type")
+            schema_editor.execute(
+                schema_editor._create_fk_sql(
+                    PageViewEvent, field, "_fk_%(to_table)s_%(to_column)s"
+                )
+            )
+
+        return create_partitions(interval=interval)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 
 class BaseProvider(ABC):
@@ -37,6 +37,38 @@ class BaseProvider(ABC):
         """Mark object as viewed by session (used by Redis provider)."""
         pass
 
+    def record_and_check(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decide whether the view is unique for its session and record it.
+
+        Providers that can test and record in one atomic step override this.
+        """
+        is_unique = self.check_unique_view(
+            event_data["session_key"],
+            event_data["content_type"],
+            event_data["object_id"],
+        )
+        result = self.record_view({**event_data, "is_unique": is_unique})
+        result.setdefault("is_unique", is_unique)
+        return result
+
+    def record_many(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Record several views, e.g. all objects tracked on one page.
+
+        Providers that can batch the work into one round trip override this.
+        """
+        return [self.record_and_check(event_data) for event_data in events]
+
+    def get_pending(self, objects: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        """
+        Return the views of (content_type, object_id) pairs that are recorded
+        but not in PageViewStatistics yet.
+
+        Providers that write statistics directly have nothing pending.
+        """
+        return [{"total_views": 0, "unique_views": 0} for _ in objects]
+
 
 class AsyncBaseProvider(ABC):
     """
@@ -72,3 +104,33 @@ class AsyncBaseProvider(ABC):
     ) -> None:
         """Mark object as viewed by session asynchronously."""
         pass
+
+    async def record_and_check(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decide whether the view is unique for its session and record it asynchronously.
+
+        Providers that can test and record in one atomic step override this.
+        """
+        is_unique = await self.check_unique_view(
+            event_data["session_key"],
+            event_data["content_type"],
+            event_data["object_id"],
+        )
+        result = await self.record_view({**event_data, "is_unique": is_unique})
+        result.setdefault("is_unique", is_unique)
+        return result
+
+    async def record_many(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Record several views asynchronously, e.g. all objects tracked on one page.
+
+        Providers that can batch the work into one round trip override this.
+        """
+        return [await self.record_and_check(event_data) for event_data in events]
+
+    async def get_pending(self, objects: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        """
+        Return the views of (content_type, object_id) pairs that are recorded
+        but not in PageViewStatistics yet, asynchronously.
+        """
+        return [{"total_views": 0, "unique_views": 0} for _ in objects]
@@ -2,11 +2,14 @@ from datetime import datetime
 from typing import Any, Dict
 
 from asgiref.sync import sync_to_async
-from django.contrib.contenttypes.models import ContentType
 from django.db.models import F
 from django.utils import timezone
 
-from djinsight.models import PageViewEvent, PageViewStatistics
+from djinsight.cache import invalidate_object
+from djinsight.conf import djinsight_settings
+from djinsight.content_types import get_content_type_id
+from djinsight.dimensions import apply_dimensions
+from djinsight.models import ContentTypeTotals, PageViewEvent, PageViewStatistics
 from djinsight.providers.base import AsyncBaseProvider, BaseProvider
 
 
@@ -23,8 +26,12 @@ class DatabaseProvider(BaseProvider):
             content_type_str = event_data.get("content_type")
             object_id = event_data.get("object_id")
 
-            app_label, model = content_type_str.split(".")
-            ct = ContentType.objects.get_by_natural_key(app_label, model.lower())
+            content_type_id = get_content_type_id(content_type_str)
+            if content_type_id is None:
+                return {
+                    "success": False,
+                    "error": f"Unknown content type: {content_type_str}",
+                }
 
             timestamp = event_data.get("timestamp")
             if isinstance(timestamp, (int, float)):
@@ -34,8 +41,8 @@ class DatabaseProvider(BaseProvider):
             elif not timestamp:
                 timestamp = timezone.now()
 
-            event = PageViewEvent.objects.create(
-                content_type=ct,
+            event = PageViewEvent(
+                content_type_id=content_type_id,
                 object_id=object_id,
                 url=event_data.get("url", ""),
                 session_key=event_data.get("session_key", "")[:255],
@@ -45,9 +52,13 @@ class DatabaseProvider(BaseProvider):
                 timestamp=timestamp,
                 is_unique=event_data.get("is_unique", False),
             )
+            event.classify()
+            if djinsight_settings.SLIM_EVENTS:
+                apply_dimensions([event])
+            event.save()
 
             stats, created = PageViewStatistics.objects.get_or_create(
-                content_type=ct,
+                content_type_id=content_type_id,
                 object_id=object_id,
             )
 
@@ -63,6 +74,15 @@ class DatabaseProvider(BaseProvider):
 
             PageViewStatistics.objects.filter(pk=stats.pk).update(**updates)
             stats.refresh_from_db()
+            ContentTypeTotals.apply_deltas(
+                {
+                    content_type_id: {
+                        "total_views": 1,
+                        "unique_views": int(bool(event_data.get("is_unique"))),
+                    }
+                }
+            )
+            invalidate_object(content_type_id, object_id)
 
             return {
                 "success": True,
@@ -79,12 +99,11 @@ class DatabaseProvider(BaseProvider):
     def get_stats(self, content_type: str, object_id: int) -> Dict[str, Any]:
         """Get statistics from database."""
         try:
-            app_label, model = content_type.split(".")
-            ct = ContentType.objects.get_by_natural_key(app_label, model.lower())
+            content_type_id = get_content_type_id(content_type)
+            if content_type_id is None:
+                return {"error": f"Unknown content type: {content_type}"}
 
-            stats = PageViewStatistics.objects.filter(
-                content_type=ct, object_id=object_id
-            ).first()
+            stats = PageViewStatistics.get_cached(content_type_id, object_id)
 
             if not stats:
                 return {
@@ -113,11 +132,12 @@ class DatabaseProvider(BaseProvider):
     ) -> bool:
         """Check if this is a unique view by checking existing events."""
         try:
-            app_label, model = content_type.split(".")
-            ct = ContentType.objects.get_by_natural_key(app_label, model.lower())
+            content_type_id = get_content_type_id(content_type)
+            if content_type_id is None:
+                return True
 
             exists = PageViewEvent.objects.filter(
-                content_type=ct,
+                content_type_id=content_type_id,
                 object_id=object_id,
                 session_key=session_key,
             ).exists()
@@ -1,53 +1,339 @@
-import json
+import asyncio
+import atexit
 import logging
-from typing import Any, Dict
+import os
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
 
 import redis
 import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from redis.exceptions import ConnectionError, TimeoutError
+from django.utils import timezone
 
+from djinsight.codec import encode_event, pack_event
 from djinsight.conf import djinsight_settings
+from djinsight.content_types import aget_content_type_id, get_content_type_id
+from djinsight.live import merge_pending
+from djinsight.models import PageViewStatistics
 from djinsight.providers.base import AsyncBaseProvider, BaseProvider
 
 logger = logging.getLogger(__name__)
 
+_pool_lock = threading.Lock()
+_connection_pool = None
+_redis_client = None
+_redis_client_checked = False
+# asyncio.AbstractEventLoop -> aioredis.ConnectionPool
+_async_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    kwargs = {
+        "socket_timeout": djinsight_settings.REDIS_TIMEOUT,
+        "socket_connect_timeout": djinsight_settings.REDIS_CONNECT_TIMEOUT,
+        "health_check_interval": 30,
+    }
+    if djinsight_settings.REDIS_MAX_CONNECTIONS:
+        kwargs["max_connections"] = djinsight_settings.REDIS_MAX_CONNECTIONS
+    if not djinsight_settings.REDIS_URL:
+        kwargs.update(
+            host=djinsight_settings.REDIS_HOST,
+            port=djinsight_settings.REDIS_PORT,
+            db=djinsight_settings.REDIS_DB,
+            password=djinsight_settings.REDIS_PASSWORD,
+        )
+    return kwargs
+
+
+def get_connection_pool() -> redis.ConnectionPool:
+    """Return the Redis connection pool shared by this process."""
+    global _connection_pool
+    if _connection_pool is None:
+        with _pool_lock:
+            if _connection_pool is None:
+                if djinsight_settings.REDIS_URL:
+                    _connection_pool = redis.ConnectionPool.from_url(
+                        djinsight_settings.REDIS_URL, **_pool_kwargs()
+                    )
+                else:
+                    _connection_pool = redis.ConnectionPool(**_pool_kwargs())
+    return _connection_pool
+
+
+def get_redis_client(check: bool = False) -> redis.Redis:
+    """
+    Return the Redis client shared by this process.
+
+    With check=True the connection is verified with a PING the first time,
+    raising redis.exceptions.ConnectionError if Redis is unreachable.
+    """
+    global _redis_client, _redis_client_checked
+    if _redis_client is None:
+        _redis_client = redis.Redis(connection_pool=get_connection_pool())
+    if check and not _redis_client_checked:
+        _redis_client.ping()
+        _redis_client_checked = True
+    return _redis_client
+
+
+def get_async_connection_pool() -> aioredis.ConnectionPool:
+    """Return the async Redis connection pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _async_pools.get(loop)
+    if pool is None:
+        if djinsight_settings.REDIS_URL:
+            pool = aioredis.ConnectionPool.from_url(
+                djinsight_settings.REDIS_URL, **_pool_kwargs()
+            )
+        else:
+            pool = aioredis.ConnectionPool(**_pool_kwargs())
+        _async_pools[loop] = pool
+    return pool
+
+
+def close_connection_pools() -> None:
+    """Disconnect the shared sync pool; runs at interpreter shutdown."""
+    global _connection_pool, _redis_client, _redis_client_checked
+    with _pool_lock:
+        pool, _connection_pool = _connection_pool, None
+        _redis_client, _redis_client_checked = None, False
+    if pool is not None:
+        pool.disconnect()
+
+
+def _reset_after_fork() -> None:
+    # The child must not share sockets with its parent: drop (but don't
+    # disconnect) the inherited pools so new ones are created on first use.
+    global _pool_lock, _connection_pool, _redis_client, _redis_client_checked
+    _pool_lock = threading.Lock()
+    _connection_pool = None
+    _redis_client, _redis_client_checked = None, False
+    _async_pools.clear()
+
+
+atexit.register(close_connection_pools)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def queue_event(
+    pipe, key_prefix: str, event_data: Dict[str, Any], expiration: int
+) -> None:
+    """
+    Add the buffered event to a pipeline.
+
+    In "stream" ingest mode the event is appended to a single Redis Stream that
+    the flusher drains with a consumer group; otherwise it is stored under its
+    own expiring key.
+    """
+    payload = encode_event(event_data)
+    if djinsight_settings.use_redis_stream:
+        maxlen = djinsight_settings.REDIS_STREAM_MAXLEN
+        pipe.xadd(
+            djinsight_settings.redis_stream_key,
+            {"d": payload},
+            maxlen=maxlen,
+            approximate=bool(maxlen),
+        )
+    else:
+        pipe.setex(f"{key_prefix}:{event_data['view_id']}", expiration, payload)
+
+
+def seen_key(key_prefix: str, session_key: str) -> str:
+    """Key of the set of objects a session has viewed."""
+    return f"{key_prefix}:seen:{session_key}"
+
+
+def seen_member(content_type: str, object_id) -> str:
+    """Member of a session's seen-set for one object."""
+    return f"{content_type}:{object_id}"
+
+
+def hll_key(
+    key_prefix: str, content_type: str, object_id, period: Optional[str] = None
+) -> str:
+    """Key of the HyperLogLog of an object's visitors, for all time or one day."""
+    key = f"{key_prefix}:hll:{content_type}:{object_id}"
+    return f"{key}:{period}" if period else key
+
+
+def pending_keys(key_prefix: str, content_type: str, object_id):
+    """Keys counting the total and unique views not flushed to the database yet."""
+    return (
+        f"{key_prefix}:pending:{content_type}:{object_id}",
+        f"{key_prefix}:pending_unique:{content_type}:{object_id}",
+    )
+
+
+def incr_pending(pipe, key: str, expiration: int) -> None:
+    """
+    Add a view to a pending counter in a pipeline.
+
+    The expiration is set only when the counter is created, not refreshed on
+    every view, so views the flusher never sees (buffered keys that expired,
+    stream entries trimmed by MAXLEN) stop inflating it once it expires.
+    """
+    pipe.set(key, 0, ex=expiration, nx=True)
+    pipe.incr(key)
+
+
+# Adds the object to the session's seen-set, bumps the pending counters and
+# buffers the event in one atomic call. In "hll" unique mode the visitor is
+# added to the object's HyperLogLogs instead and the pending unique counter is
+# left alone. Pending counters get their expiration when created, like in
+# incr_pending.
+# KEYS: seen-set (or all-time HLL), buffer (event key or stream),
+#       pending counter, pending unique counter, daily HLL (hll mode only)
+# ARGV: expiration, encoded event without its is_unique flag, ingest mode,
+#       stream maxlen, unique mode, visitor id, seen-set member,
+#       payload suffix for a unique view, payload suffix for a repeat view
+RECORD_VIEW_SCRIPT = """
+local unique = 0
+if ARGV[5] == 'hll' then
+    unique = redis.call('PFADD', KEYS[1], ARGV[6])
+    redis.call('PFADD', KEYS[5], ARGV[6])
+    redis.call('EXPIRE', KEYS[5], ARGV[1])
+else
+    unique = redis.call('SADD', KEYS[1], ARGV[7])
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    if unique == 1 then
+        redis.call('SET', KEYS[4], 0, 'EX', ARGV[1], 'NX')
+        redis.call('INCR', KEYS[4])
+    end
+end
+redis.call('SET', KEYS[3], 0, 'EX', ARGV[1], 'NX')
+redis.call('INCR', KEYS[3])
+
+local payload = ARGV[2] .. (unique == 1 and ARGV[8] or ARGV[9])
+if ARGV[3] == 'stream' then
+    local maxlen = tonumber(ARGV[4])
+    if maxlen > 0 then
+        redis.call('XADD', KEYS[2], 'MAXLEN', '~', maxlen, '*', 'd', payload)
+    else
+        redis.call('XADD', KEYS[2], '*', 'd', payload)
+    end
+else
+    redis.call('SET', KEYS[2], payload, 'EX', ARGV[1])
+end
+return unique
+"""
+
+
+def record_view_script_params(key_prefix: str, event_data: Dict[str, Any]):
+    """Build the KEYS and ARGV for RECORD_VIEW_SCRIPT."""
+    content_type = event_data['content_type']
+    object_id = event_data['object_id']
+    if djinsight_settings.use_redis_stream:
+        mode, buffer_key = "stream", djinsight_settings.redis_stream_key
+    else:
+        mode, buffer_key = "keys", f"{key_prefix}:{event_data['view_id']}"
+
+    if djinsight_settings.use_hll_uniques:
+        unique_mode = "hll"
+        unique_key = hll_key(key_prefix, content_type, object_id)
+    else:
+        unique_mode = "session"
+        unique_key = seen_key(key_prefix, event_data['session_key'])
+
+    keys = [
+        unique_key,
+        buffer_key,
+        *pending_keys(key_prefix, content_type, object_id),
+    ]
+    if unique_mode == "hll":
+        day = timezone.localdate().isoformat()
+        keys.append(hll_key(key_prefix, content_type, object_id, day))
+    # The script appends the suffix matching the is_unique flag
+    payload_head, unique_suffix, repeat_suffix = pack_event(event_data)
+    args = [
+        djinsight_settings.REDIS_EXPIRATION,
+        payload_head,
+        mode,
+        djinsight_settings.REDIS_STREAM_MAXLEN or 0,
+        unique_mode,
+        event_data['session_key'] or "",
+        seen_member(content_type, object_id),
+        unique_suffix,
+        repeat_suffix,
+    ]
+    return keys, args
+
+
+# Subtracts flushed views from the pending counters, deleting counters that
+# reach zero (or go negative for views buffered before they existed). When
+# the ingest stream is empty nothing is buffered any more, so whatever is left
+# on the counters belongs to dropped entries and they are deleted outright.
+# KEYS: ingest stream (or "" in keys mode), pending counters
+# ARGV: amounts, one per pending counter
+FLUSHED_SCRIPT = """
+local drained = KEYS[1] ~= '' and redis.call('XLEN', KEYS[1]) == 0
+for i = 2, #KEYS do
+    if redis.call('DECRBY', KEYS[i], ARGV[i - 1]) <= 0 or drained then
+        redis.call('DEL', KEYS[i])
+    end
+end
+return #KEYS - 1
+"""
+
+
+def parse_pending(values, unique_counts=None) -> List[Dict[str, Any]]:
+    """
+    Turn MGET results for pending_keys pairs into per-object deltas.
+
+    With HyperLogLog unique counting, ``unique_counts`` holds each object's
+    all-time PFCOUNT and is returned as unique_estimate.
+    """
+    pending = []
+    for index in range(0, len(values), 2):
+        total, unique = values[index], values[index + 1]
+        delta = {
+            'total_views': max(int(total), 0) if total else 0,
+            'unique_views': max(int(unique), 0) if unique else 0,
+        }
+        if unique_counts is not None:
+            delta['unique_estimate'] = unique_counts[index // 2]
+        pending.append(delta)
+    return pending
+
+
+def load_stats(content_type_id: Optional[int], object_id: int):
+    """
+    Load the statistics row merged with the pending deltas, bypassing the
+    stats cache: the flusher moves views from the deltas into the row, so a
+    row cached by a process that missed the invalidation would lose them.
+    """
+    if content_type_id is None:
+        return None
+    return PageViewStatistics.objects.filter(
+        content_type_id=content_type_id, object_id=object_id
+    ).first()
+
+
+def stats_response(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Format merged stats like DatabaseProvider.get_stats (ISO timestamps)."""
+    first_viewed_at = stats['first_viewed_at']
+    last_viewed_at = stats['last_viewed_at']
+    return {
+        **stats,
+        'first_viewed_at': first_viewed_at.isoformat() if first_viewed_at else None,
+        'last_viewed_at': last_viewed_at.isoformat() if last_viewed_at else None,
+    }
+
 
 class RedisProvider(BaseProvider):
 
-    def __init__(self):
-        self.client = self._get_redis_client()
+    def __init__(self, client=None):
+        self.client = client if client is not None else get_redis_client()
         self.key_prefix = djinsight_settings.redis_key_prefix
-
-    def _get_redis_client(self):
-        try:
-            if djinsight_settings.REDIS_URL:
-                client = redis.from_url(
-                    djinsight_settings.REDIS_URL,
-                    socket_timeout=djinsight_settings.REDIS_TIMEOUT,
-                    socket_connect_timeout=djinsight_settings.REDIS_CONNECT_TIMEOUT,
-                    health_check_interval=30,
-                )
-            else:
-                client = redis.Redis(
-                    host=djinsight_settings.REDIS_HOST,
-                    port=djinsight_settings.REDIS_PORT,
-                    db=djinsight_settings.REDIS_DB,
-                    password=djinsight_settings.REDIS_PASSWORD,
-                    socket_timeout=djinsight_settings.REDIS_TIMEOUT,
-                    socket_connect_timeout=djinsight_settings.REDIS_CONNECT_TIMEOUT,
-                    health_check_interval=30,
-                )
-            client.ping()
-            logger.info("Redis connection established")
-            return client
-        except (ConnectionError, TimeoutError) as e:
-            logger.error(f"Redis connection failed: {e}")
-            return None
+        self._record_script = None
 
     def record_view(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         if not self.client:
             return {'status': 'error', 'message': 'Redis unavailable'}
+        if djinsight_settings.use_hll_uniques:
+            return self.record_and_check(event_data)
 
         try:
             view_id = event_data['view_id']
@@ -59,16 +345,17 @@ class RedisProvider(BaseProvider):
             expiration = djinsight_settings.REDIS_EXPIRATION
 
             pipe = self.client.pipeline()
-            pipe.setex(f"{self.key_prefix}:{view_id}", expiration, json.dumps(event_data))
-            pipe.incr(f"{self.key_prefix}:counter:{content_type}:{object_id}")
+            queue_event(pipe, self.key_prefix, event_data, expiration)
 
             # Always mark session as viewed to prevent counting same session as unique again
-            session_key_redis = f"{self.key_prefix}:session:{session_key}:page:{content_type}:{object_id}"
-            pipe.setex(session_key_redis, expiration, 1)
+            session_seen_key = seen_key(self.key_prefix, session_key)
+            pipe.sadd(session_seen_key, seen_member(content_type, object_id))
+            pipe.expire(session_seen_key, expiration)
 
-            # Only increment unique counter if this is first view from this session
-            if is_unique:
-                pipe.incr(f"{self.key_prefix}:unique_counter:{content_type}:{object_id}")
+            # Only count a unique view for the first view from this session
+            keys = pending_keys(self.key_prefix, content_type, object_id)
+            for key in keys[: 2 if is_unique else 1]:
+                incr_pending(pipe, key, expiration)
 
             pipe.execute()
 
@@ -78,22 +365,86 @@ class RedisProvider(BaseProvider):
             logger.error(f"Error recording view in Redis: {e}")
             return {'status': 'error', 'message': str(e)}
 
-    def get_stats(self, content_type: str, object_id: int) -> Dict[str, Any]:
+    def _get_record_script(self):
+        if self._record_script is None:
+            self._record_script = self.client.register_script(RECORD_VIEW_SCRIPT)
+        return self._record_script
+
+    def record_and_check(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         if not self.client:
-            return {'total_views': 0, 'unique_views': 0}
+            return {'status': 'error', 'message': 'Redis unavailable'}
 
         try:
-            total_views = self.client.get(f"{self.key_prefix}:counter:{content_type}:{object_id}")
-            unique_views = self.client.get(f"{self.key_prefix}:unique_counter:{content_type}:{object_id}")
-
+            keys, args = record_view_script_params(self.key_prefix, event_data)
+            is_unique = bool(self._get_record_script()(keys=keys, args=args))
             return {
-                'total_views': int(total_views) if total_views else 0,
-                'unique_views': int(unique_views) if unique_views else 0,
+                'status': 'success',
+                'view_id': event_data['view_id'],
+                'is_unique': is_unique,
             }
+
+        except Exception as e:
+            logger.error(f"Error recording view in Redis: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+    def record_many(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self.client:
+            return [{'status': 'error', 'message': 'Redis unavailable'} for _ in events]
+
+        try:
+            script = self._get_record_script()
+            pipe = self.client.pipeline(transaction=False)
+            for event_data in events:
+                keys, args = record_view_script_params(self.key_prefix, event_data)
+                script(keys=keys, args=args, client=pipe)
+            results = pipe.execute()
+            return [
+                {
+                    'status': 'success',
+                    'view_id': event_data['view_id'],
+                    'is_unique': bool(unique),
+                }
+                for event_data, unique in zip(events, results)
+            ]
+
+        except Exception as e:
+            logger.error(f"Error recording views in Redis: {e}")
+            return [{'status': 'error', 'message': str(e)} for _ in events]
+
+    def get_stats(self, content_type: str, object_id: int) -> Dict[str, Any]:
+        """Persisted totals plus the views not flushed yet."""
+        if not self.client:
+            return {'total_views': 0, 'unique_views': 0}
+
+        try:
+            content_type_id = get_content_type_id(content_type)
+            stats = load_stats(content_type_id, object_id)
+            pending = self.get_pending([(content_type, object_id)])[0]
+            return stats_response(merge_pending(stats, pending))
         except Exception as e:
             logger.error(f"Error getting stats from Redis: {e}")
             return {'total_views': 0, 'unique_views': 0}
 
+    def get_pending(self, objects: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        """Read the pending deltas of many objects with one MGET."""
+        if not objects:
+            return []
+
+        keys = [
+            key
+            for content_type, object_id in objects
+            for key in pending_keys(self.key_prefix, content_type, object_id)
+        ]
+        if not djinsight_settings.use_hll_uniques:
+            return parse_pending(self.client.mget(keys))
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.mget(keys)
+        for content_type, object_id in objects:
+            pipe.pfcount(hll_key(self.key_prefix, content_type, object_id))
+        values, *unique_counts = pipe.execute()
+        return parse_pending(values, unique_counts)
+
     def increment_counter(self, key: str, amount: int = 1) -> int:
         if not self.client:
             return 0
@@ -109,8 +460,8 @@ class RedisProvider(BaseProvider):
             return False
 
         try:
-            key = f"{self.key_prefix}:session:{session_key}:page:{content_type}:{object_id}"
-            return not self.client.exists(key)
+            key = seen_key(self.key_prefix, session_key)
+            return not self.client.sismember(key, seen_member(content_type, object_id))
         except Exception as e:
             logger.error(f"Error checking unique view: {e}")
             return False
@@ -120,51 +471,53 @@ class RedisProvider(BaseProvider):
             return
 
         try:
-            key = f"{self.key_prefix}:session:{session_key}:page:{content_type}:{object_id}"
-            self.client.setex(key, ttl, 1)
+            key = seen_key(self.key_prefix, session_key)
+            pipe = self.client.pipeline()
+            pipe.sadd(key, seen_member(content_type, object_id))
+            pipe.expire(key, ttl)
+            pipe.execute()
         except Exception as e:
             logger.error(f"Error marking viewed: {e}")
 
 
 class AsyncRedisProvider(AsyncBaseProvider):
-    """Async Redis provider for use with async Django views."""
+    """
+    Async Redis provider for use with async Django views.
 
-    def __init__(self):
-        self.client = None
+    One instance can serve several event loops: each loop gets its own
+    client backed by that loop's shared connection pool.
+    """
+
+    def __init__(self, client=None):
+        self.client = client
         self.key_prefix = djinsight_settings.redis_key_prefix
-        self._initialized = False
+        self._record_script = None
+        # asyncio.AbstractEventLoop -> aioredis.Redis
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
     async def _get_redis_client(self):
-        """Get or create async Redis client."""
-        if self.client is None:
-            try:
-                if djinsight_settings.REDIS_URL:
-                    self.client = aioredis.from_url(
-                        djinsight_settings.REDIS_URL,
-                        socket_timeout=djinsight_settings.REDIS_TIMEOUT,
-                        socket_connect_timeout=djinsight_settings.REDIS_CONNECT_TIMEOUT,
-                    )
-                else:
-                    self.client = aioredis.Redis(
-                        host=djinsight_settings.REDIS_HOST,
-                        port=djinsight_settings.REDIS_PORT,
-                        db=djinsight_settings.REDIS_DB,
-                        password=djinsight_settings.REDIS_PASSWORD,
-                        socket_timeout=djinsight_settings.REDIS_TIMEOUT,
-                        socket_connect_timeout=djinsight_settings.REDIS_CONNECT_TIMEOUT,
-                    )
-                await self.client.ping()
-                logger.info("Async Redis connection established")
-                self._initialized = True
-            except (ConnectionError, TimeoutError) as e:
-                logger.error(f"Async Redis connection failed: {e}")
-                self.client = None
-        return self.client
+        """Get the async Redis client of the running event loop."""
+        if self.client is not None:
+            return self.client
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = aioredis.Redis(connection_pool=get_async_connection_pool())
+            self._clients[loop] = client
+        return client
+
+    def _get_record_script(self, client):
+        if self._record_script is None:
+            self._record_script = client.register_script(RECORD_VIEW_SCRIPT)
+        return self._record_script
 
     async def record_view(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         client = await self._get_redis_client()
         if not client:
             return {'status': 'error', 'message': 'Redis unavailable'}
+        if djinsight_settings.use_hll_uniques:
+            return await self.record_and_check(event_data)
 
         try:
             view_id = event_data['view_id']
@@ -176,16 +529,17 @@ class AsyncRedisProvider(AsyncBaseProvider):
             expiration = djinsight_settings.REDIS_EXPIRATION
 
             pipe = client.pipeline()
-            pipe.setex(f"{self.key_prefix}:{view_id}", expiration, json.dumps(event_data))
-            pipe.incr(f"{self.key_prefix}:counter:{content_type}:{object_id}")
+            queue_event(pipe, self.key_prefix, event_data, expiration)
 
             # Always mark session as viewed to prevent counting same session as unique again
-            session_key_redis = f"{self.key_prefix}:session:{session_key}:page:{content_type}:{object_id}"
-            pipe.setex(session_key_redis, expiration, 1)
+            session_seen_key = seen_key(self.key_prefix, session_key)
+            pipe.sadd(session_seen_key, seen_member(content_type, object_id))
+            pipe.expire(session_seen_key, expiration)
 
-            # Only increment unique counter if this is first view from this session
-            if is_unique:
-                pipe.incr(f"{self.key_prefix}:unique_counter:{content_type}:{object_id}")
+            # Only count a unique view for the first view from this session
+            keys = pending_keys(self.key_prefix, content_type, object_id)
+            for key in keys[: 2 if is_unique else 1]:
+                incr_pending(pipe, key, expiration)
 
             await pipe.execute()
 
@@ -195,23 +549,86 @@ class AsyncRedisProvider(AsyncBaseProvider):
             logger.error(f"Error recording view in async Redis: {e}")
             return {'status': 'error', 'message': str(e)}
 
-    async def get_stats(self, content_type: str, object_id: int) -> Dict[str, Any]:
+    async def record_and_check(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         client = await self._get_redis_client()
         if not client:
-            return {'total_views': 0, 'unique_views': 0}
+            return {'status': 'error', 'message': 'Redis unavailable'}
 
         try:
-            total_views = await client.get(f"{self.key_prefix}:counter:{content_type}:{object_id}")
-            unique_views = await client.get(f"{self.key_prefix}:unique_counter:{content_type}:{object_id}")
-
+            keys, args = record_view_script_params(self.key_prefix, event_data)
+            script = self._get_record_script(client)
+            is_unique = bool(await script(keys=keys, args=args, client=client))
             return {
-                'total_views': int(total_views) if total_views else 0,
-                'unique_views': int(unique_views) if unique_views else 0,
+                'status': 'success',
+                'view_id': event_data['view_id'],
+                'is_unique': is_unique,
             }
+
+        except Exception as e:
+            logger.error(f"Error recording view in async Redis: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+    async def record_many(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        client = await self._get_redis_client()
+        if not client:
+            return [{'status': 'error', 'message': 'Redis unavailable'} for _ in events]
+
+        try:
+            script = self._get_record_script(client)
+            pipe = client.pipeline(transaction=False)
+            for event_data in events:
+                keys, args = record_view_script_params(self.key_prefix, event_data)
+                await script(keys=keys, args=args, client=pipe)
+            results = await pipe.execute()
+            return [
+                {
+                    'status': 'success',
+                    'view_id': event_data['view_id'],
+                    'is_unique': bool(unique),
+                }
+                for event_data, unique in zip(events, results)
+            ]
+
+        except Exception as e:
+            logger.error(f"Error recording views in async Redis: {e}")
+            return [{'status': 'error', 'message': str(e)} for _ in events]
+
+    async def get_stats(self, content_type: str, object_id: int) -> Dict[str, Any]:
+        """Persisted totals plus the views not flushed yet."""
+        client = await self._get_redis_client()
+        if not client:
+            return {'total_views': 0, 'unique_views': 0}
+
+        try:
+            content_type_id = await aget_content_type_id(content_type)
+            stats = await sync_to_async(load_stats)(content_type_id, object_id)
+            pending = (await self.get_pending([(content_type, object_id)]))[0]
+            return stats_response(merge_pending(stats, pending))
         except Exception as e:
             logger.error(f"Error getting stats from async Redis: {e}")
             return {'total_views': 0, 'unique_views': 0}
 
+    async def get_pending(self, objects: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        """Read the pending deltas of many objects with one MGET."""
+        if not objects:
+            return []
+
+        client = await self._get_redis_client()
+        keys = [
+            key
+            for content_type, object_id in objects
+            for key in pending_keys(self.key_prefix, content_type, object_id)
+        ]
+        if not djinsight_settings.use_hll_uniques:
+            return parse_pending(await client.mget(keys))
+
+        pipe = client.pipeline(transaction=False)
+        pipe.mget(keys)
+        for content_type, object_id in objects:
+            pipe.pfcount(hll_key(self.key_prefix, content_type, object_id))
+        values, *unique_counts = await pipe.execute()
+        return parse_pending(values, unique_counts)
+
     async def increment_counter(self, key: str, amount: int = 1) -> int:
         client = await self._get_redis_client()
         if not client:
@@ -229,8 +646,8 @@ class AsyncRedisProvider(AsyncBaseProvider):
             return False
 
         try:
-            key = f"{self.key_prefix}:session:{session_key}:page:{content_type}:{object_id}"
-            return not await client.exists(key)
+            key = seen_key(self.key_prefix, session_key)
+            return not await client.sismember(key, seen_member(content_type, object_id))
         except Exception as e:
             logger.error(f"Error checking unique view: {e}")
             return False
@@ -241,12 +658,15 @@ class AsyncRedisProvider(AsyncBaseProvider):
             return
 
         try:
-            key = f"{self.key_prefix}:session:{session_key}:page:{content_type}:{object_id}"
-            await client.setex(key, ttl, 1)
+            key = seen_key(self.key_prefix, session_key)
+            pipe = client.pipeline()
+            pipe.sadd(key, seen_member(content_type, object_id))
+            pipe.expire(key, ttl)
+            await pipe.execute()
         except Exception as e:
             logger.error(f"Error marking viewed: {e}")
 
     async def close(self):
-        """Close async Redis connection."""
-        if self.client:
-            await self.client.close()
+        """Close the Redis connections of the running event loop."""
+        client = await self._get_redis_client()
+        await client.connection_pool.disconnect()
@@ -1,3 +1,5 @@
+import os
+import threading
 from typing import Dict, Type, Union
 
 from djinsight.conf import djinsight_settings
@@ -13,6 +15,8 @@ class ProviderRegistry:
     _providers: Dict[str, Type[BaseProvider]] = {}
     _async_providers: Dict[str, Type[AsyncBaseProvider]] = {}
     _default_provider: str = None
+    _instances: Dict[type, Union[BaseProvider, AsyncBaseProvider]] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def register(
@@ -31,42 +35,53 @@ class ProviderRegistry:
         cls, name: str = None, use_async: bool = False
     ) -> Union[BaseProvider, AsyncBaseProvider]:
         """
-        Get a provider instance.
+        Get the provider instance shared by this process.
 
         Args:
             name: Provider name (optional, uses default if not specified)
             use_async: If True, returns async provider variant
         """
+        provider_class = cls.get_provider_class(name=name, use_async=use_async)
+        instance = cls._instances.get(provider_class)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(provider_class)
+                if instance is None:
+                    instance = provider_class()
+                    cls._instances[provider_class] = instance
+        return instance
+
+    @classmethod
+    def get_provider_class(
+        cls, name: str = None, use_async: bool = False
+    ) -> Union[Type[BaseProvider], Type[AsyncBaseProvider]]:
+        """Resolve the provider class get_provider() would use."""
+        name = name or cls._default_provider
         if name:
             if use_async and name in cls._async_providers:
-                return cls._async_providers[name]()
+                return cls._async_providers[name]
             provider_class = cls._providers.get(name)
-        elif cls._default_provider:
-            if use_async and cls._default_provider in cls._async_providers:
-                return cls._async_providers[cls._default_provider]()
-            provider_class = cls._providers.get(cls._default_provider)
-        else:
-            if djinsight_settings.USE_REDIS:
-                if use_async:
-                    from djinsight.providers.redis import AsyncRedisProvider
+        elif djinsight_settings.USE_REDIS:
+            if use_async:
+                from djinsight.providers.redis import AsyncRedisProvider
 
-                    return AsyncRedisProvider()
-                from djinsight.providers.redis import RedisProvider
+                return AsyncRedisProvider
+            from djinsight.providers.redis import RedisProvider
 
-                provider_class = RedisProvider
-            else:
-                if use_async:
-                    from djinsight.providers.database import AsyncDatabaseProvider
+            provider_class = RedisProvider
+        else:
+            if use_async:
+                from djinsight.providers.database import AsyncDatabaseProvider
 
-                    return AsyncDatabaseProvider()
-                from djinsight.providers.database import DatabaseProvider
+                return AsyncDatabaseProvider
+            from djinsight.providers.database import DatabaseProvider
 
-                provider_class = DatabaseProvider
+            provider_class = DatabaseProvider
 
         if not provider_class:
             provider_class = djinsight_settings.get_provider_class()
 
-        return provider_class()
+        return provider_class
 
     @classmethod
     def get_async_provider(cls, name: str = None) -> AsyncBaseProvider:
@@ -80,3 +95,13 @@ class ProviderRegistry:
     @classmethod
     def list_providers(cls) -> list:
         return list(cls._providers.keys())
+
+    @classmethod
+    def reset(cls):
+        """Drop the cached provider instances; the next call creates new ones."""
+        cls._instances = {}
+        cls._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ProviderRegistry.reset)
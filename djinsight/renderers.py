@@ -4,9 +4,12 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict
 
 from django.template.loader import render_to_string
+from django.utils.dateparse import parse_date, parse_datetime
 
 from djinsight.conf import djinsight_settings
 from djinsight.models import PageViewStatistics, StatsQueryMixin
+from djinsight.series import get_view_series
+from djinsight.utils import get_prefetched_stats
 
 
 class BaseRenderer(ABC):
@@ -17,7 +20,8 @@ class BaseRenderer(ABC):
         self.output = output
         self.context = context
         self.kwargs = kwargs
-        self.stats = PageViewStatistics.get_for_object(obj)
+        found, stats = get_prefetched_stats(obj, context)
+        self.stats = stats if found else PageViewStatistics.get_for_object(obj)
 
     @abstractmethod
     def render(self) -> str:
@@ -74,7 +78,16 @@ class BaseRenderer(ABC):
             return {}
 
         unique = self.metric == "unique_views"
-        views = self.stats.get_views_for_period(start_date, end_date, unique=unique)
+        if self.output in ["chart", "widget"]:
+            views = get_view_series(
+                self.obj,
+                self._parse_date(start_date),
+                self._parse_date(end_date),
+                granularity="day",
+                metric="unique_views" if unique else "total_views",
+            )
+        else:
+            views = self.stats.get_views_for_period(start_date, end_date, unique=unique)
         return {
             "views": views,
             "period": "custom",
@@ -82,6 +95,12 @@ class BaseRenderer(ABC):
             "end_date": end_date,
         }
 
+    @staticmethod
+    def _parse_date(value):
+        if isinstance(value, str):
+            return parse_datetime(value) or parse_date(value)
+        return value
+
 
 class DefaultWidgetRenderer(BaseRenderer):
     def render(self) -> str:
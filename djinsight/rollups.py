@@ -0,0 +1,193 @@
+"""Incremental rollup tables maintained alongside PageViewEvent inserts."""
+
+from collections import Counter
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, Iterable, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from djinsight.db import bulk_upsert
+from djinsight.models import (
+    PageViewDimensionSummary,
+    PageViewEvent,
+    PageViewHourlySummary,
+)
+from djinsight.series import as_date, date_range, start_of_day
+
+DIMENSION_FIELDS = ("device_category", "source_category", "referrer_domain")
+
+
+def hour_bucket(timestamp):
+    """Truncate a timestamp to the start of its (UTC) hour."""
+    if timezone.is_aware(timestamp):
+        timestamp = timestamp.astimezone(dt_timezone.utc)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def update_rollups(events: Iterable[PageViewEvent]) -> None:
+    """
+    Add a batch of newly stored events to the rollup tables.
+
+    Call this once per batch, in the same transaction that inserts the events.
+    """
+    hourly: Dict[Tuple[int, int, object], Dict[str, int]] = {}
+    dimensional: Dict[Tuple, Dict[str, int]] = {}
+    for event in events:
+        key = (event.content_type_id, event.object_id, hour_bucket(event.timestamp))
+        dimension_key = (
+            event.content_type_id,
+            event.object_id,
+            timezone.localdate(event.timestamp),
+            *(getattr(event, field) for field in DIMENSION_FIELDS),
+        )
+        empty = {"total_views": 0, "unique_views": 0}
+        for counts in (
+            hourly.setdefault(key, dict(empty)),
+            dimensional.setdefault(dimension_key, dict(empty)),
+        ):
+            counts["total_views"] += 1
+            if event.is_unique:
+                counts["unique_views"] += 1
+
+    bulk_upsert(
+        PageViewHourlySummary,
+        [
+            {
+                "content_type_id": content_type_id,
+                "object_id": object_id,
+                "hour": hour,
+                **counts,
+            }
+            for (content_type_id, object_id, hour), counts in hourly.items()
+        ],
+        unique_fields=["content_type_id", "object_id", "hour"],
+        increment_fields=["total_views", "unique_views"],
+    )
+    bulk_upsert(
+        PageViewDimensionSummary,
+        [
+            {
+                "content_type_id": key[0],
+                "object_id": key[1],
+                "date": key[2],
+                **dict(zip(DIMENSION_FIELDS, key[3:])),
+                **counts,
+            }
+            for key, counts in dimensional.items()
+        ],
+        unique_fields=["content_type_id", "object_id", "date", *DIMENSION_FIELDS],
+        increment_fields=["total_views", "unique_views"],
+    )
+
+
+def rebuild_dimension_summaries(since=None) -> int:
+    """
+    Recompute PageViewDimensionSummary from the stored events, one day at a time.
+
+    Used to backfill events stored before the rollup existed; run
+    classify_page_views first so every event has its categories.
+
+    Each day is replaced in one transaction that takes the rollup's write
+    lock before reading the events (a table lock on PostgreSQL, the database
+    write lock on SQLite), so the flusher's increments for that day wait and
+    are applied on top of the recomputed rows instead of being lost.
+
+    Args:
+        since (datetime): Rebuild from this time on (default: the oldest event)
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    if since is None:
+        since = PageViewEvent.objects.aggregate(oldest=Min("timestamp"))["oldest"]
+        if since is None:
+            return 0
+
+    written = 0
+    for day in date_range(as_date(since), timezone.localdate()):
+        with transaction.atomic():
+            _lock_dimension_summaries()
+            PageViewDimensionSummary.objects.filter(date=day).delete()
+            rows = (
+                PageViewEvent.objects.filter(
+                    timestamp__gte=start_of_day(day),
+                    timestamp__lt=start_of_day(day + timedelta(days=1)),
+                )
+                .annotate(day=TruncDate("timestamp"))
+                .values("content_type_id", "object_id", "day", *DIMENSION_FIELDS)
+                .annotate(
+                    total=Count("id"), unique=Count("id", filter=Q(is_unique=True))
+                )
+                .order_by()
+            )
+            summaries = [
+                PageViewDimensionSummary(
+                    content_type_id=row["content_type_id"],
+                    object_id=row["object_id"],
+                    date=row["day"],
+                    total_views=row["total"],
+                    unique_views=row["unique"],
+                    **{field: row[field] for field in DIMENSION_FIELDS},
+                )
+                for row in rows.iterator()
+            ]
+            PageViewDimensionSummary.objects.bulk_create(summaries, batch_size=500)
+        written += len(summaries)
+    return written
+
+
+def _lock_dimension_summaries() -> None:
+    """Block rollup writers until the current transaction ends (PostgreSQL)."""
+    if connection.vendor != "postgresql":
+        return
+    table = connection.ops.quote_name(PageViewDimensionSummary._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+
+
+def get_dimension_rows(content_type=None, start=None, end=None, object_id=None):
+    """
+    PageViewDimensionSummary rows for the local days overlapping [start, end].
+
+    Rows are per day, so a range starting or ending mid-day includes that
+    whole day.
+    """
+    rows = PageViewDimensionSummary.objects.all()
+    if content_type is not None:
+        rows = rows.filter(content_type=content_type)
+    if object_id is not None:
+        rows = rows.filter(object_id=object_id)
+    if start is not None:
+        rows = rows.filter(date__gte=as_date(start))
+    if end is not None:
+        rows = rows.filter(date__lte=as_date(end))
+    return rows
+
+
+def get_hourly_rows(content_type=None, start=None, end=None, object_id=None):
+    """
+    PageViewHourlySummary rows for the hours overlapping [start, end].
+
+    Both ends are truncated to the start of their UTC hour, so a range
+    starting or ending mid-hour includes that whole hour.
+    """
+    rows = PageViewHourlySummary.objects.all()
+    if content_type is not None:
+        rows = rows.filter(content_type=content_type)
+    if object_id is not None:
+        rows = rows.filter(object_id=object_id)
+    if start is not None:
+        rows = rows.filter(hour__gte=hour_bucket(start))
+    if end is not None:
+        rows = rows.filter(hour__lte=hour_bucket(end))
+    return rows
+
+
+def sum_views_by(rows, column: str) -> Counter:
+    """Total views per value of ``column`` (a dimension or an annotation)."""
+    grouped = rows.order_by().values_list(column).annotate(views=Sum("total_views"))
+    return Counter({value: views for value, views in grouped})
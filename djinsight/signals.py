@@ -0,0 +1,103 @@
+"""Signal handlers for djinsight."""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from djinsight import content_types
+from djinsight.cache import invalidate_object
+from djinsight.models import (
+    ContentTypeRegistry,
+    ContentTypeTotals,
+    PageViewEvent,
+    PageViewStatistics,
+    PageViewSummary,
+)
+from djinsight.rollups import update_rollups
+
+
+@receiver(post_save, sender=PageViewEvent)
+def update_rollups_for_saved_event(sender, instance, created, raw=False, **kwargs):
+    """Keep the rollups and the stats cache in step with events saved one by one.
+
+    Bulk inserts (the flusher) don't send signals and update the rollups
+    themselves.
+    """
+    if created and not raw:
+        update_rollups([instance])
+        invalidate_object(instance.content_type_id, instance.object_id)
+
+
+@receiver(pre_save, sender=PageViewStatistics)
+def remember_stored_statistics(sender, instance, raw=False, **kwargs):
+    """Load the stored counts of a statistics row about to be overwritten."""
+    instance._stored_totals = None
+    if not raw and instance.pk is not None:
+        instance._stored_totals = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list("content_type_id", "total_views", "unique_views")
+            .first()
+        )
+
+
+@receiver(post_save, sender=PageViewStatistics)
+def update_totals_for_saved_statistics(sender, instance, raw=False, **kwargs):
+    """Move a statistics row saved directly from its stored counts to its new ones."""
+    if raw:
+        return
+    deltas = {}
+    stored = getattr(instance, "_stored_totals", None)
+    if stored is not None:
+        content_type_id, total_views, unique_views = stored
+        deltas[content_type_id] = {
+            "total_views": -total_views,
+            "unique_views": -unique_views,
+            "object_count": -1,
+        }
+    delta = deltas.setdefault(
+        instance.content_type_id,
+        {"total_views": 0, "unique_views": 0, "object_count": 0},
+    )
+    delta["total_views"] += instance.total_views
+    delta["unique_views"] += instance.unique_views
+    delta["object_count"] += 1
+    ContentTypeTotals.apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=PageViewStatistics)
+def update_totals_for_deleted_statistics(sender, instance, **kwargs):
+    """Subtract a deleted statistics row from the totals."""
+    ContentTypeTotals.apply_deltas(
+        {
+            instance.content_type_id: {
+                "total_views": -instance.total_views,
+                "unique_views": -instance.unique_views,
+                "object_count": -1,
+            }
+        }
+    )
+
+
+@receiver(post_save, sender=PageViewStatistics)
+@receiver(post_delete, sender=PageViewStatistics)
+@receiver(post_save, sender=PageViewSummary)
+@receiver(post_delete, sender=PageViewSummary)
+def invalidate_stats_cache(sender, instance, raw=False, **kwargs):
+    """Drop cached stats and series of an object whose rows are edited directly."""
+    if not raw:
+        invalidate_object(instance.content_type_id, instance.object_id)
+
+
+@receiver(post_save, sender=ContentType)
+@receiver(post_delete, sender=ContentType)
+@receiver(post_save, sender=ContentTypeRegistry)
+@receiver(post_delete, sender=ContentTypeRegistry)
+def clear_content_type_cache(sender, **kwargs):
+    """Drop cached content type lookups when content types or the registry change."""
+    content_types.clear()
+    if sender is ContentTypeRegistry:
+        # Reload locally right away; other processes only see the change once
+        # it is committed, so bump the shared version again at that point.
+        content_types.invalidate_registry()
+        transaction.on_commit(content_types.invalidate_registry)
@@ -0,0 +1,126 @@
+"""Persistence of the HyperLogLog sketches used by UNIQUE_VIEWS_MODE = "hll"."""
+
+import logging
+from typing import Dict, Iterable, Tuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from djinsight.conf import djinsight_settings
+from djinsight.db import bulk_upsert
+from djinsight.models import PageViewSketch
+from djinsight.providers.redis import hll_key
+
+logger = logging.getLogger(__name__)
+
+# (content_type_id, object_id, period) ->
+# (content type label, object id as sent by the client)
+SketchTargets = Dict[Tuple[int, int, str], Tuple[str, object]]
+
+
+def persist_sketches(client, targets: SketchTargets) -> Dict[Tuple[int, int, str], int]:
+    """
+    Merge the Redis sketches of ``targets`` with the stored ones and save them.
+
+    The stored sketch is merged back into Redis first, so sketches survive
+    Redis restarts and evictions: HyperLogLog merges are idempotent, and the
+    Redis sketch always ends up as the union of everything seen so far.
+    Sketches are copied with DUMP/RESTORE because that round-trips whatever
+    encoding the server uses for them.
+
+    Returns:
+        Mapping of each target to its estimated number of unique visitors.
+    """
+    if not targets:
+        return {}
+
+    key_prefix = djinsight_settings.redis_key_prefix
+    expiration = djinsight_settings.REDIS_EXPIRATION
+
+    query = Q()
+    for content_type_id, object_id, period in targets:
+        query |= Q(content_type_id=content_type_id, object_id=object_id, period=period)
+    stored = {
+        (row[0], row[1], row[2]): bytes(row[3])
+        for row in PageViewSketch.objects.filter(query).values_list(
+            "content_type_id", "object_id", "period", "registers"
+        )
+    }
+
+    # Merge, count and dump every sketch in one round trip
+    pipe = client.pipeline(transaction=False)
+    order = []
+    for target, (label, object_id) in targets.items():
+        period = None if target[2] == PageViewSketch.ALL_TIME else target[2]
+        key = hll_key(key_prefix, label, object_id, period)
+        registers = stored.get(target)
+        if registers:
+            merge_key = f"{key}:merge"
+            pipe.restore(merge_key, 60 * 1000, registers, replace=True)
+            pipe.pfmerge(key, key, merge_key)
+            pipe.delete(merge_key)
+        if period is not None:
+            pipe.expire(key, expiration)
+        pipe.pfcount(key)
+        pipe.dump(key)
+        order.append((target, bool(registers)))
+    results = pipe.execute(raise_on_error=False)
+
+    counts = {}
+    rows = []
+    updated_at = timezone.now()
+    index = 0
+    for target, merged in order:
+        if merged and isinstance(results[index], Exception):
+            logger.warning(
+                f"Could not restore stored sketch {target}: {results[index]}"
+            )
+        index += 3 if merged else 0
+        if target[2] != PageViewSketch.ALL_TIME:
+            index += 1
+        count, registers = results[index], results[index + 1]
+        index += 2
+        if (
+            isinstance(count, Exception)
+            or isinstance(registers, Exception)
+            or registers is None
+        ):
+            logger.error(f"Could not read sketch {target} from Redis")
+            continue
+
+        counts[target] = count
+        content_type_id, object_id, period = target
+        rows.append(
+            {
+                "content_type_id": content_type_id,
+                "object_id": object_id,
+                "period": period,
+                "registers": registers,
+                "unique_views": count,
+                "updated_at": updated_at,
+            }
+        )
+
+    bulk_upsert(
+        PageViewSketch,
+        rows,
+        unique_fields=["content_type_id", "object_id", "period"],
+        replace_fields=["registers", "unique_views", "updated_at"],
+    )
+    return counts
+
+
+def sketch_targets(
+    views: Iterable[Tuple[int, int, str, object, object]]
+) -> SketchTargets:
+    """
+    Build persist_sketches targets from (content_type_id, object_id, label,
+    raw object id, timestamp) tuples: the all-time sketch and the daily
+    sketch of each view's day.
+    """
+    targets: SketchTargets = {}
+    for content_type_id, object_id, label, raw_object_id, timestamp in views:
+        day = timezone.localdate(timestamp).isoformat()
+        for period in (PageViewSketch.ALL_TIME, day):
+            targets[(content_type_id, object_id, period)] = (label, raw_object_id)
+    return targets
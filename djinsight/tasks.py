@@ -1,33 +1,55 @@
 import json
 import logging
+import os
+import socket
 from datetime import datetime, timedelta
 
+import django
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
-from django.db.models import F
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 
+from djinsight import partitions
+from djinsight.cache import invalidate as invalidate_cache
+from djinsight.codec import decode_event
 from djinsight.conf import djinsight_settings
-from djinsight.models import PageViewEvent, PageViewStatistics, PageViewSummary
+from djinsight.content_types import get_content_type_id
+from djinsight.dashboard import refresh_snapshots
+from djinsight.dimensions import apply_dimensions
+from djinsight.housekeeping import run_housekeeping
+from djinsight.models import (
+    ContentTypeTotals,
+    PageViewDimensionSummary,
+    PageViewEvent,
+    PageViewHourlySummary,
+    PageViewSketch,
+    PageViewStatistics,
+    PageViewSummary,
+    ProcessingCursor,
+)
+from djinsight.rollups import rebuild_dimension_summaries, update_rollups
+from djinsight.series import start_of_day
 
 logger = logging.getLogger(__name__)
 
-_redis_client = None
+_redis_client = None  # overrides the shared client when set
 
 
 def _get_redis_client():
-    """Lazy initialization of Redis client. Returns None if Redis unavailable."""
-    global _redis_client
-    if _redis_client is None:
-        try:
-            from djinsight.providers.redis import RedisProvider
-            provider = RedisProvider()
-            _redis_client = provider.client
-        except Exception:
-            logger.warning("Redis client not available, tasks requiring Redis will be skipped")
-            return None
-    return _redis_client
+    """Return the process-wide Redis client. Returns None if Redis unavailable."""
+    if _redis_client is not None:
+        return _redis_client
+    try:
+        from djinsight.providers.redis import get_redis_client
+        return get_redis_client(check=True)
+    except Exception:
+        logger.warning(
+            "Redis client not available, tasks requiring Redis will be skipped"
+        )
+        return None
 
 # Try to import Celery - if not available, tasks will be regular functions
 try:
@@ -88,20 +110,21 @@ def process_page_views_task(
     task_soft_time_limit=djinsight_settings.SUMMARY_TASK_SOFT_TIME_LIMIT,
 )
 def generate_daily_summaries_task(
-    self, days_back=None
+    self, days_back=None, full=False
 ):
     """
     Celery task to generate daily page view summaries.
 
     Args:
         days_back (int): Number of days back to process
+        full (bool): Recompute every day in the window, ignoring the watermark
 
     Returns:
-        int: Number of summaries generated
+        int: Number of summaries written
     """
     try:
         days_back = days_back or djinsight_settings.SUMMARY_DAYS_BACK
-        return generate_daily_summaries(days_back)
+        return generate_daily_summaries(days_back, full=full)
     except Exception as exc:
         logger.error(f"Error generating daily summaries: {exc}")
         if HAS_CELERY:
@@ -140,6 +163,83 @@ def cleanup_old_data_task(
             raise
 
 
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+)
+def create_event_partitions_task(self, ahead=None):
+    """
+    Celery task to create PageViewEvent partitions ahead of time.
+
+    Args:
+        ahead (int): Number of future periods to create
+
+    Returns:
+        int: Number of partitions created
+    """
+    try:
+        return len(partitions.create_partitions(ahead))
+    except Exception as exc:
+        logger.error(f"Error creating event partitions: {exc}")
+        if HAS_CELERY:
+            raise self.retry(exc=exc)
+        else:
+            raise
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    task_time_limit=djinsight_settings.CLEANUP_TASK_TIME_LIMIT,
+    task_soft_time_limit=djinsight_settings.CLEANUP_TASK_SOFT_TIME_LIMIT,
+)
+def redis_housekeeping_task(self, time_budget=None):
+    """
+    Celery task to sweep orphaned and stale keys from Redis.
+
+    Args:
+        time_budget (float): Seconds to spend before checkpointing the scan
+
+    Returns:
+        dict: Numbers of keys scanned, orphaned and compacted
+    """
+    try:
+        return redis_housekeeping(time_budget)
+    except Exception as exc:
+        logger.error(f"Error during Redis housekeeping: {exc}")
+        if HAS_CELERY:
+            raise self.retry(exc=exc)
+        else:
+            raise
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    task_time_limit=djinsight_settings.SUMMARY_TASK_TIME_LIMIT,
+    task_soft_time_limit=djinsight_settings.SUMMARY_TASK_SOFT_TIME_LIMIT,
+)
+def refresh_dashboard_snapshots_task(self):
+    """
+    Celery task to precompute the analytics dashboard for every preset period
+    and content type.
+
+    Returns:
+        int: Number of snapshots written
+    """
+    try:
+        return refresh_snapshots()
+    except Exception as exc:
+        logger.error(f"Error refreshing dashboard snapshots: {exc}")
+        if HAS_CELERY:
+            raise self.retry(exc=exc)
+        else:
+            raise
+
+
 def process_page_views(
     batch_size=None,
     max_records=None,
@@ -161,22 +261,33 @@ def process_page_views(
         logger.error("Redis client not available")
         return 0
 
+    if djinsight_settings.use_redis_stream:
+        return process_stream(batch_size, max_records)
+
     logger.info("Starting to process page views from Redis")
 
     try:
-        # Get all keys matching the page view pattern, excluding counters and sessions
-        prefix = djinsight_settings.REDIS_KEY_PREFIX
-        pattern = f"{prefix}*"
+        # Get all keys matching the page view pattern, excluding counters and seen-sets
+        prefix = djinsight_settings.redis_key_prefix
+        pattern = f"{prefix}:*"
         exclude_patterns = [
-            f"{prefix}counter:",
-            f"{prefix}unique_counter:",
-            f"{prefix}session:",
+            f"{prefix}:counter:",
+            f"{prefix}:unique_counter:",
+            f"{prefix}:seen:",
+            f"{prefix}:session:",  # per-page markers written by older versions
+            f"{prefix}:hll:",
+            f"{prefix}:pending:",
+            f"{prefix}:pending_unique:",
+            f"{prefix}:housekeeping:",
         ]
+        stream_key = djinsight_settings.redis_stream_key
 
         # Use SCAN instead of KEYS to avoid blocking Redis
         keys = []
         for key in redis_client.scan_iter(match=pattern, count=1000):
             decoded = key.decode("utf-8")
+            if decoded == stream_key:
+                continue
             if not any(decoded.startswith(exclude) for exclude in exclude_patterns):
                 keys.append(decoded)
                 if len(keys) >= max_records:
@@ -207,6 +318,138 @@ def process_page_views(
         raise
 
 
+def _get_consumer_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _ensure_consumer_group(redis_client, stream_key, group):
+    from redis.exceptions import ResponseError
+
+    try:
+        redis_client.xgroup_create(stream_key, group, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def process_stream(batch_size=None, max_records=None):
+    """
+    Drain the ingest stream through a consumer group.
+
+    Each run first reclaims entries left pending by consumers that died
+    mid-batch, then reads new entries with XREADGROUP. Entries are
+    acknowledged and deleted only after their batch is committed, so several
+    workers can drain the stream in parallel without duplicates.
+
+    Args:
+        batch_size (int): Number of entries to process in a single transaction
+        max_records (int): Maximum number of entries to process in a single run
+
+    Returns:
+        int: Number of records processed
+    """
+    batch_size = batch_size or djinsight_settings.PROCESS_BATCH_SIZE
+    max_records = max_records or djinsight_settings.PROCESS_MAX_RECORDS
+    redis_client = _get_redis_client()
+    if not redis_client:
+        logger.error("Redis client not available")
+        return 0
+
+    stream_key = djinsight_settings.redis_stream_key
+    group = djinsight_settings.REDIS_STREAM_GROUP
+    consumer = _get_consumer_name()
+
+    logger.info("Starting to process page views from Redis stream")
+
+    try:
+        _ensure_consumer_group(redis_client, stream_key, group)
+
+        processed_count = 0
+        read_count = 0
+
+        min_idle_time = djinsight_settings.REDIS_STREAM_CLAIM_IDLE * 1000
+        start_id = "0-0"
+        while read_count < max_records:
+            count = min(batch_size, max_records - read_count)
+            response = redis_client.xautoclaim(
+                stream_key,
+                group,
+                consumer,
+                min_idle_time=min_idle_time,
+                start_id=start_id,
+                count=count,
+            )
+            start_id, entries = response[0], response[1]
+            if entries:
+                read_count += len(entries)
+                processed_count += process_stream_batch(entries)
+            if not entries or start_id in (b"0-0", "0-0"):
+                break
+
+        while read_count < max_records:
+            count = min(batch_size, max_records - read_count)
+            response = redis_client.xreadgroup(
+                group, consumer, {stream_key: ">"}, count=count
+            )
+            if not response:
+                break
+            entries = response[0][1]
+            if not entries:
+                break
+            read_count += len(entries)
+            processed_count += process_stream_batch(entries)
+            if len(entries) < count:
+                break
+
+        if read_count:
+            logger.info(f"Completed processing {processed_count} page views")
+        else:
+            logger.info("No page views to process")
+        return processed_count
+
+    except Exception as e:
+        logger.error(f"Error processing page views from stream: {e}")
+        raise
+
+
+def process_stream_batch(entries):
+    """
+    Process a batch of stream entries and acknowledge them.
+
+    Args:
+        entries (list): List of (entry_id, fields) tuples read from the stream
+
+    Returns:
+        int: Number of records processed in this batch
+    """
+    redis_client = _get_redis_client()
+    if not redis_client:
+        return 0
+
+    items = [
+        (entry_id, fields.get(b"d") if fields else None)
+        for entry_id, fields in entries
+    ]
+    processed_count, flushed = _store_page_views(items)
+
+    entry_ids = [entry_id for entry_id, _ in entries]
+    if entry_ids:
+        try:
+            stream_key = djinsight_settings.redis_stream_key
+            pipe = redis_client.pipeline()
+            pipe.xack(stream_key, djinsight_settings.REDIS_STREAM_GROUP, *entry_ids)
+            pipe.xdel(stream_key, *entry_ids)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error acknowledging processed stream entries: {e}")
+
+    # Released after the entries are deleted, so an empty stream means that
+    # nothing is left buffered
+    _release_pending(flushed)
+
+    return processed_count
+
+
 def process_batch(keys):
     """
     Process a batch of page views.
@@ -226,20 +469,58 @@ def process_batch(keys):
         pipe.get(key)
     values = pipe.execute()
 
+    processed_count = store_page_views(zip(keys, values))
+
+    # Delete processed keys from Redis
+    if keys:
+        try:
+            redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Error deleting processed keys from Redis: {e}")
+
+    return processed_count
+
+
+def store_page_views(items):
+    """
+    Decode buffered page views and write them to the database.
+
+    Args:
+        items (iterable): (reference, raw_value) pairs, where the reference is
+            the Redis key or stream entry id used in log messages
+
+    Returns:
+        int: Number of records stored
+    """
+    processed_count, flushed = _store_page_views(items)
+    _release_pending(flushed)
+    return processed_count
+
+
+def _store_page_views(items):
+    """
+    store_page_views without releasing the pending counters.
+
+    Returns:
+        tuple: Number of records stored and the (label, object id) ->
+        [total, unique] views to release
+    """
     page_view_events = []
     page_view_counters = {}
+    sketched_views = []
+    flushed = {}
     processed_count = 0
 
-    for key, value in zip(keys, values):
+    for key, value in items:
         if value is None:
             continue
-
         try:
-            data = json.loads(value.decode("utf-8"))
+            data = decode_event(value)
 
             # Extract data with validation
             page_id = data.get("object_id")
             content_type = data.get("content_type")
+            content_type_id = data.get("content_type_id")
             url = data.get("url")
             session_key = data.get("session_key")
             ip_address = data.get("ip_address")
@@ -249,7 +530,7 @@ def process_batch(keys):
             is_unique = data.get("is_unique", False)
 
             # Skip if missing essential data
-            if not all([page_id, content_type, url]):
+            if not all([page_id, content_type or content_type_id, url]):
                 logger.warning(f"Skipping incomplete page view data in key {key}")
                 continue
 
@@ -266,12 +547,17 @@ def process_batch(keys):
             else:
                 timestamp = timezone.now()
 
-            app_label, model = content_type.split(".")
-            ct = ContentType.objects.get_by_natural_key(app_label, model)
+            if content_type_id is None:
+                content_type_id = get_content_type_id(content_type)
+                if content_type_id is None:
+                    logger.warning(
+                        f"Skipping page view for unknown content type {content_type}"
+                    )
+                    continue
 
             page_view_events.append(
                 PageViewEvent(
-                    content_type=ct,
+                    content_type_id=content_type_id,
                     object_id=page_id,
                     url=url,
                     session_key=session_key[:255] if session_key else "",
@@ -283,14 +569,29 @@ def process_batch(keys):
                 )
             )
 
-            counter_key = (ct.id, page_id)
-            if counter_key not in page_view_counters:
-                page_view_counters[counter_key] = (1, 1 if is_unique else 0)
+            counter_key = (content_type_id, page_id)
+            counter = page_view_counters.get(counter_key)
+            if counter is None:
+                page_view_counters[counter_key] = {
+                    "total_views": 1,
+                    "unique_views": 1 if is_unique else 0,
+                    "first_viewed_at": timestamp,
+                    "last_viewed_at": timestamp,
+                }
             else:
-                total, unique = page_view_counters[counter_key]
-                page_view_counters[counter_key] = (
-                    total + 1,
-                    unique + (1 if is_unique else 0),
+                counter["total_views"] += 1
+                counter["unique_views"] += 1 if is_unique else 0
+                counter["first_viewed_at"] = min(counter["first_viewed_at"], timestamp)
+                counter["last_viewed_at"] = max(counter["last_viewed_at"], timestamp)
+
+            label = content_type or _content_type_label(content_type_id)
+            flushed_counts = flushed.setdefault((label, page_id), [0, 0])
+            flushed_counts[0] += 1
+            flushed_counts[1] += 1 if is_unique else 0
+
+            if djinsight_settings.use_hll_uniques:
+                sketched_views.append(
+                    (content_type_id, page_id, label, page_id, timestamp)
                 )
 
             processed_count += 1
@@ -302,115 +603,261 @@ def process_batch(keys):
             logger.error(f"Unexpected error processing page view {key}: {e}")
             continue
 
+    replace_unique = False
+    if sketched_views:
+        replace_unique = _apply_sketch_counts(sketched_views, page_view_counters)
+
     if page_view_events or page_view_counters:
         with transaction.atomic():
             if page_view_events:
+                for event in page_view_events:
+                    event.classify()
+                if djinsight_settings.SLIM_EVENTS:
+                    apply_dimensions(page_view_events)
                 PageViewEvent.objects.bulk_create(page_view_events, batch_size=500)
+                update_rollups(page_view_events)
 
-            for (content_type_id, object_id), (total, unique) in page_view_counters.items():
-                try:
-                    stats, created = PageViewStatistics.objects.get_or_create(
-                        content_type_id=content_type_id,
-                        object_id=object_id,
-                    )
-                    now = timezone.now()
-                    updates = {
-                        "total_views": F("total_views") + total,
-                        "unique_views": F("unique_views") + unique,
-                        "last_viewed_at": now,
-                    }
-                    if not stats.first_viewed_at:
-                        updates["first_viewed_at"] = now
-                    PageViewStatistics.objects.filter(pk=stats.pk).update(**updates)
-
-                except Exception as e:
-                    logger.error(
-                        f"Error updating page statistics for content_type {content_type_id} object {object_id}: {e}"
-                    )
+            if page_view_counters:
+                PageViewStatistics.bulk_increment(
+                    page_view_counters, replace_unique=replace_unique
+                )
 
-    # Delete processed keys from Redis
-    if keys:
-        try:
-            redis_client.delete(*keys)
-        except Exception as e:
-            logger.error(f"Error deleting processed keys from Redis: {e}")
+        invalidate_cache(page_view_counters)
 
-    return processed_count
+    return processed_count, flushed
 
 
-def generate_daily_summaries(days_back=None):
+def _release_pending(flushed):
+    """
+    Subtract stored views from the provider's pending counters.
+
+    In stream mode the counters of the flushed objects are deleted once the
+    stream is empty, dropping what trimmed entries left on them.
+    """
+    from djinsight.providers.redis import FLUSHED_SCRIPT, pending_keys
+
+    redis_client = _get_redis_client()
+    if not redis_client or not flushed:
+        return
+
+    prefix = djinsight_settings.redis_key_prefix
+    stream_key = djinsight_settings.redis_stream_key
+    keys = [stream_key if djinsight_settings.use_redis_stream else ""]
+    amounts = []
+    for (label, object_id), (total, unique) in flushed.items():
+        total_key, unique_key = pending_keys(prefix, label, object_id)
+        keys.append(total_key)
+        amounts.append(total)
+        if unique and not djinsight_settings.use_hll_uniques:
+            keys.append(unique_key)
+            amounts.append(unique)
+    try:
+        redis_client.register_script(FLUSHED_SCRIPT)(keys=keys, args=amounts)
+    except Exception as e:
+        logger.error(f"Error releasing pending view counters: {e}")
+
+
+def _content_type_label(content_type_id):
+    content_type = ContentType.objects.get_for_id(content_type_id)
+    return f"{content_type.app_label}.{content_type.model}"
+
+
+def _apply_sketch_counts(views, counters):
+    """
+    Persist the HyperLogLogs of a batch and put their all-time estimates into
+    ``counters`` as absolute unique_views values.
+
+    Returns:
+        bool: True if the counters now hold absolute unique counts
+    """
+    from djinsight.sketches import persist_sketches, sketch_targets
+
+    redis_client = _get_redis_client()
+    if not redis_client:
+        return False
+
+    counts = persist_sketches(redis_client, sketch_targets(views))
+    # Resolve every estimate before touching the counters, so a missing one
+    # leaves the original deltas in place for the incremental path
+    unique_counts = {}
+    for content_type_id, object_id in counters:
+        count = counts.get((content_type_id, object_id, PageViewSketch.ALL_TIME))
+        if count is None:
+            return False
+        unique_counts[(content_type_id, object_id)] = count
+
+    for key, count in unique_counts.items():
+        counters[key]["unique_views"] = count
+    return True
+
+
+SUMMARY_CURSOR = "daily_summaries"
+
+# Days before today that every run recomputes, whatever the cursor says, so
+# events committed after an event with a higher id are still summarized
+SUMMARY_OVERLAP_DAYS = 1
+
+
+def generate_daily_summaries(days_back=None, full=False):
     """
     Generate daily page view summaries from detailed logs.
 
+    Today and the SUMMARY_OVERLAP_DAYS days before it are always recomputed;
+    older days only when they received events since the previous run. The
+    highest processed event id is kept in a ProcessingCursor row shared by
+    all workers; if it is missing (or ``full`` is set) every day in the
+    window is recomputed. Each day costs one grouped query and one bulk
+    upsert.
+
     Args:
         days_back (int): Number of days back to process
+        full (bool): Recompute every day in the window, ignoring the cursor
 
     Returns:
-        int: Number of summaries generated
+        int: Number of summaries written
     """
     days_back = days_back or djinsight_settings.SUMMARY_DAYS_BACK
     logger.info(f"Generating daily summaries for the last {days_back} days")
 
-    end_date = timezone.now().date()
+    end_date = timezone.localdate()
     start_date = end_date - timedelta(days=days_back)
 
-    summaries_created = 0
+    high_water = PageViewEvent.objects.aggregate(max_id=Max("id"))["max_id"]
+    if high_water is None:
+        logger.info("No page view events to summarize")
+        return 0
 
-    page_views = (
-        PageViewEvent.objects.filter(
-            timestamp__date__gte=start_date, timestamp__date__lte=end_date
+    watermark = None if full else ProcessingCursor.get_position(SUMMARY_CURSOR)
+    if watermark is not None and watermark > high_water:
+        # Events were removed or the table was recreated; start over
+        watermark = None
+
+    if watermark is None:
+        days = [start_date + timedelta(days=i) for i in range(days_back + 1)]
+    else:
+        overlap = min(SUMMARY_OVERLAP_DAYS, days_back)
+        recent = {end_date - timedelta(days=i) for i in range(overlap + 1)}
+        changed = (
+            PageViewEvent.objects.filter(
+                id__gt=watermark,
+                id__lte=high_water,
+                timestamp__gte=start_of_day(start_date),
+            )
+            .annotate(day=TruncDate("timestamp"))
+            .values_list("day", flat=True)
+            .distinct()
         )
-        .values("content_type", "object_id", "timestamp__date")
-        .distinct()
+        days = sorted(recent.union(changed))
+
+    summaries_written = 0
+    for day in days:
+        summaries_written += _summarize_day(day)
+
+    ProcessingCursor.set_position(SUMMARY_CURSOR, high_water)
+
+    logger.info(
+        f"Generated {summaries_written} daily summaries for {len(days)} days"
     )
+    return summaries_written
 
-    for view_data in page_views:
-        content_type_id = view_data["content_type"]
-        content_type = ContentType.objects.get(pk=content_type_id)
-        object_id = view_data["object_id"]
-        date = view_data["timestamp__date"]
 
-        date_views = PageViewEvent.objects.filter(
-            content_type=content_type,
-            object_id=object_id,
-            timestamp__date=date
+def _summarize_day(day):
+    """Recompute the summaries of every object viewed on ``day``."""
+    rows = (
+        PageViewEvent.objects.filter(
+            timestamp__gte=start_of_day(day),
+            timestamp__lt=start_of_day(day + timedelta(days=1)),
+        )
+        .annotate(date=TruncDate("timestamp"))
+        .values("content_type_id", "object_id", "date")
+        .annotate(
+            total=Count("id"),
+            unique=Count("session_key", distinct=True),
         )
+        .order_by()
+    )
 
-        total_views = date_views.count()
-        unique_views = date_views.values("session_key").distinct().count()
-
-        summary, created = PageViewSummary.objects.update_or_create(
-            content_type=content_type,
-            object_id=object_id,
-            date=date,
-            defaults={
-                "total_views": total_views,
-                "unique_views": unique_views,
-            },
+    sketches = {}
+    if djinsight_settings.use_hll_uniques:
+        sketch_rows = PageViewSketch.objects.filter(
+            period=day.isoformat()
+        ).values_list("content_type_id", "object_id", "unique_views")
+        sketches = {
+            (content_type_id, object_id): unique_views
+            for content_type_id, object_id, unique_views in sketch_rows
+        }
+
+    summaries = [
+        PageViewSummary(
+            content_type_id=row["content_type_id"],
+            object_id=row["object_id"],
+            date=row["date"],
+            total_views=row["total"],
+            unique_views=sketches.get(
+                (row["content_type_id"], row["object_id"]), row["unique"]
+            ),
         )
+        for row in rows
+    ]
+    if not summaries:
+        return 0
 
-        if created:
-            summaries_created += 1
+    if django.VERSION >= (4, 1):
+        PageViewSummary.objects.bulk_create(
+            summaries,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["content_type", "object_id", "date"],
+            update_fields=["total_views", "unique_views"],
+        )
+    else:
+        for summary in summaries:
+            PageViewSummary.objects.update_or_create(
+                content_type_id=summary.content_type_id,
+                object_id=summary.object_id,
+                date=summary.date,
+                defaults={
+                    "total_views": summary.total_views,
+                    "unique_views": summary.unique_views,
+                },
+            )
 
-    logger.info(f"Generated {summaries_created} daily summaries")
-    return summaries_created
+    invalidate_cache(
+        (summary.content_type_id, summary.object_id) for summary in summaries
+    )
+    return len(summaries)
 
 
 def cleanup_old_data(days_to_keep=None):
     """
     Cleanup old page view logs older than specified days.
 
+    On a partitioned PostgreSQL table whole partitions are dropped; other
+    databases delete in batches of CLEANUP_BATCH_SIZE. Rollup and sketch
+    rows older than SUMMARY_RETENTION_DAYS are pruned as well, and the
+    ContentTypeTotals object counts are reconciled.
+
     Args:
         days_to_keep (int): Number of days of logs to keep
 
     Returns:
-        int: Number of records deleted
+        int: Number of page view events deleted
     """
     days_to_keep = days_to_keep or djinsight_settings.CLEANUP_DAYS_TO_KEEP
     cutoff_date = timezone.now() - timedelta(days=days_to_keep)
 
     logger.info(f"Cleaning up page view logs older than {cutoff_date}")
 
+    cleanup_old_rollups()
+    ContentTypeTotals.reconcile_object_counts()
+
+    if partitions.is_partitioned():
+        deleted_count = partitions.drop_partitions(cutoff_date)
+        logger.info(
+            f"Dropped partitions holding about {deleted_count} old page view events"
+        )
+        return deleted_count
+
     # Delete in batches to avoid long-running transactions
     batch_size = djinsight_settings.CLEANUP_BATCH_SIZE
     deleted_count = 0
@@ -426,35 +873,104 @@ def cleanup_old_data(days_to_keep=None):
 
     logger.info(f"Deleted {deleted_count} old page view events")
 
-    # Also cleanup old Redis session keys (this is optional)
-    redis_client = _get_redis_client()
-    if redis_client:
-        try:
-            # Clean up session keys older than days_to_keep
-            prefix = djinsight_settings.REDIS_KEY_PREFIX
-            session_pattern = f"{prefix}session:*"
-            session_keys = list(redis_client.scan_iter(match=session_pattern, count=1000))
-
-            # Check TTL and delete expired keys manually
-            # (Redis should handle this automatically, but just in case)
-            deleted_sessions = 0
-            for key in session_keys:
-                ttl = redis_client.ttl(key)
-                if ttl == -1:  # Key exists but has no expiration
-                    redis_client.delete(key)
-                    deleted_sessions += 1
-
-            if deleted_sessions > 0:
-                logger.info(
-                    f"Cleaned up {deleted_sessions} orphaned session keys from Redis"
-                )
+    return deleted_count
 
-        except Exception as e:
-            logger.error(f"Error cleaning up Redis session keys: {e}")
+
+def cleanup_old_rollups(days_to_keep=None):
+    """
+    Delete daily, hourly and dimension summaries and daily sketches older
+    than ``days_to_keep`` days; all-time sketches are kept.
+
+    Args:
+        days_to_keep (int): Number of days to keep (default:
+            SUMMARY_RETENTION_DAYS)
+
+    Returns:
+        int: Number of rows deleted
+    """
+    days_to_keep = days_to_keep or djinsight_settings.SUMMARY_RETENTION_DAYS
+    cutoff_day = timezone.localdate() - timedelta(days=days_to_keep)
+
+    querysets = [
+        PageViewSummary.objects.filter(date__lt=cutoff_day),
+        PageViewDimensionSummary.objects.filter(date__lt=cutoff_day),
+        PageViewHourlySummary.objects.filter(hour__lt=start_of_day(cutoff_day)),
+        # Daily sketch periods are ISO dates, which sort like the days
+        PageViewSketch.objects.exclude(period=PageViewSketch.ALL_TIME).filter(
+            period__lt=cutoff_day.isoformat()
+        ),
+    ]
+    deleted_count = sum(queryset.delete()[0] for queryset in querysets)
+
+    logger.info(f"Deleted {deleted_count} summary rows older than {cutoff_day}")
 
     return deleted_count
 
 
+def classify_page_views(batch_size=None):
+    """
+    Backfill the device, traffic source and referrer domain of events stored
+    before these columns existed.
+
+    Args:
+        batch_size (int): Number of events updated per query
+
+    Returns:
+        int: Number of events classified
+    """
+    batch_size = batch_size or djinsight_settings.CLEANUP_BATCH_SIZE
+    classified_count = 0
+    last_id = 0
+    while True:
+        rows = list(
+            PageViewEvent.objects.filter(device_category="", pk__gt=last_id)
+            .order_by("pk")
+            .values_list(
+                "pk",
+                "user_agent",
+                "referrer",
+                "user_agent_dimension__value",
+                "referrer_dimension__value",
+            )[:batch_size]
+        )
+        if not rows:
+            break
+
+        events = []
+        for pk, user_agent, referrer, user_agent_value, referrer_value in rows:
+            event = PageViewEvent(pk=pk)
+            event.classify(
+                user_agent_value or user_agent or "", referrer_value or referrer or ""
+            )
+            events.append(event)
+        PageViewEvent.objects.bulk_update(
+            events, ["device_category", "source_category", "referrer_domain"]
+        )
+        classified_count += len(events)
+        last_id = rows[-1][0]
+
+    logger.info(f"Classified {classified_count} page view events")
+    return classified_count
+
+
+def redis_housekeeping(time_budget=None):
+    """
+    Sweep orphaned and stale keys from Redis, resuming the previous scan.
+
+    Args:
+        time_budget (float): Seconds to spend before checkpointing the scan
+
+    Returns:
+        dict: Numbers of keys scanned, orphaned and compacted
+    """
+    redis_client = _get_redis_client()
+    if not redis_client:
+        logger.error("Redis client not available")
+        return {"scanned": 0, "orphaned": 0, "compacted": 0, "complete": 0}
+
+    return run_housekeeping(redis_client, time_budget)
+
+
 def run_process_page_views(verbosity=1, **options):
     """Function that can be called from management command"""
     batch_size = options.get("batch_size") or djinsight_settings.PROCESS_BATCH_SIZE
@@ -462,7 +978,8 @@ def run_process_page_views(verbosity=1, **options):
 
     if verbosity >= 1:
         print(
-            f"Processing page views with batch_size={batch_size}, max_records={max_records}"
+            f"Processing page views with batch_size={batch_size}, "
+            f"max_records={max_records}"
         )
 
     processed = process_page_views(batch_size, max_records)
@@ -476,11 +993,12 @@ def run_process_page_views(verbosity=1, **options):
 def run_generate_summaries(verbosity=1, **options):
     """Function that can be called from management command"""
     days_back = options.get("days_back") or djinsight_settings.SUMMARY_DAYS_BACK
+    full = options.get("full", False)
 
     if verbosity >= 1:
         print(f"Generating daily summaries for the last {days_back} days")
 
-    generated = generate_daily_summaries(days_back)
+    generated = generate_daily_summaries(days_back, full=full)
 
     if verbosity >= 1:
         print(f"Generated {generated} daily summaries")
@@ -490,7 +1008,9 @@ def run_generate_summaries(verbosity=1, **options):
 
 def run_cleanup_old_data(verbosity=1, **options):
     """Function that can be called from management command"""
-    days_to_keep = options.get("days_to_keep") or djinsight_settings.CLEANUP_DAYS_TO_KEEP
+    days_to_keep = (
+        options.get("days_to_keep") or djinsight_settings.CLEANUP_DAYS_TO_KEEP
+    )
 
     if verbosity >= 1:
         print(f"Cleaning up data older than {days_to_keep} days")
@@ -501,3 +1021,76 @@ def run_cleanup_old_data(verbosity=1, **options):
         print(f"Deleted {deleted} old records")
 
     return deleted
+
+
+def run_create_partitions(verbosity=1, **options):
+    """Function that can be called from management command"""
+    if options.get("convert"):
+        created = partitions.convert_to_partitioned(options.get("interval"))
+    else:
+        if not partitions.is_partitioned():
+            if verbosity >= 1:
+                print("Page view events are not partitioned; nothing to do")
+            return []
+        created = partitions.create_partitions(
+            options.get("ahead"), options.get("interval")
+        )
+
+    if verbosity >= 1:
+        print(f"Created {len(created)} partitions")
+        for name in created:
+            print(f"  {name}")
+
+    return created
+
+
+def run_redis_housekeeping(verbosity=1, **options):
+    """Function that can be called from management command"""
+    result = redis_housekeeping(options.get("time_budget"))
+
+    if verbosity >= 1:
+        print(
+            f"Scanned {result['scanned']} keys, unlinked {result['orphaned']} orphaned "
+            f"and {result['compacted']} stale object keys"
+        )
+        if not result["complete"]:
+            print("Time budget spent; the next run resumes the scan")
+
+    return result
+
+
+def run_classify_page_views(verbosity=1, **options):
+    """Function that can be called from management command"""
+    classified = classify_page_views(options.get("batch_size"))
+
+    if verbosity >= 1:
+        print(f"Classified {classified} page view events")
+
+    return classified
+
+
+def run_rebuild_rollups(verbosity=1, **options):
+    """Function that can be called from management command"""
+    days_back = options.get("days_back")
+    since = timezone.now() - timedelta(days=days_back) if days_back else None
+
+    classified = classify_page_views()
+    written = rebuild_dimension_summaries(since)
+    totals = ContentTypeTotals.rebuild()
+
+    if verbosity >= 1:
+        print(f"Classified {classified} page view events")
+        print(f"Wrote {written} dimension summary rows")
+        print(f"Recomputed {totals} content type totals")
+
+    return written
+
+
+def run_refresh_dashboard_snapshots(verbosity=1, **options):
+    """Function that can be called from management command"""
+    written = refresh_snapshots()
+
+    if verbosity >= 1:
+        print(f"Wrote {written} dashboard snapshots")
+
+    return written
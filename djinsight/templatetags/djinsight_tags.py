@@ -7,15 +7,20 @@ from django.utils.safestring import mark_safe
 
 from djinsight.conf import djinsight_settings
 from djinsight.utils import (
+    PREFETCHED_STATS_KEY,
     check_stats_permission,
     format_view_count,
     get_content_type_label,
     get_object_from_context,
     get_object_url,
+    prefetch_stats,
 )
+from djinsight.views import MAX_BULK_VIEWS
 
 register = template.Library()
 
+TRACKING_LOADER_KEY = "_djinsight_tracking_loader"
+
 
 @register.simple_tag(takes_context=True)
 def stats(
@@ -55,6 +60,19 @@ def stats(
     return mark_safe(renderer.render())
 
 
+@register.simple_tag(takes_context=True)
+def stats_prefetch(context, objects):
+    """Load stats for a list of objects up front so ``{% stats %}`` reuses them."""
+    request = context.get("request")
+    if not check_stats_permission(request) or not objects:
+        return ""
+
+    prefetched = dict(context.get(PREFETCHED_STATS_KEY) or {})
+    prefetched.update(prefetch_stats(objects, request=request))
+    context[PREFETCHED_STATS_KEY] = prefetched
+    return ""
+
+
 @register.filter
 def format_count(count):
     return format_view_count(count)
@@ -68,6 +86,12 @@ def to_json(data):
 
 @register.simple_tag(takes_context=True)
 def track(context, obj=None):
+    """
+    Queue the object for tracking.
+
+    Every tag on a page adds its object to one queue; the first one also
+    renders the loader that sends the whole queue in a single beacon.
+    """
     request = context.get("request")
     if not request or not djinsight_settings.ENABLE_TRACKING:
         return ""
@@ -76,10 +100,14 @@ def track(context, obj=None):
     if not obj:
         return ""
 
+    include_loader = not getattr(request, TRACKING_LOADER_KEY, False)
+    if include_loader:
+        setattr(request, TRACKING_LOADER_KEY, True)
+
     try:
-        record_url = reverse("djinsight:record_page_view")
+        record_url = reverse("djinsight:record_page_views")
     except NoReverseMatch:
-        record_url = "/djinsight/record-view/"
+        record_url = "/djinsight/record-views/"
 
     object_data = json.dumps(
         {
@@ -95,7 +123,8 @@ def track(context, obj=None):
             {
                 "object_data": object_data,
                 "record_url": record_url,
-                "async_load": True,
+                "include_loader": include_loader,
+                "max_views": MAX_BULK_VIEWS,
                 "debug": False,
             },
         )
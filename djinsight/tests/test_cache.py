@@ -0,0 +1,113 @@
+"""Tests for the djinsight stats cache."""
+
+import json
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from djinsight import cache, tasks
+from djinsight.models import PageViewEvent, PageViewStatistics
+from djinsight.series import get_view_series
+
+
+@override_settings(DJINSIGHT={"ENABLE_CACHING": True, "USE_REDIS": False})
+class StatsCacheTest(TestCase):
+    """Test the generation-keyed read-through cache."""
+
+    def setUp(self):
+        caches["default"].clear()
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.obj = PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=10**6, total_views=1
+        )
+        self.stats = PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=self.obj.pk, total_views=5
+        )
+        self.label = f"{self.content_type.app_label}.{self.content_type.model}"
+
+    def store_view(self):
+        payload = {
+            "content_type": self.label,
+            "object_id": self.obj.pk,
+            "url": "/",
+            "session_key": "visitor",
+            "timestamp": int(timezone.now().timestamp()),
+            "is_unique": True,
+        }
+        tasks.store_page_views([("key", json.dumps(payload).encode())])
+
+    def test_stats_are_cached(self):
+        PageViewStatistics.get_for_object(self.obj)
+
+        with self.assertNumQueries(0):
+            stats = PageViewStatistics.get_for_object(self.obj)
+
+        self.assertEqual(stats.total_views, 5)
+
+    def test_missing_stats_are_cached(self):
+        PageViewStatistics.get_cached(self.content_type.id, 999)
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(PageViewStatistics.get_cached(self.content_type.id, 999))
+
+    def test_flush_invalidates_stats(self):
+        PageViewStatistics.get_for_object(self.obj)
+
+        self.store_view()
+
+        self.assertEqual(PageViewStatistics.get_for_object(self.obj).total_views, 6)
+
+    def test_other_objects_stay_cached(self):
+        PageViewStatistics.get_cached(self.content_type.id, 999)
+
+        self.store_view()
+
+        with self.assertNumQueries(0):
+            PageViewStatistics.get_cached(self.content_type.id, 999)
+
+    def test_series_cached_until_summaries_change(self):
+        today = timezone.localdate()
+        start = today - timedelta(days=6)
+        get_view_series(self.obj, start, today)
+
+        with self.assertNumQueries(0):
+            get_view_series(self.obj, start, today)
+
+        PageViewEvent.objects.create(
+            content_type=self.content_type,
+            object_id=self.obj.pk,
+            url="/",
+            session_key="a",
+        )
+        tasks.generate_daily_summaries(days_back=1)
+
+        self.assertEqual(get_view_series(self.obj, start, today)[-1]["count"], 1)
+
+    def test_hour_series_key_is_stable_within_the_hour(self):
+        now = timezone.localtime().replace(minute=30)
+        get_view_series(self.obj, now - timedelta(hours=2), now, granularity="hour")
+
+        with self.assertNumQueries(0):
+            get_view_series(
+                self.obj,
+                now - timedelta(hours=2),
+                now + timedelta(minutes=5),
+                granularity="hour",
+            )
+
+    def test_evicted_generation_is_not_reused(self):
+        first = cache.get_generation(self.content_type.id, 1)
+        caches["default"].delete(cache._generation_key(self.content_type.id, 1))
+
+        self.assertNotEqual(cache.get_generation(self.content_type.id, 1), first)
+
+    def test_disabled(self):
+        with override_settings(DJINSIGHT={"ENABLE_CACHING": False}):
+            PageViewStatistics.get_for_object(self.obj)
+
+            with self.assertNumQueries(2):
+                PageViewStatistics.get_for_object(self.obj)
+                PageViewStatistics.get_for_object(self.obj)
@@ -0,0 +1,121 @@
+"""Tests for the Redis buffer event encoding."""
+
+import json
+
+from django.test import SimpleTestCase, override_settings
+
+from djinsight.codec import decode_event, encode_event, pack_event
+
+
+def make_event(**overrides):
+    return {
+        "view_id": "6f1c2a3e-0000-4000-8000-000000000000",
+        "content_type": "blog.post",
+        "content_type_id": 12,
+        "object_id": 34,
+        "url": "/blog/34/",
+        "session_key": "visitor-1",
+        "ip_address": "203.0.113.7",
+        "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 " * 2,
+        "referrer": "https://example.com/?q=" + "ż" * 40,
+        "timestamp": 1700000000,
+        "is_unique": True,
+        **overrides,
+    }
+
+
+@override_settings(DJINSIGHT={"REDIS_EVENT_FORMAT": "binary"})
+class EventCodecTest(SimpleTestCase):
+    """Test the binary event format."""
+
+    def assertRoundTrips(self, event):
+        decoded = decode_event(encode_event(event))
+        expected = {
+            key: event[key]
+            for key in (
+                "content_type_id",
+                "object_id",
+                "url",
+                "session_key",
+                "ip_address",
+                "user_agent",
+                "referrer",
+                "timestamp",
+                "is_unique",
+            )
+        }
+        self.assertEqual(decoded, expected)
+
+    def test_round_trip(self):
+        self.assertRoundTrips(make_event())
+        self.assertRoundTrips(make_event(is_unique=False))
+
+    def test_empty_fields_decode_to_none(self):
+        decoded = decode_event(encode_event(make_event(ip_address=None, referrer="")))
+
+        self.assertIsNone(decoded["ip_address"])
+        self.assertIsNone(decoded["referrer"])
+
+    def test_smaller_than_json(self):
+        event = make_event()
+
+        self.assertLess(len(encode_event(event)), len(json.dumps(event)) * 0.6)
+
+    def test_compression(self):
+        event = make_event()
+        plain = encode_event(event)
+
+        with override_settings(
+            DJINSIGHT={"REDIS_EVENT_FORMAT": "binary", "REDIS_EVENT_COMPRESS": True}
+        ):
+            compressed = encode_event(event)
+            self.assertRoundTrips(event)
+
+        self.assertLess(len(compressed), len(plain))
+
+    @override_settings(
+        DJINSIGHT={"REDIS_EVENT_FORMAT": "binary", "REDIS_EVENT_COMPRESS": True}
+    )
+    def test_long_values_are_truncated_before_compression(self):
+        referrer = "https://example.com/?q=" + "".join(
+            f"{index:x}" for index in range(20000)
+        )
+        decoded = decode_event(encode_event(make_event(referrer=referrer)))
+
+        self.assertEqual(decoded["referrer"], referrer[:0xFFFF])
+
+    def test_suffixes_match_encoded_flag(self):
+        event = make_event()
+        head, unique_suffix, repeat_suffix = pack_event(event)
+
+        self.assertEqual(head + unique_suffix, encode_event(event))
+        self.assertEqual(
+            head + repeat_suffix, encode_event({**event, "is_unique": False})
+        )
+
+    def test_json_without_content_type_id(self):
+        event = make_event(content_type_id=None)
+        raw = encode_event(event)
+
+        self.assertEqual(json.loads(raw), event)
+        self.assertEqual(decode_event(raw), event)
+
+    def test_json_for_ids_too_large_for_the_header(self):
+        event = make_event(object_id=2**32)
+        raw = encode_event(event)
+
+        self.assertEqual(json.loads(raw), event)
+        self.assertEqual(decode_event(raw), event)
+
+    @override_settings(DJINSIGHT={"REDIS_EVENT_FORMAT": "json"})
+    def test_json_format(self):
+        event = make_event()
+
+        self.assertEqual(json.loads(encode_event(event)), event)
+
+    def test_malformed(self):
+        raw = encode_event(make_event())
+
+        for value in (raw[:10], raw[:-2], raw + b"\x00", b"\x09" + raw[1:]):
+            with self.assertRaises(ValueError):
+                decode_event(value)
@@ -0,0 +1,146 @@
+"""Tests for djinsight content type resolution."""
+
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from djinsight import content_types
+from djinsight.models import ContentTypeRegistry, PageViewStatistics
+
+
+class ContentTypeResolverTest(TestCase):
+    """Test the cached "app_label.model" resolver."""
+
+    def setUp(self):
+        content_types.clear()
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.label = f"{self.content_type.app_label}.{self.content_type.model}"
+
+    def tearDown(self):
+        content_types.clear()
+
+    def test_resolves_label(self):
+        self.assertEqual(
+            content_types.get_content_type_id(self.label), self.content_type.id
+        )
+        self.assertEqual(content_types.get_content_type(self.label), self.content_type)
+
+    def test_model_is_case_insensitive(self):
+        self.assertEqual(
+            content_types.get_content_type_id("djinsight.PageViewStatistics"),
+            self.content_type.id,
+        )
+
+    def test_invalid_labels(self):
+        for label in (None, "", "djinsight", "a.b.c", ".model", "djinsight.", 123):
+            self.assertIsNone(content_types.get_content_type_id(label))
+        self.assertIsNone(content_types.get_content_type_id("djinsight.missing"))
+
+    def test_repeat_lookups_hit_cache(self):
+        content_types.get_content_type_id(self.label)
+
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                content_types.get_content_type_id(self.label)
+
+    def test_warmed_from_registry(self):
+        ContentTypeRegistry.objects.create(content_type=self.content_type)
+        content_types.clear()
+
+        with self.assertNumQueries(1):
+            content_types.get_content_type_id(self.label)
+            content_types.get_content_type_id(self.label)
+
+    def test_registry_change_clears_cache(self):
+        content_types.get_content_type_id(self.label)
+
+        ContentTypeRegistry.objects.create(content_type=self.content_type)
+
+        self.assertFalse(content_types._cache)
+
+    def test_lru_evicts_oldest(self):
+        other = ContentType.objects.get_for_model(ContentType)
+        other_label = f"{other.app_label}.{other.model}"
+
+        with mock.patch.object(content_types, "MAX_SIZE", 1):
+            content_types.get_content_type_id(self.label)
+            content_types.get_content_type_id(other_label)
+
+        self.assertEqual(list(content_types._cache), [(other.app_label, other.model)])
+
+
+class RegistrySnapshotTest(TestCase):
+    """Test the cached ContentTypeRegistry snapshot."""
+
+    def setUp(self):
+        content_types.invalidate_registry()
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.user = mock.Mock(is_authenticated=True)
+
+    def test_snapshot_is_reused(self):
+        ContentTypeRegistry.objects.create(content_type=self.content_type)
+
+        with self.assertNumQueries(1):
+            for _ in range(10):
+                self.assertTrue(content_types.should_track(self.content_type.id))
+
+    def test_snapshot_is_immutable(self):
+        with self.assertRaises(TypeError):
+            content_types.get_registry()[self.content_type.id] = None
+
+    def test_flags(self):
+        ContentTypeRegistry.objects.create(
+            content_type=self.content_type,
+            track_anonymous=False,
+            track_authenticated=True,
+        )
+
+        self.assertFalse(content_types.should_track(self.content_type.id))
+        self.assertTrue(content_types.should_track(self.content_type.id, self.user))
+
+    def test_disabled(self):
+        ContentTypeRegistry.objects.create(
+            content_type=self.content_type, enabled=False
+        )
+
+        self.assertFalse(content_types.should_track(self.content_type.id, self.user))
+
+    def test_unregistered(self):
+        self.assertTrue(content_types.should_track(self.content_type.id))
+
+        with override_settings(DJINSIGHT={"TRACK_REGISTERED_ONLY": True}):
+            self.assertFalse(content_types.should_track(self.content_type.id))
+
+    def test_reloads_when_version_key_changes(self):
+        content_types.get_registry()
+        # A change made by another process: bypass signals
+        ContentTypeRegistry.objects.bulk_create(
+            [ContentTypeRegistry(content_type=self.content_type, enabled=False)]
+        )
+        self.assertTrue(content_types.should_track(self.content_type.id))
+
+        caches["default"].set(content_types.REGISTRY_VERSION_KEY, "other")
+        content_types._registry_checked_at = 0.0
+
+        self.assertFalse(content_types.should_track(self.content_type.id))
+
+    @override_settings(DJINSIGHT={"REGISTRY_MAX_AGE": 0})
+    def test_reloads_after_max_age_without_version_change(self):
+        content_types.get_registry()
+        # Another process changed the registry but its version key went to its
+        # own process-local cache
+        ContentTypeRegistry.objects.bulk_create(
+            [ContentTypeRegistry(content_type=self.content_type, enabled=False)]
+        )
+        content_types._registry_checked_at = 0.0
+
+        self.assertFalse(content_types.should_track(self.content_type.id))
+
+    def test_keeps_snapshot_within_max_age(self):
+        content_types.get_registry()
+
+        content_types._registry_checked_at = 0.0
+        with self.assertNumQueries(0):
+            content_types.get_registry()
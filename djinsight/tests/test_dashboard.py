@@ -0,0 +1,129 @@
+"""Tests for the rollup-backed dashboard data and its snapshots."""
+
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from djinsight import dashboard, tasks
+from djinsight.models import (
+    AnalyticsSnapshot,
+    PageViewEvent,
+    PageViewStatistics,
+    PageViewSummary,
+)
+
+IPHONE = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Mobile/15E148"
+
+
+class DashboardDataTest(TestCase):
+    """Test computing and snapshotting the dashboard payload."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+        PageViewStatistics.objects.create(
+            content_type=self.content_type,
+            object_id=1,
+            total_views=7,
+            unique_views=4,
+            last_viewed_at=timezone.now(),
+        )
+        PageViewSummary.objects.create(
+            content_type=self.content_type,
+            object_id=1,
+            date=self.yesterday,
+            total_views=5,
+            unique_views=3,
+        )
+        for session_key in ("a", "b"):
+            PageViewEvent.objects.create(
+                content_type=self.content_type,
+                object_id=1,
+                url="/",
+                session_key=session_key,
+                user_agent=IPHONE,
+                referrer="https://www.google.com/",
+                is_unique=True,
+            )
+
+    def test_build_dashboard_data(self):
+        data = dashboard.build_dashboard_data()
+
+        self.assertEqual(data["total_views"], 7)
+        self.assertEqual(data["total_unique"], 4)
+        self.assertEqual(data["total_objects"], 1)
+        self.assertEqual(data["sources"], [["search", 2]])
+        self.assertEqual(data["devices"], [["mobile", 2]])
+
+    def test_chart_reads_summaries_and_hourly_rollup(self):
+        start = timezone.now() - timedelta(days=3)
+
+        chart = dashboard.build_chart(start=start, end=timezone.now())
+
+        self.assertEqual(chart["labels"][-1], self.today.strftime("%Y-%m-%d"))
+        self.assertEqual(chart["views"][-2:], [5, 2])
+        self.assertEqual(chart["unique"][-2:], [3, 2])
+        self.assertEqual(chart["views"][:-2], [0] * (len(chart["views"]) - 2))
+
+    def test_all_time_chart_spans_the_data(self):
+        chart = dashboard.build_chart()
+
+        self.assertEqual(
+            chart["labels"],
+            [self.yesterday.strftime("%Y-%m-%d"), self.today.strftime("%Y-%m-%d")],
+        )
+        self.assertEqual(chart["views"], [5, 2])
+
+    def test_refresh_snapshots(self):
+        written = dashboard.refresh_snapshots()
+
+        self.assertEqual(written, 2 * len(dashboard.SNAPSHOT_PERIODS))
+        snapshot = AnalyticsSnapshot.objects.get(period="week", content_type=None)
+        self.assertEqual(snapshot.payload["total_views"], 7)
+        self.assertEqual(snapshot.payload["chart"]["views"][-2:], [5, 2])
+
+    def test_dashboard_reads_fresh_snapshot(self):
+        dashboard.refresh_snapshots()
+        AnalyticsSnapshot.objects.filter(
+            period="month", content_type=self.content_type
+        ).update(payload={"total_views": 99})
+
+        with self.assertNumQueries(1):
+            data = dashboard.get_dashboard_data("month", self.content_type)
+
+        self.assertEqual(data, {"total_views": 99})
+
+    @override_settings(DJINSIGHT={"DASHBOARD_SNAPSHOT_MAX_AGE": 60})
+    def test_stale_snapshot_is_recomputed(self):
+        dashboard.refresh_snapshots()
+        AnalyticsSnapshot.objects.update(
+            payload={"total_views": 99},
+            computed_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        data = dashboard.get_dashboard_data("all")
+
+        self.assertEqual(data["total_views"], 7)
+
+    def test_custom_range_ignores_snapshots(self):
+        dashboard.refresh_snapshots()
+        AnalyticsSnapshot.objects.update(payload={"total_views": 99})
+
+        data = dashboard.get_dashboard_data(
+            "custom", start=timezone.now() - timedelta(days=2), end=timezone.now()
+        )
+
+        self.assertEqual(data["total_views"], 7)
+
+    def test_untracked_content_type_snapshots_are_removed(self):
+        dashboard.refresh_snapshots()
+        PageViewStatistics.objects.all().delete()
+
+        tasks.run_refresh_dashboard_snapshots(verbosity=0)
+
+        self.assertFalse(
+            AnalyticsSnapshot.objects.filter(content_type__isnull=False).exists()
+        )
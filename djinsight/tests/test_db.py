@@ -0,0 +1,105 @@
+"""Tests for djinsight database helpers."""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django.utils import timezone
+
+from djinsight.models import PageViewStatistics
+
+
+class BulkIncrementTest(TestCase):
+    """Test PageViewStatistics.bulk_increment on the ON CONFLICT path."""
+
+    # Stored unique counts, the statistics upsert and the content type totals
+    # upsert
+    expected_queries = 3
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.now = timezone.now().replace(microsecond=0)
+
+    def delta(self, total, unique, first, last):
+        return {
+            "total_views": total,
+            "unique_views": unique,
+            "first_viewed_at": first,
+            "last_viewed_at": last,
+        }
+
+    def test_creates_missing_rows(self):
+        PageViewStatistics.bulk_increment(
+            {
+                (self.content_type.id, 1): self.delta(3, 2, self.now, self.now),
+                (self.content_type.id, 2): self.delta(1, 1, self.now, self.now),
+            }
+        )
+
+        stats = PageViewStatistics.objects.get(
+            content_type=self.content_type, object_id=1
+        )
+        self.assertEqual(stats.total_views, 3)
+        self.assertEqual(stats.unique_views, 2)
+        self.assertEqual(stats.first_viewed_at, self.now)
+        self.assertEqual(PageViewStatistics.objects.count(), 2)
+
+    def test_batch_is_merged_in_constant_statements(self):
+        counters = {
+            (self.content_type.id, object_id): self.delta(1, 1, self.now, self.now)
+            for object_id in range(1, 51)
+        }
+
+        with self.assertNumQueries(self.expected_queries):
+            PageViewStatistics.bulk_increment(counters)
+
+    def test_merges_into_existing_rows(self):
+        earlier = self.now - timedelta(days=1)
+        PageViewStatistics.objects.create(
+            content_type=self.content_type,
+            object_id=1,
+            total_views=10,
+            unique_views=4,
+            first_viewed_at=earlier,
+            last_viewed_at=earlier,
+        )
+
+        PageViewStatistics.bulk_increment(
+            {(self.content_type.id, 1): self.delta(2, 1, self.now, self.now)}
+        )
+
+        stats = PageViewStatistics.objects.get(
+            content_type=self.content_type, object_id=1
+        )
+        self.assertEqual(stats.total_views, 12)
+        self.assertEqual(stats.unique_views, 5)
+        self.assertEqual(stats.first_viewed_at, earlier)
+        self.assertEqual(stats.last_viewed_at, self.now)
+
+    def test_does_not_move_last_viewed_backwards(self):
+        PageViewStatistics.objects.create(
+            content_type=self.content_type,
+            object_id=1,
+            total_views=1,
+            first_viewed_at=self.now,
+            last_viewed_at=self.now,
+        )
+        earlier = self.now - timedelta(hours=1)
+
+        PageViewStatistics.bulk_increment(
+            {(self.content_type.id, 1): self.delta(1, 0, earlier, earlier)}
+        )
+
+        stats = PageViewStatistics.objects.get(
+            content_type=self.content_type, object_id=1
+        )
+        self.assertEqual(stats.first_viewed_at, earlier)
+        self.assertEqual(stats.last_viewed_at, self.now)
+
+
+@mock.patch("djinsight.db.UPSERT_VENDORS", set())
+class BulkIncrementFallbackTest(BulkIncrementTest):
+    """Run the same checks through the chunked fallback path."""
+
+    expected_queries = 7
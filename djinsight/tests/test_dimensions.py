@@ -0,0 +1,123 @@
+"""Tests for slim events and their dimension tables."""
+
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from djinsight import dimensions, tasks
+from djinsight.mcp.tools.behavior import get_device_breakdown
+from djinsight.mcp.tools.referrers import get_referrer_stats
+from djinsight.models import PageViewEvent, ReferrerDimension, UrlDimension
+from djinsight.providers.database import DatabaseProvider
+
+CHROME = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0 Safari/537.36"
+IPHONE = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Mobile/15E148"
+
+
+@override_settings(DJINSIGHT={"SLIM_EVENTS": True, "USE_REDIS": False})
+class SlimEventsTest(TestCase):
+    """Test interning event strings into dimension tables."""
+
+    def setUp(self):
+        dimensions.clear()
+        self.content_type = ContentType.objects.get_for_model(PageViewEvent)
+        self.label = f"{self.content_type.app_label}.{self.content_type.model}"
+
+    def store(self, *views):
+        items = []
+        for index, (user_agent, referrer) in enumerate(views):
+            payload = {
+                "content_type": self.label,
+                "object_id": 1,
+                "url": "/post/1/",
+                "session_key": f"visitor-{index}",
+                "user_agent": user_agent,
+                "referrer": referrer,
+                "timestamp": int(timezone.now().timestamp()),
+                "is_unique": True,
+            }
+            items.append((f"key-{index}", json.dumps(payload).encode()))
+        tasks.store_page_views(items)
+
+    def test_value_hash_is_stable_and_signed(self):
+        key = dimensions.value_hash("https://example.com/")
+
+        self.assertEqual(key, dimensions.value_hash("https://example.com/"))
+        self.assertTrue(-(2**63) <= key < 2**63)
+
+    def test_flush_stores_dimension_keys(self):
+        self.store((CHROME, "https://www.google.com/"), (CHROME, ""))
+
+        event = PageViewEvent.objects.filter(referrer_dimension__isnull=False).get()
+        self.assertEqual(event.url, "")
+        self.assertIsNone(event.user_agent)
+        self.assertEqual(event.url_dimension.value, "/post/1/")
+        self.assertEqual(event.user_agent_dimension.value, CHROME)
+        self.assertEqual(event.referrer_dimension.value, "https://www.google.com/")
+        self.assertEqual(UrlDimension.objects.count(), 1)
+        self.assertEqual(ReferrerDimension.objects.count(), 1)
+
+    def test_slim_events_are_classified(self):
+        self.store((IPHONE, "https://www.google.com/search"))
+
+        event = PageViewEvent.objects.get()
+        self.assertEqual(
+            (event.device_category, event.source_category, event.referrer_domain),
+            ("mobile", "search", "google.com"),
+        )
+
+    def test_known_values_are_not_written_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store((CHROME, "https://www.google.com/"))
+
+        with self.assertNumQueries(0):
+            dimensions.intern(UrlDimension, ["/post/1/"])
+
+    def test_rolled_back_values_are_written_again(self):
+        self.store((CHROME, "https://www.google.com/"))
+
+        with self.assertNumQueries(1):
+            dimensions.intern(UrlDimension, ["/post/1/"])
+
+    def test_database_provider(self):
+        DatabaseProvider().record_view(
+            {
+                "content_type": self.label,
+                "object_id": 1,
+                "url": "/post/1/",
+                "session_key": "visitor",
+                "user_agent": IPHONE,
+                "referrer": "",
+            }
+        )
+
+        event = PageViewEvent.objects.get()
+        self.assertEqual(event.user_agent_dimension.value, IPHONE)
+        self.assertIsNone(event.referrer_dimension_id)
+
+    def test_reports_read_slim_and_raw_events(self):
+        self.store(
+            (CHROME, "https://www.google.com/"), (IPHONE, "https://www.google.com/a")
+        )
+        PageViewEvent.objects.create(
+            content_type=self.content_type,
+            object_id=1,
+            url="/post/1/",
+            session_key="legacy",
+            user_agent=IPHONE,
+            referrer="https://news.ycombinator.com/",
+        )
+
+        referrers = get_referrer_stats(self.label, object_id=1)
+        devices = get_device_breakdown(self.label, object_id=1)
+
+        self.assertEqual(
+            {row["domain"]: row["views"] for row in referrers["referrers"]},
+            {"google.com": 2, "news.ycombinator.com": 1},
+        )
+        self.assertEqual(
+            {row["device"]: row["views"] for row in devices["devices"]},
+            {"desktop": 1, "mobile": 2},
+        )
@@ -8,6 +8,7 @@ from django.utils import timezone
 
 from djinsight.mcp.tools.behavior import get_device_breakdown, get_hourly_pattern
 from djinsight.models import PageViewEvent
+from djinsight.rollups import get_dimension_rows, get_hourly_rows, hour_bucket
 
 
 class BehaviorToolsTestBase(TestCase):
@@ -215,3 +216,42 @@ class GetHourlyPatternTest(BehaviorToolsTestBase):
         result = get_hourly_pattern(self.ct_str, period="today")
         total_counted = sum(h["views"] for h in result["hours"])
         self.assertEqual(total_counted, result["total_views"])
+
+
+class RollupRangeTest(BehaviorToolsTestBase):
+    """Test that partial first and last buckets are included consistently."""
+
+    def test_partial_first_and_last_hours_are_included(self):
+        hour = hour_bucket(timezone.now()) - timedelta(hours=3)
+        for timestamp in (hour + timedelta(minutes=10), hour + timedelta(minutes=130)):
+            PageViewEvent.objects.create(
+                content_type=self.ct,
+                object_id=self.object_id,
+                url="/test/",
+                timestamp=timestamp,
+            )
+
+        rows = get_hourly_rows(
+            self.ct,
+            start=hour + timedelta(minutes=30),
+            end=hour + timedelta(minutes=125),
+        )
+
+        self.assertEqual(sum(row.total_views for row in rows), 2)
+
+    def test_partial_first_and_last_days_are_included(self):
+        day = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        day -= timedelta(days=1)
+        for hours in (1, 23):
+            PageViewEvent.objects.create(
+                content_type=self.ct,
+                object_id=self.object_id,
+                url="/test/",
+                timestamp=day + timedelta(hours=hours),
+            )
+
+        rows = get_dimension_rows(
+            self.ct, start=day + timedelta(hours=2), end=day + timedelta(hours=22)
+        )
+
+        self.assertEqual(sum(row.total_views for row in rows), 2)
@@ -45,6 +45,18 @@ class GetSiteOverviewTest(TestCase):
         self.assertEqual(ct_entry["unique_views"], 130)
         self.assertEqual(ct_entry["object_count"], 2)
 
+    def test_reads_materialized_totals(self):
+        for object_id in range(1, 11):
+            PageViewStatistics.objects.create(
+                content_type=self.ct_stats, object_id=object_id, total_views=1
+            )
+
+        with self.assertNumQueries(2):
+            result = get_site_overview()
+
+        self.assertEqual(result["total_views"], 10)
+        self.assertEqual(result["tracked_objects"], 10)
+
     def test_multiple_content_types(self):
         PageViewStatistics.objects.create(
             content_type=self.ct_stats, object_id=1, total_views=100, unique_views=50
@@ -1,15 +1,22 @@
 """Tests for djinsight models."""
 
+from datetime import timedelta
+from unittest import mock
+
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 from django.utils import timezone
 
+from djinsight import content_types
 from djinsight.models import (
     ContentTypeRegistry,
+    ContentTypeTotals,
     MCPAPIKey,
     PageViewEvent,
+    PageViewHourlySummary,
     PageViewStatistics,
     PageViewSummary,
+    StatsQueryMixin,
 )
 
 
@@ -18,6 +25,7 @@ class ContentTypeRegistryTest(TestCase):
 
     def setUp(self):
         """Set up test data."""
+        content_types.invalidate_registry()
         self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
 
     def test_register_creates_entry(self):
@@ -160,6 +168,127 @@ class PageViewStatisticsTest(TestCase):
         self.assertIn("10 views", str(stats))
 
 
+class ContentTypeTotalsTest(TestCase):
+    """Test ContentTypeTotals kept in step with PageViewStatistics."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.other_type = ContentType.objects.get_for_model(PageViewSummary)
+        self.now = timezone.now()
+
+    def assertTotals(self, content_type, total_views, unique_views, object_count):
+        if content_type is None:
+            totals = ContentTypeTotals.get_site()
+        else:
+            totals = ContentTypeTotals.objects.get(content_type=content_type)
+        self.assertEqual(
+            (totals.total_views, totals.unique_views, totals.object_count),
+            (total_views, unique_views, object_count),
+        )
+
+    def delta(self, total, unique):
+        return {
+            "total_views": total,
+            "unique_views": unique,
+            "first_viewed_at": self.now,
+            "last_viewed_at": self.now,
+        }
+
+    def test_bulk_increment_applies_deltas(self):
+        PageViewStatistics.bulk_increment(
+            {
+                (self.content_type.id, 1): self.delta(3, 2),
+                (self.other_type.id, 1): self.delta(1, 1),
+            }
+        )
+        PageViewStatistics.bulk_increment({(self.content_type.id, 1): self.delta(2, 1)})
+
+        self.assertTotals(self.content_type, 5, 3, 1)
+        self.assertTotals(self.other_type, 1, 1, 1)
+        self.assertTotals(None, 6, 4, 2)
+
+    def test_bulk_increment_with_replaced_unique_views(self):
+        PageViewStatistics.bulk_increment({(self.content_type.id, 1): self.delta(3, 2)})
+        PageViewStatistics.bulk_increment(
+            {(self.content_type.id, 1): self.delta(2, 4)}, replace_unique=True
+        )
+
+        self.assertTotals(self.content_type, 5, 4, 1)
+        self.assertTotals(None, 5, 4, 1)
+
+    def test_direct_edits_and_deletes(self):
+        stats = PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=1, total_views=10, unique_views=5
+        )
+        PageViewStatistics.objects.create(
+            content_type=self.other_type, object_id=1, total_views=7, unique_views=7
+        )
+        self.assertTotals(None, 17, 12, 2)
+
+        stats.total_views = 4
+        stats.save()
+        self.assertTotals(self.content_type, 4, 5, 1)
+
+        stats.content_type = self.other_type
+        stats.object_id = 2
+        stats.save()
+        self.assertTotals(self.content_type, 0, 0, 0)
+        self.assertTotals(self.other_type, 11, 12, 2)
+
+        PageViewStatistics.objects.filter(object_id=1).delete()
+        self.assertTotals(self.other_type, 4, 5, 1)
+        self.assertTotals(None, 4, 5, 1)
+
+    def test_increment_view_count(self):
+        stats = PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=1
+        )
+
+        stats.increment_view_count(unique=True)
+        stats.increment_view_count()
+
+        self.assertTotals(self.content_type, 2, 1, 1)
+        self.assertTotals(None, 2, 1, 1)
+
+    def test_rebuild(self):
+        PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=1, total_views=10, unique_views=5
+        )
+        ContentTypeTotals.objects.update(total_views=999)
+
+        self.assertEqual(ContentTypeTotals.rebuild(), 1)
+
+        self.assertTotals(self.content_type, 10, 5, 1)
+        self.assertTotals(None, 10, 5, 1)
+
+    def test_reconcile_object_counts(self):
+        PageViewStatistics.bulk_increment({(self.content_type.id, 1): self.delta(3, 2)})
+        PageViewStatistics.bulk_increment({(self.other_type.id, 1): self.delta(1, 1)})
+        # A new object counted twice by parallel flushers
+        ContentTypeTotals.objects.filter(content_type=self.content_type).update(
+            object_count=2
+        )
+
+        self.assertEqual(ContentTypeTotals.reconcile_object_counts(), 1)
+
+        self.assertTotals(self.content_type, 3, 2, 1)
+        self.assertTotals(self.other_type, 1, 1, 1)
+
+    def test_site_totals_are_summed_from_content_types(self):
+        PageViewStatistics.bulk_increment(
+            {
+                (self.content_type.id, 1): self.delta(3, 2),
+                (self.other_type.id, 1): self.delta(1, 1),
+            }
+        )
+
+        self.assertEqual(ContentTypeTotals.objects.count(), 2)
+        self.assertTotals(None, 4, 3, 2)
+
+    def test_site_totals_without_rows(self):
+        self.assertTotals(None, 0, 0, 0)
+
+
 class PageViewSummaryTest(TestCase):
     """Test PageViewSummary model."""
 
@@ -199,6 +328,66 @@ class PageViewSummaryTest(TestCase):
         self.assertIn("100 views", str(summary))
 
 
+class PageViewHourlySummaryTest(TestCase):
+    """Test the hourly rollup and the today queries built on it."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.obj = PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=1
+        )
+        self.object_ct = ContentType.objects.get_for_model(self.obj)
+        self.now = timezone.now().replace(hour=15, minute=30, second=0, microsecond=0)
+        patcher = mock.patch("djinsight.models.now", return_value=self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_event(self, timestamp, is_unique=False):
+        return PageViewEvent.objects.create(
+            content_type=self.object_ct,
+            object_id=self.obj.pk,
+            url="/test/",
+            timestamp=timestamp,
+            is_unique=is_unique,
+        )
+
+    def test_saved_events_update_hourly_buckets(self):
+        self.create_event(self.now - timedelta(minutes=20), is_unique=True)
+        self.create_event(self.now - timedelta(minutes=10))
+
+        bucket = PageViewHourlySummary.objects.get(
+            content_type=self.object_ct, object_id=self.obj.pk
+        )
+        self.assertEqual(bucket.hour, self.now.replace(minute=0))
+        self.assertEqual(bucket.total_views, 2)
+        self.assertEqual(bucket.unique_views, 1)
+
+    def test_get_views_today_counts_todays_buckets(self):
+        self.create_event(self.now - timedelta(hours=3))
+        self.create_event(self.now - timedelta(minutes=5))
+        self.create_event(self.now - timedelta(days=1))
+
+        self.assertEqual(StatsQueryMixin.get_views_today(self.obj), 2)
+
+    def test_get_views_today_chart_reads_buckets_in_one_query(self):
+        self.create_event(self.now - timedelta(hours=3))
+        self.create_event(self.now - timedelta(hours=3))
+        self.create_event(self.now - timedelta(hours=1))
+
+        # One query for the statistics row, one for the buckets
+        with self.assertNumQueries(2):
+            data = StatsQueryMixin.get_views_today(self.obj, chart_data=True)
+
+        self.assertEqual(len(data), 15)
+        self.assertEqual(data[12], {
+            "date": self.now.strftime("%Y-%m-%d 12:00"),
+            "label": "12:00",
+            "count": 2,
+        })
+        self.assertEqual(data[14]["count"], 1)
+        self.assertEqual(sum(entry["count"] for entry in data), 3)
+
+
 class MCPAPIKeyTest(TestCase):
     """Test MCPAPIKey model."""
 
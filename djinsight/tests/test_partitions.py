@@ -0,0 +1,188 @@
+"""Tests for PageViewEvent partitioning."""
+
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock, skipUnless
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from djinsight import partitions, tasks
+from djinsight.models import PageViewEvent
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class PartitionPeriodsTest(SimpleTestCase):
+    """Test partition naming and period arithmetic."""
+
+    def test_periods(self):
+        self.assertEqual(
+            partitions.period_start(date(2024, 2, 29), "month"), date(2024, 2, 1)
+        )
+        self.assertEqual(
+            partitions.next_period(date(2024, 12, 1), "month"), date(2025, 1, 1)
+        )
+        self.assertEqual(
+            partitions.next_period(date(2024, 2, 29), "day"), date(2024, 3, 1)
+        )
+
+        with self.assertRaises(ValueError):
+            partitions.period_start(date(2024, 2, 29), "week")
+
+    def test_partition_name(self):
+        self.assertEqual(
+            partitions.partition_name(date(2024, 3, 1), "month"),
+            "djinsight_pageviewevent_p202403",
+        )
+        self.assertEqual(
+            partitions.partition_name(date(2024, 3, 5), "day"),
+            "djinsight_pageviewevent_p20240305",
+        )
+
+    def test_parse_bound(self):
+        self.assertEqual(
+            partitions._parse_bound("'2024-03-01 00:00:00+00'"), utc(2024, 3, 1)
+        )
+        self.assertIsNone(partitions._parse_bound("MINVALUE"))
+
+    def test_missing_periods(self):
+        existing = [
+            partitions.Partition("legacy", None, utc(2024, 3, 1)),
+            partitions.Partition("p202404", utc(2024, 4, 1), utc(2024, 5, 1)),
+        ]
+
+        self.assertEqual(
+            partitions.missing_periods(existing, date(2024, 2, 10), 3, "month"),
+            [date(2024, 3, 1), date(2024, 5, 1)],
+        )
+
+    def test_missing_daily_periods_skip_monthly_partitions(self):
+        existing = [partitions.Partition("p202403", utc(2024, 3, 1), utc(2024, 4, 1))]
+
+        self.assertEqual(
+            partitions.missing_periods(existing, date(2024, 3, 30), 3, "day"),
+            [date(2024, 4, 1), date(2024, 4, 2)],
+        )
+
+
+class PartitionFallbackTest(TestCase):
+    """Test that unpartitioned databases keep the batched cleanup."""
+
+    def test_not_partitioned_on_sqlite(self):
+        self.assertFalse(partitions.is_partitioned())
+        self.assertEqual(partitions.create_partitions(), [])
+        self.assertEqual(partitions.drop_partitions(timezone.now()), 0)
+
+        with self.assertRaises(RuntimeError):
+            partitions.convert_to_partitioned()
+
+    def test_cleanup_deletes_rows(self):
+        content_type = ContentType.objects.get_for_model(PageViewEvent)
+        for days in (1, 100):
+            PageViewEvent.objects.create(
+                content_type=content_type,
+                object_id=1,
+                url="/",
+                session_key="a",
+                timestamp=timezone.now() - timedelta(days=days),
+            )
+
+        self.assertEqual(tasks.cleanup_old_data(days_to_keep=90), 1)
+        self.assertEqual(PageViewEvent.objects.count(), 1)
+
+    def test_cleanup_drops_partitions(self):
+        with mock.patch.object(
+            partitions, "is_partitioned", return_value=True
+        ), mock.patch.object(partitions, "drop_partitions", return_value=1000) as drop:
+            self.assertEqual(tasks.cleanup_old_data(days_to_keep=90), 1000)
+
+        cutoff = drop.call_args[0][0]
+        self.assertAlmostEqual(
+            cutoff, timezone.now() - timedelta(days=90), delta=timedelta(minutes=1)
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "Partitioning requires PostgreSQL")
+class PostgresPartitioningTest(TestCase):
+    """Convert, extend and prune the event table on a real PostgreSQL database."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewEvent)
+
+    def create_event(self, timestamp):
+        return PageViewEvent.objects.create(
+            content_type=self.content_type,
+            object_id=1,
+            url="/",
+            session_key="a",
+            timestamp=timestamp,
+        )
+
+    def test_convert_extend_and_prune(self):
+        now = timezone.now()
+        old = self.create_event(now - timedelta(days=400))
+        self.create_event(now)
+
+        created = partitions.convert_to_partitioned("month")
+
+        self.assertTrue(partitions.is_partitioned())
+        self.assertEqual(len(created), 3)
+        self.assertEqual(PageViewEvent.objects.count(), 2)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = to_regclass(%s) AND contype = 'p'",
+                [PageViewEvent._meta.db_table],
+            )
+            self.assertEqual(cursor.fetchone()[0], "PRIMARY KEY (id, \"timestamp\")")
+
+        # New rows get ids after the existing ones
+        recent = self.create_event(now)
+        self.assertGreater(recent.pk, old.pk)
+
+        # Rows past the created ranges land in DEFAULT and move on extension
+        future = self.create_event(now + timedelta(days=200))
+        default = partitions.default_partition()
+        self.assertIsNotNone(default)
+        partitions.create_partitions(ahead=8, interval="month")
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{default}"')
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertTrue(PageViewEvent.objects.filter(pk=future.pk).exists())
+
+        # Retention drops the legacy partition holding the old row
+        partitions.drop_partitions(now + timedelta(days=60))
+        self.assertFalse(PageViewEvent.objects.filter(pk=old.pk).exists())
+
+    def test_retention_deletes_old_rows_from_default(self):
+        partitions.convert_to_partitioned("month")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'ALTER TABLE "{PageViewEvent._meta.db_table}" '
+                f'DETACH PARTITION "{PageViewEvent._meta.db_table}_legacy"'
+            )
+        old = self.create_event(timezone.now() - timedelta(days=400))
+
+        cutoff = timezone.now() - timedelta(days=90)
+        self.assertEqual(partitions.drop_partitions(cutoff), 1)
+        self.assertFalse(PageViewEvent.objects.filter(pk=old.pk).exists())
+
+    def test_retention_deletes_old_rows_from_the_legacy_partition(self):
+        now = timezone.now()
+        old = self.create_event(now - timedelta(days=400))
+        recent = self.create_event(now)
+        partitions.convert_to_partitioned("month")
+
+        self.assertEqual(partitions.drop_partitions(now - timedelta(days=90)), 1)
+
+        self.assertFalse(PageViewEvent.objects.filter(pk=old.pk).exists())
+        self.assertTrue(PageViewEvent.objects.filter(pk=recent.pk).exists())
+        self.assertIn(
+            f"{PageViewEvent._meta.db_table}_legacy",
+            [partition.name for partition in partitions.get_partitions()],
+        )
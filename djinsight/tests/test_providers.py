@@ -1,13 +1,23 @@
 """Tests for djinsight providers."""
 
+import json
+import uuid
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
-from djinsight.models import PageViewEvent, PageViewStatistics
+from djinsight.models import ContentTypeTotals, PageViewEvent, PageViewStatistics
 from djinsight.providers.database import AsyncDatabaseProvider, DatabaseProvider
 from djinsight.registry import ProviderRegistry
 
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover
+    fakeredis = None
+
 
 class DatabaseProviderTest(TestCase):
     """Test DatabaseProvider functionality."""
@@ -89,6 +99,34 @@ class DatabaseProviderTest(TestCase):
         self.assertEqual(stats.total_views, 2)
         self.assertEqual(stats.unique_views, 1)
 
+        site = ContentTypeTotals.get_site()
+        self.assertEqual(
+            (site.total_views, site.unique_views, site.object_count), (2, 1, 1)
+        )
+
+    def test_record_view_only_updates_its_content_type_row(self):
+        """Test that a view never locks a site row or rebuilds the totals."""
+        PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=2, total_views=10
+        )
+        ContentTypeTotals.objects.all().delete()
+        label = f"{self.content_type.app_label}.{self.content_type.model}"
+
+        self.provider.record_view(
+            {
+                "content_type": label,
+                "object_id": 2,
+                "url": "/test/",
+                "session_key": "test-session",
+                "timestamp": timezone.now().timestamp(),
+                "is_unique": False,
+            }
+        )
+
+        totals = ContentTypeTotals.objects.get()
+        self.assertEqual(totals.content_type, self.content_type)
+        self.assertEqual(totals.total_views, 1)
+
     def test_get_stats_returns_correct_data(self):
         """Test that get_stats returns correct statistics."""
         # Create some stats
@@ -164,6 +202,181 @@ class AsyncDatabaseProviderTest(TestCase):
         self.assertIsInstance(self.provider._sync_provider, DatabaseProvider)
 
 
+class DatabaseProviderRecordAndCheckTest(TestCase):
+    """Test the default record_and_check on DatabaseProvider."""
+
+    def setUp(self):
+        self.provider = DatabaseProvider()
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+
+    def test_second_view_is_not_unique(self):
+        event_data = {
+            "content_type": f"{self.content_type.app_label}.{self.content_type.model}",
+            "object_id": 1,
+            "url": "/test/",
+            "session_key": "test-session",
+        }
+
+        first = self.provider.record_and_check(event_data)
+        second = self.provider.record_and_check(event_data)
+
+        self.assertTrue(first["is_unique"])
+        self.assertFalse(second["is_unique"])
+        stats = PageViewStatistics.objects.get(
+            content_type=self.content_type, object_id=1
+        )
+        self.assertEqual(stats.total_views, 2)
+        self.assertEqual(stats.unique_views, 1)
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class RedisProviderRecordAndCheckTest(TestCase):
+    """Test the Lua-backed record_and_check on the Redis providers."""
+
+    def setUp(self):
+        from djinsight.providers.redis import RedisProvider
+
+        self.redis = fakeredis.FakeRedis()
+        self.provider = RedisProvider(client=self.redis)
+        self.prefix = self.provider.key_prefix
+
+    def make_event(self, session_key="session-1"):
+        return {
+            "view_id": str(uuid.uuid4()),
+            "content_type": "blog.post",
+            "object_id": 7,
+            "url": "/post/7/",
+            "session_key": session_key,
+            "timestamp": 1700000000,
+        }
+
+    def test_unique_only_once_per_session(self):
+        first = self.provider.record_and_check(self.make_event())
+        second = self.provider.record_and_check(self.make_event())
+        other = self.provider.record_and_check(self.make_event("session-2"))
+
+        self.assertEqual(
+            [first["is_unique"], second["is_unique"], other["is_unique"]],
+            [True, False, True],
+        )
+        self.assertEqual(self.redis.get(f"{self.prefix}:pending:blog.post:7"), b"3")
+        self.assertEqual(
+            self.redis.get(f"{self.prefix}:pending_unique:blog.post:7"), b"2"
+        )
+        self.assertFalse(self.redis.exists(f"{self.prefix}:counter:blog.post:7"))
+        self.assertEqual(
+            self.redis.smembers(f"{self.prefix}:seen:session-1"), {b"blog.post:7"}
+        )
+        self.assertGreater(self.redis.ttl(f"{self.prefix}:seen:session-1"), 0)
+
+    @override_settings(DJINSIGHT={"REDIS_INGEST_MODE": "keys"})
+    def test_buffers_event_with_unique_flag(self):
+        event = self.make_event()
+        self.provider.record_and_check(event)
+
+        key = f"{self.prefix}:{event['view_id']}"
+        payload = json.loads(self.redis.get(key))
+        self.assertEqual(payload, {**event, "is_unique": True})
+        self.assertGreater(self.redis.ttl(key), 0)
+
+    @override_settings(DJINSIGHT={"REDIS_INGEST_MODE": "stream"})
+    def test_stream_mode_appends_to_stream(self):
+        from djinsight.conf import djinsight_settings
+
+        self.provider.record_and_check(self.make_event())
+        self.provider.record_and_check(self.make_event())
+
+        entries = self.redis.xrange(djinsight_settings.redis_stream_key)
+        flags = [json.loads(fields[b"d"])["is_unique"] for _, fields in entries]
+        self.assertEqual(flags, [True, False])
+
+    @override_settings(
+        DJINSIGHT={"REDIS_INGEST_MODE": "stream", "REDIS_EVENT_FORMAT": "binary"}
+    )
+    def test_binary_events_carry_unique_flag(self):
+        from djinsight.codec import decode_event
+        from djinsight.conf import djinsight_settings
+
+        event = {**self.make_event(), "content_type_id": 3}
+        self.provider.record_and_check(event)
+        self.provider.record_and_check(event)
+
+        entries = self.redis.xrange(djinsight_settings.redis_stream_key)
+        decoded = [decode_event(fields[b"d"]) for _, fields in entries]
+        self.assertEqual([data["is_unique"] for data in decoded], [True, False])
+        self.assertEqual(decoded[0]["content_type_id"], 3)
+        self.assertEqual(decoded[0]["url"], "/post/7/")
+
+    def test_one_seen_set_per_session(self):
+        self.provider.mark_viewed("session-1", "blog.post", 7, 60)
+        self.provider.mark_viewed("session-1", "blog.post", 8, 60)
+        self.provider.record_and_check({**self.make_event(), "object_id": 9})
+
+        self.assertEqual(
+            self.redis.keys(f"{self.prefix}:seen:*"),
+            [f"{self.prefix}:seen:session-1".encode()],
+        )
+        self.assertFalse(self.provider.check_unique_view("session-1", "blog.post", 8))
+        self.assertFalse(self.provider.check_unique_view("session-1", "blog.post", 9))
+        self.assertTrue(self.provider.check_unique_view("session-1", "blog.post", 10))
+        self.assertTrue(self.provider.check_unique_view("session-2", "blog.post", 7))
+
+    @override_settings(DJINSIGHT={"UNIQUE_VIEWS_MODE": "hll"})
+    def test_hll_mode_uses_sketches(self):
+        from djinsight.providers.redis import hll_key
+
+        flags = [
+            self.provider.record_and_check(self.make_event(session_key))["is_unique"]
+            for session_key in ("session-1", "session-1", "session-2")
+        ]
+
+        self.assertEqual(flags, [True, False, True])
+        self.assertEqual(self.redis.keys(f"{self.prefix}:seen:*"), [])
+        stats = self.provider.get_stats("blog.post", 7)
+        self.assertEqual((stats["total_views"], stats["unique_views"]), (3, 2))
+        day = timezone.localdate().isoformat()
+        self.assertEqual(
+            self.redis.pfcount(hll_key(self.prefix, "blog.post", 7, day)), 2
+        )
+        self.assertGreater(self.redis.ttl(hll_key(self.prefix, "blog.post", 7, day)), 0)
+
+    @override_settings(DJINSIGHT={"REDIS_INGEST_MODE": "keys"})
+    def test_record_many_uses_one_pipeline(self):
+        events = [self.make_event(), self.make_event(), self.make_event("session-2")]
+
+        with mock.patch.object(
+            self.redis, "pipeline", wraps=self.redis.pipeline
+        ) as pipeline:
+            results = self.provider.record_many(events)
+
+        pipeline.assert_called_once()
+        self.assertEqual(
+            [result["is_unique"] for result in results], [True, False, True]
+        )
+        self.assertEqual(self.redis.get(f"{self.prefix}:pending:blog.post:7"), b"3")
+        for event in events:
+            self.assertTrue(self.redis.exists(f"{self.prefix}:{event['view_id']}"))
+
+    def test_async_record_many(self):
+        from djinsight.providers.redis import AsyncRedisProvider
+
+        provider = AsyncRedisProvider(client=fakeredis.FakeAsyncRedis())
+        results = async_to_sync(provider.record_many)(
+            [self.make_event(), self.make_event()]
+        )
+
+        self.assertEqual([result["is_unique"] for result in results], [True, False])
+
+    def test_async_provider(self):
+        from djinsight.providers.redis import AsyncRedisProvider
+
+        provider = AsyncRedisProvider(client=fakeredis.FakeAsyncRedis())
+        record = async_to_sync(provider.record_and_check)
+
+        self.assertTrue(record(self.make_event())["is_unique"])
+        self.assertFalse(record(self.make_event())["is_unique"])
+
+
 class ProviderRegistryTest(TestCase):
     """Test ProviderRegistry functionality."""
 
@@ -181,3 +394,62 @@ class ProviderRegistryTest(TestCase):
         """Test get_async_provider convenience method."""
         provider = ProviderRegistry.get_async_provider()
         self.assertIsInstance(provider, AsyncDatabaseProvider)
+
+    def test_get_provider_returns_shared_instance(self):
+        """Test that get_provider reuses one instance per provider class."""
+        self.addCleanup(ProviderRegistry.reset)
+
+        self.assertIs(ProviderRegistry.get_provider(), ProviderRegistry.get_provider())
+        self.assertIs(
+            ProviderRegistry.get_async_provider(), ProviderRegistry.get_async_provider()
+        )
+
+    def test_reset_drops_instances(self):
+        """Test that reset makes get_provider build a new instance."""
+        self.addCleanup(ProviderRegistry.reset)
+        provider = ProviderRegistry.get_provider()
+
+        ProviderRegistry.reset()
+
+        self.assertIsNot(ProviderRegistry.get_provider(), provider)
+
+
+class RedisConnectionPoolTest(TestCase):
+    """Test the process-wide Redis connection pools."""
+
+    def setUp(self):
+        from djinsight.providers import redis as redis_provider
+
+        self.redis_provider = redis_provider
+        redis_provider.close_connection_pools()
+        self.addCleanup(redis_provider.close_connection_pools)
+
+    @override_settings(DJINSIGHT={"REDIS_PORT": 1, "REDIS_MAX_CONNECTIONS": 7})
+    def test_providers_share_one_pool_without_connecting(self):
+        first = self.redis_provider.RedisProvider()
+        second = self.redis_provider.RedisProvider()
+
+        pool = self.redis_provider.get_connection_pool()
+        self.assertIs(first.client.connection_pool, pool)
+        self.assertIs(second.client.connection_pool, pool)
+        self.assertEqual(pool.max_connections, 7)
+
+    def test_pool_is_replaced_after_fork(self):
+        pool = self.redis_provider.get_connection_pool()
+
+        self.redis_provider._reset_after_fork()
+
+        self.assertIsNot(self.redis_provider.get_connection_pool(), pool)
+
+    def test_async_pool_per_event_loop(self):
+        provider = self.redis_provider.AsyncRedisProvider()
+
+        async def get_pool():
+            client = await provider._get_redis_client()
+            self.assertIs(client, await provider._get_redis_client())
+            return client.connection_pool
+
+        first = async_to_sync(get_pool)()
+        second = async_to_sync(get_pool)()
+
+        self.assertIsNot(first, second)
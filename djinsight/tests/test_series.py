@@ -0,0 +1,138 @@
+"""Tests for the djinsight view series engine."""
+
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django.utils import timezone
+
+from djinsight.models import (
+    PageViewEvent,
+    PageViewStatistics,
+    PageViewSummary,
+    StatsQueryMixin,
+)
+from djinsight.series import add_months, get_view_series
+
+
+class SeriesTestCase(TestCase):
+    """Shared fixtures for series tests."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.obj = PageViewStatistics.objects.create(
+            content_type=self.content_type, object_id=1
+        )
+        self.today = timezone.localdate()
+
+    def create_summary(self, day, total, unique=0):
+        PageViewSummary.objects.create(
+            content_type=self.content_type,
+            object_id=self.obj.pk,
+            date=day,
+            total_views=total,
+            unique_views=unique,
+        )
+
+    def create_event(self, day, session_key="session"):
+        PageViewEvent.objects.create(
+            content_type=self.content_type,
+            object_id=self.obj.pk,
+            url="/",
+            session_key=session_key,
+            timestamp=timezone.make_aware(datetime.combine(day, datetime.min.time()))
+            + timedelta(hours=12),
+        )
+
+
+class ViewSeriesTest(SeriesTestCase):
+    """Test get_view_series."""
+
+    def test_day_series_is_gap_filled(self):
+        start = self.today - timedelta(days=6)
+        self.create_summary(start, 5)
+
+        series = get_view_series(self.obj, start, self.today)
+
+        self.assertEqual(len(series), 7)
+        self.assertEqual(series[0]["count"], 5)
+        self.assertEqual(series[0]["date"], start.strftime("%Y-%m-%d"))
+        self.assertEqual([entry["count"] for entry in series[1:]], [0] * 6)
+
+    def test_uncovered_days_fall_back_to_events(self):
+        start = self.today - timedelta(days=29)
+        for i in range(29):
+            self.create_summary(start + timedelta(days=i), i)
+        self.create_event(self.today)
+        self.create_event(self.today)
+
+        with self.assertNumQueries(2):
+            series = get_view_series(self.obj, start, self.today)
+
+        self.assertEqual(len(series), 30)
+        self.assertEqual(series[-1]["count"], 2)
+        self.assertEqual(series[3]["count"], 3)
+
+    def test_covered_range_needs_one_query(self):
+        start = self.today - timedelta(days=2)
+        for i in range(3):
+            self.create_summary(start + timedelta(days=i), 1)
+
+        with self.assertNumQueries(1):
+            get_view_series(self.obj, start, self.today)
+
+    def test_unique_metric(self):
+        self.create_event(self.today, session_key="a")
+        self.create_event(self.today, session_key="a")
+        self.create_event(self.today, session_key="b")
+
+        series = get_view_series(
+            self.obj, self.today, self.today, metric="unique_views"
+        )
+
+        self.assertEqual(series[0]["count"], 2)
+
+    def test_month_series_covers_consecutive_calendar_months(self):
+        start = add_months(self.today.replace(day=1), -11)
+        self.create_summary(start, 4)
+        self.create_summary(self.today, 6)
+
+        series = get_view_series(self.obj, start, self.today, granularity="month")
+
+        months = [entry["date"] for entry in series]
+        self.assertEqual(len(months), 12)
+        self.assertEqual(len(set(months)), 12)
+        self.assertEqual(months[0], start.strftime("%Y-%m"))
+        self.assertEqual(months[-1], self.today.strftime("%Y-%m"))
+        self.assertEqual(series[0]["count"], 4)
+        self.assertEqual(series[-1]["count"], 6)
+
+    def test_invalid_granularity(self):
+        with self.assertRaises(ValueError):
+            get_view_series(self.obj, self.today, self.today, granularity="week")
+
+    def test_add_months(self):
+        self.assertEqual(add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+        self.assertEqual(add_months(date(2025, 11, 1), 2), date(2026, 1, 1))
+
+
+class StatsQueryMixinSeriesTest(SeriesTestCase):
+    """Test the StatsQueryMixin chart methods built on the series engine."""
+
+    def test_get_views_year_chart(self):
+        with mock.patch("djinsight.models.now", return_value=timezone.now()):
+            data = StatsQueryMixin.get_views_year(self.obj, chart_data=True)
+
+        self.assertEqual(len(data), 12)
+        self.assertEqual(len({entry["date"] for entry in data}), 12)
+
+    def test_get_views_month_matches_chart_total(self):
+        self.create_summary(self.today - timedelta(days=3), 7)
+        self.create_event(self.today)
+
+        chart = StatsQueryMixin.get_views_month(self.obj, chart_data=True)
+
+        self.assertEqual(len(chart), 30)
+        self.assertEqual(StatsQueryMixin.get_views_month(self.obj), 8)
+        self.assertEqual(sum(entry["count"] for entry in chart), 8)
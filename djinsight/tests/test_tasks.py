@@ -0,0 +1,648 @@
+"""Tests for djinsight background tasks."""
+
+import json
+import uuid
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from djinsight import tasks
+from djinsight.live import get_live_stats, get_live_stats_many
+from djinsight.models import (
+    ContentTypeTotals,
+    PageViewDimensionSummary,
+    PageViewEvent,
+    PageViewHourlySummary,
+    PageViewSketch,
+    PageViewStatistics,
+    PageViewSummary,
+    ProcessingCursor,
+)
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover
+    fakeredis = None
+
+
+def make_event(content_type, object_id=1, session_key="session-1", is_unique=True):
+    return {
+        "view_id": str(uuid.uuid4()),
+        "content_type": f"{content_type.app_label}.{content_type.model}",
+        "object_id": object_id,
+        "url": f"/objects/{object_id}/",
+        "session_key": session_key,
+        "ip_address": "127.0.0.1",
+        "user_agent": "Test Agent",
+        "referrer": "https://example.com",
+        "timestamp": int(timezone.now().timestamp()),
+        "is_unique": is_unique,
+    }
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class RedisTaskTestCase(TestCase):
+    """Base class wiring the tasks module and RedisProvider to a fake Redis."""
+
+    def setUp(self):
+        from djinsight.providers.redis import RedisProvider
+
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch.object(tasks, "_redis_client", self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.provider = RedisProvider(client=self.redis)
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+
+
+@override_settings(DJINSIGHT={"REDIS_INGEST_MODE": "keys"})
+class ProcessPageViewsKeysTest(RedisTaskTestCase):
+    """Test the key-per-event ingest mode."""
+
+    def test_process_page_views_persists_events(self):
+        self.provider.record_view(make_event(self.content_type))
+        self.provider.record_view(
+            make_event(self.content_type, session_key="session-2", is_unique=False)
+        )
+
+        processed = tasks.process_page_views()
+
+        self.assertEqual(processed, 2)
+        self.assertEqual(PageViewEvent.objects.count(), 2)
+        stats = PageViewStatistics.objects.get(
+            content_type=self.content_type, object_id=1
+        )
+        self.assertEqual(stats.total_views, 2)
+        self.assertEqual(stats.unique_views, 1)
+
+    def test_process_page_views_updates_hourly_summary(self):
+        self.provider.record_view(make_event(self.content_type))
+        self.provider.record_view(
+            make_event(self.content_type, session_key="session-2", is_unique=False)
+        )
+
+        tasks.process_page_views()
+
+        bucket = PageViewHourlySummary.objects.get(
+            content_type=self.content_type, object_id=1
+        )
+        self.assertEqual(bucket.total_views, 2)
+        self.assertEqual(bucket.unique_views, 1)
+
+    def test_process_page_views_updates_dimension_summary(self):
+        from djinsight.mcp.tools.behavior import get_device_breakdown
+
+        label = f"{self.content_type.app_label}.{self.content_type.model}"
+        for session_key, user_agent in (
+            ("a", "Mozilla/5.0 (iPhone)"),
+            ("b", "Googlebot/2.1"),
+        ):
+            event = make_event(self.content_type, session_key=session_key)
+            self.provider.record_view({**event, "user_agent": user_agent})
+
+        tasks.process_page_views()
+        PageViewEvent.objects.all().delete()
+
+        devices = get_device_breakdown(label, object_id=1, period="today")
+        self.assertEqual(
+            {row["device"]: row["views"] for row in devices["devices"]},
+            {"mobile": 1, "bot": 1},
+        )
+        row = PageViewDimensionSummary.objects.get(device_category="mobile")
+        self.assertEqual(
+            (row.date, row.source_category, row.referrer_domain, row.unique_views),
+            (timezone.localdate(), "referral", "example.com", 1),
+        )
+
+    def test_process_page_views_keeps_counters_and_sessions(self):
+        self.provider.record_view(make_event(self.content_type))
+
+        tasks.process_page_views()
+
+        label = f"{self.content_type.app_label}.{self.content_type.model}"
+        self.assertEqual(self.provider.get_stats(label, 1)["total_views"], 1)
+        self.assertFalse(self.provider.check_unique_view("session-1", label, 1))
+
+
+@override_settings(
+    DJINSIGHT={"REDIS_INGEST_MODE": "stream", "REDIS_EVENT_FORMAT": "binary"}
+)
+class ProcessPageViewsStreamTest(RedisTaskTestCase):
+    """Test the stream ingest mode."""
+
+    def test_record_view_appends_to_stream(self):
+        event = make_event(self.content_type)
+        self.provider.record_view(event)
+
+        self.assertEqual(self.redis.xlen("djinsight:pageview:stream"), 1)
+        self.assertFalse(self.redis.exists(f"djinsight:pageview:{event['view_id']}"))
+
+    def test_process_page_views_drains_stream(self):
+        for i in range(5):
+            self.provider.record_view(
+                make_event(self.content_type, session_key=f"session-{i}")
+            )
+
+        processed = tasks.process_page_views(batch_size=2)
+
+        self.assertEqual(processed, 5)
+        self.assertEqual(PageViewEvent.objects.count(), 5)
+        self.assertEqual(self.redis.xlen("djinsight:pageview:stream"), 0)
+        self.assertEqual(tasks.process_page_views(), 0)
+
+    def test_process_page_views_respects_max_records(self):
+        for i in range(3):
+            self.provider.record_view(
+                make_event(self.content_type, session_key=f"session-{i}")
+            )
+
+        self.assertEqual(tasks.process_page_views(batch_size=10, max_records=2), 2)
+        self.assertEqual(tasks.process_page_views(batch_size=10, max_records=2), 1)
+
+    def test_process_page_views_reclaims_stale_entries(self):
+        self.provider.record_view(make_event(self.content_type))
+        tasks._ensure_consumer_group(
+            self.redis, "djinsight:pageview:stream", "djinsight"
+        )
+        # Another consumer reads the entry and dies before acknowledging it
+        self.redis.xreadgroup(
+            "djinsight", "dead-worker", {"djinsight:pageview:stream": ">"}
+        )
+
+        with override_settings(
+            DJINSIGHT={"REDIS_INGEST_MODE": "stream", "REDIS_STREAM_CLAIM_IDLE": 0}
+        ):
+            processed = tasks.process_page_views()
+
+        self.assertEqual(processed, 1)
+        self.assertEqual(PageViewEvent.objects.count(), 1)
+
+    def test_process_page_views_decodes_binary_events(self):
+        event = {
+            **make_event(self.content_type),
+            "content_type_id": self.content_type.id,
+        }
+        self.provider.record_and_check(event)
+
+        self.assertEqual(tasks.process_page_views(), 1)
+
+        stored = PageViewEvent.objects.get()
+        self.assertEqual(stored.content_type_id, self.content_type.id)
+        self.assertEqual(stored.url, event["url"])
+        self.assertEqual(stored.user_agent, event["user_agent"])
+        self.assertTrue(stored.is_unique)
+
+    def test_invalid_entries_are_acknowledged(self):
+        self.redis.xadd("djinsight:pageview:stream", {"d": json.dumps({"url": "/"})})
+
+        self.assertEqual(tasks.process_page_views(), 0)
+        self.assertEqual(self.redis.xlen("djinsight:pageview:stream"), 0)
+
+
+@override_settings(DJINSIGHT={"UNIQUE_VIEWS_MODE": "hll"})
+class HyperLogLogUniqueViewsTest(RedisTaskTestCase):
+    """Test persisting HyperLogLog sketches in the flusher."""
+
+    def record(self, *session_keys):
+        for session_key in session_keys:
+            self.provider.record_and_check(
+                make_event(self.content_type, session_key=session_key)
+            )
+
+    def get_stats(self):
+        return PageViewStatistics.objects.get(
+            content_type=self.content_type, object_id=1
+        )
+
+    def test_process_page_views_persists_sketches(self):
+        self.record("a", "a", "b")
+
+        tasks.process_page_views()
+
+        self.assertEqual(self.get_stats().total_views, 3)
+        self.assertEqual(self.get_stats().unique_views, 2)
+        periods = dict(
+            PageViewSketch.objects.filter(content_type=self.content_type).values_list(
+                "period", "unique_views"
+            )
+        )
+        self.assertEqual(
+            periods,
+            {PageViewSketch.ALL_TIME: 2, timezone.localdate().isoformat(): 2},
+        )
+
+    def test_unique_views_are_not_double_counted(self):
+        self.record("a", "b")
+        tasks.process_page_views()
+        self.record("a", "c")
+        tasks.process_page_views()
+
+        self.assertEqual(self.get_stats().total_views, 4)
+        self.assertEqual(self.get_stats().unique_views, 3)
+
+    def test_stored_sketch_survives_redis_loss(self):
+        self.record("a", "b")
+        tasks.process_page_views()
+
+        self.redis.flushall()
+        self.record("a", "c")
+        tasks.process_page_views()
+
+        self.assertEqual(self.get_stats().unique_views, 3)
+
+    def test_missing_sketch_leaves_counters_untouched(self):
+        counters = {
+            (self.content_type.id, 1): {"total_views": 2, "unique_views": 1},
+            (self.content_type.id, 2): {"total_views": 1, "unique_views": 1},
+        }
+        counts = {(self.content_type.id, 1, PageViewSketch.ALL_TIME): 40}
+
+        with mock.patch("djinsight.sketches.persist_sketches", return_value=counts):
+            replaced = tasks._apply_sketch_counts([], counters)
+
+        self.assertFalse(replaced)
+        self.assertEqual(counters[(self.content_type.id, 1)]["unique_views"], 1)
+        self.assertEqual(counters[(self.content_type.id, 2)]["unique_views"], 1)
+
+    def test_daily_summary_uses_sketch(self):
+        self.record("a", "a", "b")
+        tasks.process_page_views()
+        PageViewEvent.objects.update(session_key="")
+        caches["default"].clear()
+
+        tasks.generate_daily_summaries(days_back=1)
+
+        summary = PageViewSummary.objects.get(
+            content_type=self.content_type, object_id=1, date=timezone.localdate()
+        )
+        self.assertEqual(summary.unique_views, 2)
+
+
+class LiveStatsTest(RedisTaskTestCase):
+    """Test merging persisted statistics with pending Redis deltas."""
+
+    def setUp(self):
+        super().setUp()
+        self.content_type = ContentType.objects.get_for_model(ContentType)
+        self.objs = list(ContentType.objects.order_by("pk")[:2])
+        patcher = mock.patch(
+            "djinsight.registry.ProviderRegistry.get_provider",
+            return_value=self.provider,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, obj, *session_keys):
+        for session_key in session_keys:
+            self.provider.record_and_check(
+                make_event(self.content_type, object_id=obj.pk, session_key=session_key)
+            )
+
+    def test_pending_views_before_flush(self):
+        self.record(self.objs[0], "a", "a", "b")
+
+        stats = get_live_stats(self.objs[0])
+
+        self.assertEqual((stats["total_views"], stats["unique_views"]), (3, 2))
+
+    def test_flushed_views_are_not_counted_twice(self):
+        self.record(self.objs[0], "a", "b")
+        tasks.process_page_views()
+        self.record(self.objs[0], "a", "c")
+
+        stats = get_live_stats(self.objs[0])
+
+        self.assertEqual((stats["total_views"], stats["unique_views"]), (4, 3))
+        self.assertIsNotNone(stats["last_viewed_at"])
+
+    def test_pending_counters_are_removed_after_flush(self):
+        self.record(self.objs[0], "a")
+        tasks.process_page_views()
+
+        self.assertEqual(self.redis.keys("djinsight:pageview:pending*"), [])
+
+    def test_pending_expiration_is_set_once(self):
+        from djinsight.providers.redis import pending_keys
+
+        self.record(self.objs[0], "a")
+        label = f"{self.content_type.app_label}.{self.content_type.model}"
+        key = pending_keys("djinsight:pageview", label, self.objs[0].pk)[0]
+        self.redis.expire(key, 100)
+
+        self.record(self.objs[0], "b")
+        self.provider.record_view(
+            make_event(self.content_type, object_id=self.objs[0].pk, is_unique=False)
+        )
+
+        self.assertEqual(int(self.redis.get(key)), 3)
+        self.assertLessEqual(self.redis.ttl(key), 100)
+
+    @override_settings(DJINSIGHT={"REDIS_INGEST_MODE": "stream"})
+    def test_trimmed_stream_entries_are_released(self):
+        self.record(self.objs[0], "a", "b")
+        # Drop the oldest entry as XADD MAXLEN would
+        stream_key = "djinsight:pageview:stream"
+        oldest_id = self.redis.xrange(stream_key, count=1)[0][0]
+        self.redis.xdel(stream_key, oldest_id)
+
+        tasks.process_page_views()
+
+        self.assertEqual(self.redis.keys("djinsight:pageview:pending*"), [])
+        stats = get_live_stats(self.objs[0])
+        self.assertEqual((stats["total_views"], stats["unique_views"]), (1, 1))
+
+    def test_many_objects_in_one_round_trip(self):
+        self.record(self.objs[0], "a")
+        self.record(self.objs[1], "a", "b")
+
+        with mock.patch.object(self.redis, "mget", wraps=self.redis.mget) as mget:
+            stats = get_live_stats_many(self.objs)
+
+        mget.assert_called_once()
+        self.assertEqual(
+            [stats[(self.content_type.id, obj.pk)]["total_views"] for obj in self.objs],
+            [1, 2],
+        )
+
+    def test_provider_get_stats_is_merged(self):
+        label = f"{self.content_type.app_label}.{self.content_type.model}"
+        self.record(self.objs[0], "a")
+        tasks.process_page_views()
+        self.record(self.objs[0], "b")
+
+        stats = self.provider.get_stats(label, self.objs[0].pk)
+
+        self.assertEqual((stats["total_views"], stats["unique_views"]), (2, 2))
+
+    def test_provider_get_stats_ignores_cached_rows(self):
+        label = f"{self.content_type.app_label}.{self.content_type.model}"
+        self.record(self.objs[0], "a")
+        PageViewStatistics.get_cached(self.content_type.id, self.objs[0].pk)
+
+        # A flush the cache of this process never heard of
+        with mock.patch.object(tasks, "invalidate_cache"):
+            tasks.process_page_views()
+
+        stats = self.provider.get_stats(label, self.objs[0].pk)
+        self.assertEqual((stats["total_views"], stats["unique_views"]), (1, 1))
+
+
+class RedisHousekeepingTest(RedisTaskTestCase):
+    """Test the incremental Redis housekeeping sweep."""
+
+    def setUp(self):
+        super().setUp()
+        self.content_type = ContentType.objects.get_for_model(ContentType)
+        self.label = f"{self.content_type.app_label}.{self.content_type.model}"
+        self.prefix = "djinsight:pageview"
+
+    def test_unlinks_volatile_keys_without_ttl(self):
+        self.redis.sadd(f"{self.prefix}:seen:orphan", "1:1")
+        self.redis.sadd(f"{self.prefix}:seen:live", "1:1")
+        self.redis.expire(f"{self.prefix}:seen:live", 60)
+        self.redis.set(f"{self.prefix}:session:old:{self.label}:1", 1)
+        self.redis.set(f"{self.prefix}:{uuid.uuid4()}", "event")
+
+        result = tasks.redis_housekeeping()
+
+        self.assertEqual(result["orphaned"], 2)
+        self.assertEqual(result["complete"], 1)
+        self.assertEqual(len(self.redis.keys(f"{self.prefix}:*")), 2)
+        self.assertTrue(self.redis.exists(f"{self.prefix}:seen:live"))
+
+    def test_compacts_keys_of_dead_objects(self):
+        live = ContentType.objects.order_by("pk").first().pk
+        for object_id in (live, 10**6):
+            self.redis.set(f"{self.prefix}:counter:{self.label}:{object_id}", 5)
+            self.redis.set(f"{self.prefix}:unique_counter:{self.label}:{object_id}", 3)
+            self.redis.pfadd(f"{self.prefix}:hll:{self.label}:{object_id}", "a")
+        self.redis.set(f"{self.prefix}:counter:gone.model:1", 5)
+
+        result = tasks.redis_housekeeping()
+
+        self.assertEqual(result["compacted"], 4)
+        self.assertEqual(
+            sorted(self.redis.keys(f"{self.prefix}:*")),
+            sorted(
+                f"{self.prefix}:{kind}:{self.label}:{live}".encode()
+                for kind in ("counter", "unique_counter", "hll")
+            ),
+        )
+
+    @override_settings(DJINSIGHT={"TRACK_REGISTERED_ONLY": True})
+    def test_compacts_untracked_content_types(self):
+        self.redis.set(f"{self.prefix}:counter:{self.label}:1", 5)
+
+        self.assertEqual(tasks.redis_housekeeping()["compacted"], 1)
+
+    @override_settings(DJINSIGHT={"HOUSEKEEPING_SCAN_COUNT": 10})
+    def test_resumes_from_checkpoint(self):
+        for index in range(50):
+            self.redis.set(f"{self.prefix}:seen:visitor-{index}", 1)
+
+        result = tasks.redis_housekeeping(time_budget=0)
+        self.assertEqual(result["complete"], 0)
+        self.assertTrue(self.redis.exists(f"{self.prefix}:housekeeping:cursor"))
+
+        runs = 1
+        while not result["complete"]:
+            with mock.patch.object(self.redis, "scan", wraps=self.redis.scan) as scan:
+                result = tasks.redis_housekeeping(time_budget=0)
+            self.assertEqual(scan.call_count, 1)
+            runs += 1
+
+        self.assertGreater(runs, 1)
+        self.assertEqual(self.redis.keys(f"{self.prefix}:*"), [])
+
+
+class ClassifyPageViewsTest(TestCase):
+    """Test backfilling the event classification columns."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.label = f"{self.content_type.app_label}.{self.content_type.model}"
+        for referrer in ("https://t.co/abc", "https://example.org/", ""):
+            PageViewEvent.objects.create(
+                content_type=self.content_type,
+                object_id=1,
+                url="/",
+                session_key="a",
+                user_agent="Mozilla/5.0 (iPad; CPU OS 17_0 like Mac OS X)",
+                referrer=referrer,
+            )
+        PageViewEvent.objects.update(
+            device_category="", source_category="", referrer_domain=""
+        )
+
+    def test_backfill(self):
+        self.assertEqual(tasks.classify_page_views(batch_size=2), 3)
+
+        self.assertEqual(
+            sorted(
+                PageViewEvent.objects.values_list("source_category", "referrer_domain")
+            ),
+            [("direct", "direct"), ("referral", "example.org"), ("social", "t.co")],
+        )
+        self.assertFalse(
+            PageViewEvent.objects.exclude(device_category="tablet").exists()
+        )
+        self.assertEqual(tasks.classify_page_views(), 0)
+
+    def test_rebuild_rollups(self):
+        from djinsight.mcp.tools.referrers import get_traffic_sources
+
+        PageViewDimensionSummary.objects.all().delete()
+
+        tasks.run_rebuild_rollups(verbosity=0)
+
+        result = get_traffic_sources(self.label, object_id=1)
+        self.assertEqual(
+            {row["source"]: row["views"] for row in result["sources"]},
+            {"direct": 1, "social": 1, "referral": 1},
+        )
+
+
+class GenerateDailySummariesTest(TestCase):
+    """Test incremental daily summary generation."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.today = timezone.localdate()
+        self.yesterday = timezone.now() - timedelta(days=1)
+
+    def create_event(self, object_id=1, session_key="session-1", timestamp=None):
+        return PageViewEvent.objects.create(
+            content_type=self.content_type,
+            object_id=object_id,
+            url="/",
+            session_key=session_key,
+            timestamp=timestamp or timezone.now(),
+        )
+
+    def get_summary(self, object_id, date):
+        return PageViewSummary.objects.get(
+            content_type=self.content_type, object_id=object_id, date=date
+        )
+
+    def test_generates_summaries_per_object_and_day(self):
+        self.create_event(session_key="a")
+        self.create_event(session_key="a")
+        self.create_event(session_key="b")
+        self.create_event(object_id=2)
+        self.create_event(timestamp=self.yesterday)
+
+        written = tasks.generate_daily_summaries(days_back=7)
+
+        self.assertEqual(written, 3)
+        summary = self.get_summary(1, self.today)
+        self.assertEqual(summary.total_views, 3)
+        self.assertEqual(summary.unique_views, 2)
+        self.assertEqual(
+            self.get_summary(1, timezone.localdate(self.yesterday)).total_views,
+            1,
+        )
+
+    def test_only_recent_days_and_days_with_new_events_are_recomputed(self):
+        self.create_event(timestamp=timezone.now() - timedelta(days=3))
+        self.create_event(timestamp=timezone.now() - timedelta(days=4))
+        self.create_event()
+        tasks.generate_daily_summaries(days_back=7)
+
+        self.create_event(session_key="new")
+        self.create_event(timestamp=timezone.now() - timedelta(days=3))
+        written = tasks.generate_daily_summaries(days_back=7)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(self.get_summary(1, self.today).total_views, 2)
+
+    def test_late_committed_events_are_summarized(self):
+        self.create_event()
+        tasks.generate_daily_summaries(days_back=7)
+        late = self.create_event(timestamp=self.yesterday)
+        # A transaction with a higher id committed first and moved the cursor
+        ProcessingCursor.set_position(tasks.SUMMARY_CURSOR, late.id)
+
+        tasks.generate_daily_summaries(days_back=7)
+
+        self.assertEqual(
+            self.get_summary(1, timezone.localdate(self.yesterday)).total_views,
+            1,
+        )
+
+    def test_cursor_is_stored_in_the_database(self):
+        event = self.create_event()
+
+        tasks.generate_daily_summaries(days_back=7)
+
+        self.assertEqual(
+            ProcessingCursor.get_position(tasks.SUMMARY_CURSOR), event.id
+        )
+
+    def test_full_recomputes_the_window(self):
+        self.create_event(timestamp=self.yesterday)
+        self.create_event()
+        tasks.generate_daily_summaries(days_back=7)
+
+        self.assertEqual(tasks.generate_daily_summaries(days_back=7, full=True), 2)
+
+
+class CleanupOldRollupsTest(TestCase):
+    """Test pruning the rollup and sketch tables."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.now = timezone.now()
+
+    def create_rows(self, days_ago):
+        timestamp = self.now - timedelta(days=days_ago)
+        day = timezone.localdate(timestamp)
+        common = {"content_type": self.content_type, "object_id": days_ago}
+        PageViewSummary.objects.create(date=day, **common)
+        PageViewHourlySummary.objects.create(
+            hour=timestamp.replace(minute=0, second=0, microsecond=0), **common
+        )
+        PageViewDimensionSummary.objects.create(
+            date=day,
+            device_category="desktop",
+            source_category="direct",
+            referrer_domain="direct",
+            **common,
+        )
+        for period in (day.isoformat(), PageViewSketch.ALL_TIME):
+            PageViewSketch.objects.create(period=period, registers=b"", **common)
+
+    @override_settings(DJINSIGHT={"SUMMARY_RETENTION_DAYS": 30})
+    def test_cleanup_prunes_rollups_past_summary_retention(self):
+        self.create_rows(days_ago=40)
+        self.create_rows(days_ago=10)
+
+        self.assertEqual(tasks.cleanup_old_data(days_to_keep=5), 0)
+
+        for model in (
+            PageViewSummary,
+            PageViewHourlySummary,
+            PageViewDimensionSummary,
+        ):
+            self.assertEqual(
+                list(model.objects.values_list("object_id", flat=True)), [10]
+            )
+        self.assertEqual(
+            sorted(PageViewSketch.objects.values_list("object_id", "period")),
+            [
+                (10, timezone.localdate(self.now - timedelta(days=10)).isoformat()),
+                (10, PageViewSketch.ALL_TIME),
+                (40, PageViewSketch.ALL_TIME),
+            ],
+        )
+
+    def test_cleanup_reconciles_object_counts(self):
+        PageViewStatistics.objects.create(content_type=self.content_type, object_id=1)
+        ContentTypeTotals.objects.update(object_count=3)
+
+        tasks.cleanup_old_data(days_to_keep=5)
+
+        self.assertEqual(ContentTypeTotals.objects.get().object_count, 1)
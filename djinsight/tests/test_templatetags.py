@@ -0,0 +1,116 @@
+"""Tests for djinsight template tags."""
+
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+
+from djinsight.models import PageViewStatistics
+from djinsight.utils import prefetch_stats
+
+
+class StatsPrefetchTest(TestCase):
+    """Test {% stats_prefetch %} and prefetch_stats."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.items = [
+            PageViewStatistics.objects.create(
+                content_type=self.content_type,
+                object_id=1000 + i,
+                total_views=i,
+            )
+            for i in range(5)
+        ]
+        # Stats rows for the items themselves, keyed by the items' pks
+        for item in self.items[:3]:
+            PageViewStatistics.objects.filter(pk=item.pk).update(object_id=item.pk)
+            item.refresh_from_db()
+        self.request = RequestFactory().get("/")
+
+    def render(self, source, **context):
+        template = Template("{% load djinsight_tags %}" + source)
+        return template.render(Context({"request": self.request, **context}))
+
+    def test_get_for_objects_single_query(self):
+        with self.assertNumQueries(1):
+            stats = PageViewStatistics.get_for_objects(self.items)
+
+        self.assertEqual(len(stats), 5)
+        self.assertEqual(stats[(self.content_type.id, self.items[1].pk)].total_views, 1)
+        self.assertIsNone(stats[(self.content_type.id, self.items[4].pk)])
+
+    def test_get_for_objects_empty(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(PageViewStatistics.get_for_objects([]), {})
+
+    def test_list_page_costs_one_query(self):
+        source = (
+            "{% stats_prefetch items %}"
+            "{% for item in items %}{% stats obj=item %},{% endfor %}"
+        )
+
+        with self.assertNumQueries(1):
+            output = self.render(source, items=self.items)
+
+        self.assertEqual(output, "0,1,2,,,")
+
+    def test_without_prefetch_queries_per_object(self):
+        source = "{% for item in items %}{% stats obj=item %},{% endfor %}"
+
+        with self.assertNumQueries(5):
+            output = self.render(source, items=self.items)
+
+        self.assertEqual(output, "0,1,2,,,")
+
+    def test_prefetch_stats_on_request(self):
+        prefetch_stats(self.items, request=self.request)
+        source = "{% for item in items %}{% stats obj=item %},{% endfor %}"
+
+        with self.assertNumQueries(0):
+            output = self.render(source, items=self.items)
+
+        self.assertEqual(output, "0,1,2,,,")
+
+
+class TrackTagTest(TestCase):
+    """Test the batching {% track %} tag."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.items = [
+            PageViewStatistics.objects.create(
+                content_type=self.content_type, object_id=i
+            )
+            for i in (1, 2, 3)
+        ]
+        self.request = RequestFactory().get("/")
+
+    def render(self, source, **context):
+        template = Template("{% load djinsight_tags %}" + source)
+        return template.render(Context({"request": self.request, **context}))
+
+    def test_loader_rendered_once_per_request(self):
+        output = self.render(
+            "{% for item in items %}{% track obj=item %}{% endfor %}", items=self.items
+        )
+
+        self.assertEqual(output.count("window.__djinsight || []).push("), 3)
+        self.assertEqual(output.count("function sendViews"), 1)
+        self.assertIn("/djinsight/record-views/", output)
+        self.assertIn("queue.slice(sent, sent + 50)", output)
+
+        # Later templates rendered for the same request only queue objects
+        output = self.render("{% track obj=item %}", item=self.items[0])
+        self.assertNotIn("function sendViews", output)
+
+    def test_object_data_is_escaped(self):
+        with mock.patch(
+            "djinsight.templatetags.djinsight_tags.get_object_url",
+            return_value="/</script>",
+        ):
+            output = self.render("{% track obj=item %}", item=self.items[0])
+
+        self.assertNotIn("/</script>", output)
+        self.assertIn("\\u003c/script\\u003e", output)
@@ -0,0 +1,93 @@
+"""Tests for djinsight visitor trackers."""
+
+from datetime import date
+from unittest import mock
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from djinsight.trackers import SessionTracker, VisitorTracker, get_tracker
+
+
+class VisitorTrackerTest(TestCase):
+    """Test the default cookie / daily hash tracker."""
+
+    def setUp(self):
+        self.tracker = VisitorTracker()
+        self.factory = RequestFactory()
+
+    def request(self, **extra):
+        return self.factory.post("/djinsight/record-view/", **extra)
+
+    def test_is_default_tracker(self):
+        self.assertIsInstance(get_tracker(), VisitorTracker)
+
+    def test_new_visitor_gets_signed_cookie(self):
+        request = self.request()
+
+        with self.assertNumQueries(0):
+            visitor_id = self.tracker.get_visitor_id(request)
+        response = self.tracker.process_response(request, HttpResponse())
+
+        cookie = response.cookies["djinsight_vid"]
+        self.assertNotEqual(cookie.value, visitor_id)
+        self.assertTrue(cookie["httponly"])
+
+        returning = self.request()
+        returning.COOKIES[cookie.key] = cookie.value
+        self.assertEqual(self.tracker.get_visitor_id(returning), visitor_id)
+        response = self.tracker.process_response(returning, HttpResponse())
+        self.assertNotIn("djinsight_vid", response.cookies)
+
+    def test_stable_within_request(self):
+        request = self.request()
+
+        self.assertEqual(
+            self.tracker.get_visitor_id(request), self.tracker.get_visitor_id(request)
+        )
+
+    def test_tampered_cookie_is_replaced(self):
+        request = self.request()
+        request.COOKIES["djinsight_vid"] = "forged"
+
+        visitor_id = self.tracker.get_visitor_id(request)
+
+        self.assertNotEqual(visitor_id, "forged")
+
+    @override_settings(DJINSIGHT={"PRIVACY_MODE": True})
+    def test_privacy_mode_uses_daily_hash(self):
+        def visitor_id(ua="UA", ip="10.0.0.1", day=date(2026, 1, 1)):
+            request = self.request(HTTP_USER_AGENT=ua, REMOTE_ADDR=ip)
+            with mock.patch("djinsight.trackers.timezone.localdate", return_value=day):
+                return self.tracker.get_visitor_id(request)
+
+        self.assertEqual(visitor_id(), visitor_id())
+        self.assertNotEqual(visitor_id(), visitor_id(ua="Other"))
+        self.assertNotEqual(visitor_id(), visitor_id(ip="10.0.0.2"))
+        self.assertNotEqual(visitor_id(), visitor_id(day=date(2026, 1, 2)))
+        self.assertNotIn("10.0.0.1", visitor_id())
+
+        request = self.request()
+        self.tracker.get_visitor_id(request)
+        response = self.tracker.process_response(request, HttpResponse())
+        self.assertFalse(response.cookies)
+
+
+class SessionTrackerTest(TestCase):
+    """Test the legacy session tracker."""
+
+    def test_creates_session(self):
+        request = RequestFactory().post("/")
+        request.session = SessionStore()
+
+        visitor_id = SessionTracker().get_visitor_id(request)
+
+        self.assertEqual(visitor_id, request.session.session_key)
+
+    @override_settings(
+        DJINSIGHT={"SESSION_TRACKER": "djinsight.trackers.SessionTracker"}
+    )
+    def test_get_tracker_uses_setting(self):
+        self.assertIsInstance(get_tracker(), SessionTracker)
+        self.assertIs(get_tracker(), get_tracker())
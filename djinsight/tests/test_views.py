@@ -2,11 +2,14 @@
 
 import json
 
+from asgiref.sync import async_to_sync
 from django.contrib.contenttypes.models import ContentType
-from django.test import Client, TestCase
+from django.contrib.sessions.models import Session
+from django.test import AsyncRequestFactory, Client, TestCase, override_settings
 from django.urls import reverse
 
-from djinsight.models import PageViewStatistics
+from djinsight import content_types, views
+from djinsight.models import ContentTypeRegistry, PageViewEvent, PageViewStatistics
 
 
 class RecordPageViewTest(TestCase):
@@ -14,6 +17,7 @@ class RecordPageViewTest(TestCase):
 
     def setUp(self):
         """Set up test data."""
+        content_types.invalidate_registry()
         self.client = Client()
         self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
 
@@ -37,6 +41,23 @@ class RecordPageViewTest(TestCase):
         result = response.json()
         self.assertTrue(result.get("success"))
 
+    def test_record_view_does_not_create_session(self):
+        """Test that anonymous beacons don't write to the session store."""
+        data = {
+            "content_type": f"{self.content_type.app_label}.{self.content_type.model}",
+            "object_id": 1,
+            "url": "/test/",
+        }
+
+        response = self.client.post(
+            reverse("djinsight:record_page_view"),
+            data=json.dumps(data),
+            content_type="application/json",
+        )
+
+        self.assertIn("djinsight_vid", response.cookies)
+        self.assertFalse(Session.objects.exists())
+
     def test_record_view_requires_object_id(self):
         """Test that object_id is required."""
         data = {
@@ -66,3 +87,207 @@ class RecordPageViewTest(TestCase):
         )
 
         self.assertEqual(response.status_code, 400)
+
+
+class RecordPageViewRegistryTest(TestCase):
+    """Test ContentTypeRegistry enforcement in record_page_view."""
+
+    def setUp(self):
+        self.client = Client()
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        content_types.invalidate_registry()
+
+    def post(self, content_type=None):
+        data = {
+            "content_type": content_type
+            or f"{self.content_type.app_label}.{self.content_type.model}",
+            "object_id": 1,
+            "url": "/test/",
+        }
+        return self.client.post(
+            reverse("djinsight:record_page_view"),
+            data=json.dumps(data),
+            content_type="application/json",
+        )
+
+    def test_unknown_content_type_is_rejected(self):
+        response = self.post("blog.missing")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_disabled_content_type_is_ignored(self):
+        ContentTypeRegistry.objects.create(
+            content_type=self.content_type, enabled=False
+        )
+
+        response = self.post()
+
+        self.assertEqual(response.json(), {"status": "ignored"})
+        self.assertFalse(PageViewEvent.objects.exists())
+
+    def test_anonymous_tracking_disabled(self):
+        ContentTypeRegistry.objects.create(
+            content_type=self.content_type, track_anonymous=False
+        )
+
+        response = self.post()
+
+        self.assertEqual(response.json(), {"status": "ignored"})
+
+    @override_settings(DJINSIGHT={"TRACK_REGISTERED_ONLY": True, "USE_REDIS": False})
+    def test_registered_only(self):
+        self.assertEqual(self.post().json(), {"status": "ignored"})
+
+        ContentTypeRegistry.register(PageViewStatistics)
+
+        self.assertTrue(self.post().json().get("success"))
+
+
+class AsyncRecordPageViewTest(TestCase):
+    """Test the async arecord_page_view endpoint."""
+
+    def setUp(self):
+        content_types.invalidate_registry()
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.factory = AsyncRequestFactory()
+
+    def call(self, cookies=None, **data):
+        payload = {
+            "content_type": f"{self.content_type.app_label}.{self.content_type.model}",
+            "object_id": 1,
+            "url": "/test/",
+            **data,
+        }
+        request = self.factory.post(
+            "/djinsight/record-view/",
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+        request.COOKIES.update(cookies or {})
+        return async_to_sync(views.arecord_page_view)(request)
+
+    def test_records_view(self):
+        response = self.call()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(json.loads(response.content)["is_unique"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertEqual(PageViewEvent.objects.count(), 1)
+
+    def test_same_visitor_counted_once(self):
+        cookie = self.call().cookies["djinsight_vid"]
+
+        response = self.call(cookies={cookie.key: cookie.value})
+
+        self.assertFalse(json.loads(response.content)["is_unique"])
+
+    def test_requires_post(self):
+        request = self.factory.get("/djinsight/record-view/")
+
+        response = async_to_sync(views.arecord_page_view)(request)
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_unknown_content_type(self):
+        self.assertEqual(self.call(content_type="blog.missing").status_code, 400)
+
+    def test_disabled_content_type_is_ignored(self):
+        ContentTypeRegistry.objects.create(
+            content_type=self.content_type, enabled=False
+        )
+
+        response = self.call()
+
+        self.assertEqual(json.loads(response.content), {"status": "ignored"})
+
+    def test_is_csrf_exempt(self):
+        self.assertTrue(views.arecord_page_view.csrf_exempt)
+
+
+class RecordPageViewsTest(TestCase):
+    """Test the bulk record_page_views endpoint."""
+
+    def setUp(self):
+        content_types.invalidate_registry()
+        self.client = Client()
+        self.content_type = ContentType.objects.get_for_model(PageViewStatistics)
+        self.label = f"{self.content_type.app_label}.{self.content_type.model}"
+
+    def post(self, views, content_type="text/plain;charset=UTF-8"):
+        return self.client.post(
+            reverse("djinsight:record_page_views"),
+            data=json.dumps(
+                {"views": views, "referrer": "https://example.com", "user_agent": "UA"}
+            ),
+            content_type=content_type,
+        )
+
+    def view(self, object_id, **extra):
+        return {
+            "content_type": self.label,
+            "object_id": object_id,
+            "url": f"/{object_id}/",
+            **extra,
+        }
+
+    def test_records_all_views(self):
+        response = self.post([self.view(1), self.view(2), self.view(3)])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"status": "success", "recorded": 3, "ignored": 0}
+        )
+        events = PageViewEvent.objects.order_by("object_id")
+        self.assertEqual([event.object_id for event in events], [1, 2, 3])
+        self.assertEqual({event.referrer for event in events}, {"https://example.com"})
+        self.assertEqual(len({event.session_key for event in events}), 1)
+
+    def test_repeated_objects_count_once(self):
+        response = self.post([self.view(1), self.view(1)])
+
+        self.assertEqual(response.json()["recorded"], 1)
+        self.assertEqual(PageViewEvent.objects.count(), 1)
+
+    def test_untracked_views_are_ignored(self):
+        ContentTypeRegistry.objects.create(
+            content_type=ContentType.objects.get_for_model(ContentType), enabled=False
+        )
+
+        response = self.post(
+            [
+                self.view(1),
+                self.view(2, content_type="blog.missing"),
+                self.view(3, content_type="contenttypes.contenttype"),
+            ]
+        )
+
+        self.assertEqual(
+            response.json(), {"status": "success", "recorded": 1, "ignored": 2}
+        )
+
+    def test_invalid_payloads(self):
+        self.assertEqual(self.post([]).status_code, 400)
+        self.assertEqual(self.post([self.view(1, url="")]).status_code, 400)
+
+    def test_views_over_the_limit_are_ignored(self):
+        response = self.post(
+            [self.view(i) for i in range(1, views.MAX_BULK_VIEWS + 2)]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"status": "success", "recorded": views.MAX_BULK_VIEWS, "ignored": 1},
+        )
+        self.assertEqual(PageViewEvent.objects.count(), views.MAX_BULK_VIEWS)
+
+    def test_async_view(self):
+        request = AsyncRequestFactory().post(
+            "/djinsight/record-views/",
+            data=json.dumps({"views": [self.view(1), self.view(2)]}),
+            content_type="text/plain",
+        )
+        response = async_to_sync(views.arecord_page_views)(request)
+
+        self.assertEqual(json.loads(response.content)["recorded"], 2)
+        self.assertEqual(PageViewEvent.objects.count(), 2)
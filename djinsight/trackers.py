@@ -0,0 +1,118 @@
+"""Visitor identity for the tracking endpoints.
+
+A tracker turns a beacon request into the visitor id stored as
+``PageViewEvent.session_key`` and used for unique view counting. The class
+is chosen with the ``SESSION_TRACKER`` setting.
+"""
+
+import uuid
+from abc import ABC, abstractmethod
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django.utils.module_loading import import_string
+
+from djinsight.conf import djinsight_settings
+from djinsight.utils import get_client_ip
+
+COOKIE_SALT = "djinsight.trackers.visitor"
+
+_trackers = {}
+
+
+def get_tracker() -> "BaseTracker":
+    """Return the configured tracker, shared by all requests of this process."""
+    path = djinsight_settings.SESSION_TRACKER
+    tracker = _trackers.get(path)
+    if tracker is None:
+        tracker = _trackers[path] = import_string(path)()
+    return tracker
+
+
+class BaseTracker(ABC):
+    @abstractmethod
+    def get_visitor_id(self, request) -> str:
+        """Return the visitor id for a request."""
+        pass
+
+    async def aget_visitor_id(self, request) -> str:
+        """Async get_visitor_id; override when the lookup does I/O."""
+        return self.get_visitor_id(request)
+
+    def process_response(self, request, response):
+        """Attach whatever the tracker needs to the response (e.g. a cookie)."""
+        return response
+
+
+class VisitorTracker(BaseTracker):
+    """
+    Default tracker that never touches the session store.
+
+    The visitor id comes from a signed first-party cookie, issued on the
+    first beacon. In PRIVACY_MODE no cookie is set; the id is a keyed hash of
+    the client IP and user agent that changes every day, so visitors can't
+    be followed across days.
+    """
+
+    new_id_attr = "_djinsight_new_visitor_id"
+
+    def get_visitor_id(self, request) -> str:
+        if djinsight_settings.PRIVACY_MODE:
+            return self._daily_hash(request)
+
+        name = djinsight_settings.VISITOR_COOKIE_NAME
+        visitor_id = request.get_signed_cookie(name, default=None, salt=COOKIE_SALT)
+        if not visitor_id:
+            visitor_id = getattr(request, self.new_id_attr, None) or uuid.uuid4().hex
+            setattr(request, self.new_id_attr, visitor_id)
+        return visitor_id
+
+    def process_response(self, request, response):
+        visitor_id = getattr(request, self.new_id_attr, None)
+        if visitor_id:
+            response.set_signed_cookie(
+                djinsight_settings.VISITOR_COOKIE_NAME,
+                visitor_id,
+                salt=COOKIE_SALT,
+                max_age=djinsight_settings.VISITOR_COOKIE_AGE,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    @staticmethod
+    def _daily_hash(request) -> str:
+        value = ":".join(
+            [
+                timezone.localdate().isoformat(),
+                get_client_ip(request),
+                request.META.get("HTTP_USER_AGENT", ""),
+            ]
+        )
+        return salted_hmac(COOKIE_SALT, value, algorithm="sha256").hexdigest()[:32]
+
+
+class SessionTracker(BaseTracker):
+    """
+    Legacy tracker that uses the Django session key.
+
+    Creates a session for visitors that don't have one, which writes to the
+    session store on their first beacon.
+    """
+
+    def get_visitor_id(self, request) -> str:
+        session = request.session
+        if not session.session_key:
+            session.create()
+        return session.session_key or str(uuid.uuid4())
+
+    async def aget_visitor_id(self, request) -> str:
+        session = request.session
+        if not session.session_key:
+            if hasattr(session, "acreate"):
+                await session.acreate()
+            else:
+                await sync_to_async(session.create)()
+        return session.session_key or str(uuid.uuid4())
@@ -1,10 +1,19 @@
 from django.urls import path
 
 from djinsight import views
+from djinsight.conf import djinsight_settings
 
 app_name = "djinsight"
 
+if djinsight_settings.USE_ASYNC:
+    record_page_view = views.arecord_page_view
+    record_page_views = views.arecord_page_views
+else:
+    record_page_view = views.record_page_view
+    record_page_views = views.record_page_views
+
 urlpatterns = [
-    path("record-view/", views.record_page_view, name="record_page_view"),
+    path("record-view/", record_page_view, name="record_page_view"),
+    path("record-views/", record_page_views, name="record_page_views"),
     path("page-stats/", views.get_page_stats, name="get_page_stats"),
 ]
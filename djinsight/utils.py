@@ -63,3 +63,49 @@ def check_stats_permission(request) -> bool:
             return user.is_authenticated and user.is_staff
         return False
     return True
+
+
+PREFETCHED_STATS_KEY = "_djinsight_stats"
+
+
+def prefetch_stats(objects, request=None) -> dict:
+    """
+    Load PageViewStatistics for many objects with one query.
+
+    When a request is given the result is kept on it, so every
+    ``{% stats %}`` tag rendered for these objects reuses it instead of
+    querying again.
+    """
+    from djinsight.models import PageViewStatistics
+
+    stats = PageViewStatistics.get_for_objects(objects)
+    if request is not None:
+        prefetched = getattr(request, PREFETCHED_STATS_KEY, None)
+        if prefetched is None:
+            prefetched = {}
+            setattr(request, PREFETCHED_STATS_KEY, prefetched)
+        prefetched.update(stats)
+    return stats
+
+
+def get_prefetched_stats(obj, context=None):
+    """
+    Return (found, stats) for an object from a previous ``prefetch_stats`` call.
+
+    Looks in the template context first, then on the request.
+    """
+    if context is None:
+        return False, None
+
+    from django.contrib.contenttypes.models import ContentType
+
+    key = (ContentType.objects.get_for_model(obj).id, obj.pk)
+    sources = [context.get(PREFETCHED_STATS_KEY)]
+    request = context.get("request")
+    if request is not None:
+        sources.append(getattr(request, PREFETCHED_STATS_KEY, None))
+
+    for prefetched in sources:
+        if prefetched and key in prefetched:
+            return True, prefetched[key]
+    return False, None
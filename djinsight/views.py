@@ -2,21 +2,28 @@ import json
 import logging
 import uuid
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.http import JsonResponse
+from django.http import HttpResponseNotAllowed, JsonResponse
 from django.utils import timezone
+from django.utils.cache import add_never_cache_headers
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
+from djinsight import content_types
 from djinsight.conf import djinsight_settings
+from djinsight.content_types import get_content_type_id, should_track, split_label
 from djinsight.registry import ProviderRegistry
+from djinsight.trackers import get_tracker
 from djinsight.utils import get_client_ip
 
 logger = logging.getLogger(__name__)
 
+MAX_BULK_VIEWS = 50
+
 
 def validate_view_data(data):
     required_fields = ["object_id", "content_type", "url"]
@@ -43,6 +50,64 @@ def validate_view_data(data):
     return True
 
 
+def parse_bulk_views(body):
+    """
+    Validate a bulk beacon body and return one payload per tracked object.
+
+    The body is {"views": [...], "referrer": ..., "user_agent": ...}; the
+    page-level referrer and user agent apply to every view. Repeated objects
+    are only counted once, and views past the first MAX_BULK_VIEWS are
+    dropped rather than failing the whole beacon.
+
+    Returns:
+        tuple: The view payloads and the number of views dropped
+    """
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        raise ValidationError("Invalid JSON")
+
+    views = payload.get("views") if isinstance(payload, dict) else None
+    if not isinstance(views, list) or not views:
+        raise ValidationError("Field 'views' must be a non-empty list")
+    dropped = max(len(views) - MAX_BULK_VIEWS, 0)
+    views = views[:MAX_BULK_VIEWS]
+
+    shared = {
+        "referrer": payload.get("referrer") or "",
+        "user_agent": payload.get("user_agent") or "",
+    }
+    result = []
+    seen = set()
+    for view in views:
+        if not isinstance(view, dict):
+            raise ValidationError("Each view must be an object")
+        data = {**shared, **view}
+        validate_view_data(data)
+
+        key = (data["content_type"], int(data["object_id"]))
+        if key not in seen:
+            seen.add(key)
+            result.append(data)
+    return result, dropped
+
+
+def build_event_data(request, data, session_key, content_type_id):
+    """Build the buffered event for a validated beacon payload."""
+    return {
+        "view_id": str(uuid.uuid4()),
+        "content_type": ".".join(split_label(data["content_type"])),
+        "content_type_id": content_type_id,
+        "object_id": int(data["object_id"]),
+        "url": data["url"],
+        "session_key": session_key,
+        "ip_address": get_client_ip(request),
+        "user_agent": data.get("user_agent", "")[:1000],
+        "referrer": data.get("referrer", "")[:500],
+        "timestamp": int(timezone.now().timestamp()),
+    }
+
+
 @csrf_exempt
 @require_POST
 @never_cache
@@ -63,47 +128,219 @@ def record_page_view(request):
         except ValidationError as e:
             return JsonResponse({"status": "error", "message": str(e)}, status=400)
 
-        object_id = int(data["object_id"])
-        content_type_str = data["content_type"]
-        url = data["url"]
-        referrer = data.get("referrer", "")[:500]
-        user_agent = data.get("user_agent", "")[:1000]
+        content_type_id = get_content_type_id(data["content_type"])
+        if content_type_id is None:
+            return JsonResponse(
+                {"status": "error", "message": "Unknown content type"}, status=400
+            )
+        if not should_track(content_type_id, getattr(request, "user", None)):
+            return JsonResponse({"status": "ignored"}, status=200)
+
+        tracker = get_tracker()
+        session_key = tracker.get_visitor_id(request)
+        event_data = build_event_data(request, data, session_key, content_type_id)
+        provider = ProviderRegistry.get_provider()
+        result = provider.record_and_check(event_data)
 
-        session_key = request.session.session_key
-        if not session_key:
-            request.session.create()
-            session_key = request.session.session_key or str(uuid.uuid4())
+        logger.info(
+            f"View recorded: object_id={event_data['object_id']}, "
+            f"view_id={event_data['view_id']}, unique={result.get('is_unique')}"
+        )
 
-        ip_address = get_client_ip(request)
-        view_id = str(uuid.uuid4())
-        timestamp = int(timezone.now().timestamp())
+        return tracker.process_response(request, JsonResponse(result))
 
-        provider = ProviderRegistry.get_provider()
-        is_unique = provider.check_unique_view(session_key, content_type_str, object_id)
-
-        event_data = {
-            "view_id": view_id,
-            "content_type": content_type_str,
-            "object_id": object_id,
-            "url": url,
-            "session_key": session_key,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-            "referrer": referrer,
-            "timestamp": timestamp,
-            "is_unique": is_unique,
+    except Exception as e:
+        logger.error(f"Error in record_page_view: {e}")
+        return JsonResponse(
+            {"status": "error", "message": "Internal server error"}, status=500
+        )
+
+
+@csrf_exempt
+@require_POST
+@never_cache
+def record_page_views(request):
+    """Record every object tracked on a page from one beacon."""
+    if not djinsight_settings.ENABLE_TRACKING:
+        return JsonResponse({"status": "disabled"}, status=200)
+
+    try:
+        try:
+            views, dropped = parse_bulk_views(request.body)
+        except ValidationError as e:
+            return JsonResponse({"status": "error", "message": e.message}, status=400)
+
+        user = getattr(request, "user", None)
+        accepted = []
+        for data in views:
+            content_type_id = get_content_type_id(data["content_type"])
+            if content_type_id is not None and should_track(content_type_id, user):
+                accepted.append((data, content_type_id))
+        if not accepted:
+            return JsonResponse({"status": "ignored"}, status=200)
+
+        tracker = get_tracker()
+        session_key = tracker.get_visitor_id(request)
+        events = [
+            build_event_data(request, data, session_key, content_type_id)
+            for data, content_type_id in accepted
+        ]
+        results = ProviderRegistry.get_provider().record_many(events)
+        response = _bulk_response(views, events, results, dropped)
+        return tracker.process_response(request, response)
+
+    except Exception as e:
+        logger.error(f"Error in record_page_views: {e}")
+        return JsonResponse(
+            {"status": "error", "message": "Internal server error"}, status=500
+        )
+
+
+def _bulk_response(views, events, results, dropped=0):
+    recorded = sum(
+        1
+        for result in results
+        if result.get("success") or result.get("status") == "success"
+    )
+    logger.info(f"Views recorded: {recorded} of {len(views) + dropped}")
+    return JsonResponse(
+        {
+            "status": "success",
+            "recorded": recorded,
+            "ignored": len(views) - len(events) + dropped,
         }
+    )
+
+
+async def _aget_user(request):
+    if hasattr(request, "auser"):
+        return await request.auser()
+    if hasattr(request, "user"):
+        return await sync_to_async(
+            lambda: request.user if request.user.is_authenticated else None
+        )()
+    return None
+
+
+async def _ashould_track(request, content_type_id):
+    await content_types.arefresh_registry()
+    entry = content_types.get_registry().get(content_type_id)
+    if (
+        entry is None
+        or not entry.enabled
+        or entry.track_anonymous == entry.track_authenticated
+    ):
+        # The user doesn't change the decision, so don't load it
+        return should_track(content_type_id)
+    return should_track(content_type_id, await _aget_user(request))
+
+
+async def arecord_page_view(request):
+    """Async variant of record_page_view, used when USE_ASYNC is enabled."""
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
 
-        result = provider.record_view(event_data)
+    response = await _arecord_page_view(request)
+    add_never_cache_headers(response)
+    return response
+
+
+# Set directly: csrf_exempt only wraps coroutine functions since Django 5.0
+arecord_page_view.csrf_exempt = True
+
+
+async def arecord_page_views(request):
+    """Async variant of record_page_views, used when USE_ASYNC is enabled."""
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    response = await _arecord_page_views(request)
+    add_never_cache_headers(response)
+    return response
+
+
+arecord_page_views.csrf_exempt = True
+
+
+async def _arecord_page_views(request):
+    if not djinsight_settings.ENABLE_TRACKING:
+        return JsonResponse({"status": "disabled"}, status=200)
+
+    try:
+        try:
+            views, dropped = parse_bulk_views(request.body)
+        except ValidationError as e:
+            return JsonResponse({"status": "error", "message": e.message}, status=400)
+
+        accepted = []
+        for data in views:
+            content_type_id = await content_types.aget_content_type_id(
+                data["content_type"]
+            )
+            if content_type_id is not None and await _ashould_track(
+                request, content_type_id
+            ):
+                accepted.append((data, content_type_id))
+        if not accepted:
+            return JsonResponse({"status": "ignored"}, status=200)
+
+        tracker = get_tracker()
+        session_key = await tracker.aget_visitor_id(request)
+        events = [
+            build_event_data(request, data, session_key, content_type_id)
+            for data, content_type_id in accepted
+        ]
+        results = await ProviderRegistry.get_async_provider().record_many(events)
+        response = _bulk_response(views, events, results, dropped)
+        return tracker.process_response(request, response)
+
+    except Exception as e:
+        logger.error(f"Error in arecord_page_views: {e}")
+        return JsonResponse(
+            {"status": "error", "message": "Internal server error"}, status=500
+        )
+
+
+async def _arecord_page_view(request):
+    if not djinsight_settings.ENABLE_TRACKING:
+        return JsonResponse({"status": "disabled"}, status=200)
+
+    try:
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse(
+                {"status": "error", "message": "Invalid JSON"}, status=400
+            )
+
+        try:
+            validate_view_data(data)
+        except ValidationError as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+        content_type_id = await content_types.aget_content_type_id(data["content_type"])
+        if content_type_id is None:
+            return JsonResponse(
+                {"status": "error", "message": "Unknown content type"}, status=400
+            )
+        if not await _ashould_track(request, content_type_id):
+            return JsonResponse({"status": "ignored"}, status=200)
+
+        tracker = get_tracker()
+        session_key = await tracker.aget_visitor_id(request)
+        event_data = build_event_data(request, data, session_key, content_type_id)
+        provider = ProviderRegistry.get_async_provider()
+        result = await provider.record_and_check(event_data)
 
         logger.info(
-            f"View recorded: object_id={object_id}, view_id={view_id}, unique={is_unique}"
+            f"View recorded: object_id={event_data['object_id']}, "
+            f"view_id={event_data['view_id']}, unique={result.get('is_unique')}"
         )
 
-        return JsonResponse(result)
+        return tracker.process_response(request, JsonResponse(result))
 
     except Exception as e:
-        logger.error(f"Error in record_page_view: {e}")
+        logger.error(f"Error in arecord_page_view: {e}")
         return JsonResponse(
             {"status": "error", "message": "Internal server error"}, status=500
         )
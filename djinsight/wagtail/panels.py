@@ -1,6 +1,7 @@
 """Homepage dashboard panels for Wagtail admin."""
 
-from django.db.models import Sum
+from datetime import timedelta
+
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -8,7 +9,8 @@ from django.utils.translation import gettext_lazy as _
 from wagtail.admin.site_summary import SummaryItem
 from wagtail.admin.ui.components import Component
 
-from djinsight.models import PageViewEvent, PageViewStatistics
+from djinsight.dashboard import daily_views
+from djinsight.models import ContentTypeTotals, PageViewStatistics
 
 
 class TotalViewsSummaryItem(SummaryItem):
@@ -18,11 +20,8 @@ class TotalViewsSummaryItem(SummaryItem):
     template_name = "djinsight/wagtail/panels/summary_item.html"
 
     def get_context_data(self, parent_context):
-        total = PageViewStatistics.objects.aggregate(
-            total=Sum("total_views")
-        )["total"] or 0
         return {
-            "total_views": total,
+            "total_views": ContentTypeTotals.get_site().total_views,
             "label": _("Total views"),
         }
 
@@ -34,11 +33,8 @@ class UniqueViewsSummaryItem(SummaryItem):
     template_name = "djinsight/wagtail/panels/summary_item.html"
 
     def get_context_data(self, parent_context):
-        total = PageViewStatistics.objects.aggregate(
-            total=Sum("unique_views")
-        )["total"] or 0
         return {
-            "total_views": total,
+            "total_views": ContentTypeTotals.get_site().unique_views,
             "label": _("Unique views"),
         }
 
@@ -50,13 +46,16 @@ class AnalyticsPanel(Component):
     template_name = "djinsight/wagtail/panels/analytics_panel.html"
 
     def get_context_data(self, parent_context):
-        from datetime import timedelta
-
-        from django.contrib.contenttypes.models import ContentType
-        from django.db.models.functions import TruncDate
+        if not ContentTypeTotals.get_site().total_views:
+            return {
+                "top_pages": [],
+                "chart_labels": [],
+                "chart_data": [],
+                "total_week_views": 0,
+            }
 
-        now = timezone.now()
-        week_ago = now - timedelta(days=7)
+        today = timezone.localdate()
+        week_start = today - timedelta(days=6)
 
         # Top 5 pages by views
         top_pages = list(
@@ -89,33 +88,15 @@ class AnalyticsPanel(Component):
                 "edit_url": edit_url,
             })
 
-        # 7-day trend data for mini chart
-        daily_views = (
-            PageViewEvent.objects.filter(timestamp__gte=week_ago)
-            .annotate(day=TruncDate("timestamp"))
-            .values("day")
-            .annotate(views=Sum("id"))  # Count via annotation
-            .order_by("day")
-        )
-
-        # Build complete 7-day series (fill gaps with 0)
-        from django.db.models import Count
-
-        daily_views = (
-            PageViewEvent.objects.filter(timestamp__gte=week_ago)
-            .annotate(day=TruncDate("timestamp"))
-            .values("day")
-            .annotate(views=Count("id"))
-            .order_by("day")
-        )
-        views_by_day = {entry["day"]: entry["views"] for entry in daily_views}
+        # 7-day trend data for mini chart, from the daily and hourly rollups
+        views_by_day = daily_views(start_date=week_start, end_date=today)
 
         chart_labels = []
         chart_data = []
         for i in range(7):
-            day = (week_ago + timedelta(days=i)).date()
+            day = week_start + timedelta(days=i)
             chart_labels.append(day.strftime("%a"))
-            chart_data.append(views_by_day.get(day, 0))
+            chart_data.append(views_by_day.get(day, (0, 0))[0])
 
         return {
             "top_pages": top_pages_data,
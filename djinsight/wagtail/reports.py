@@ -1,16 +1,14 @@
 """Analytics dashboard view for Wagtail admin."""
 
 import json
-from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime
 
 from django import forms
 from django.apps import apps
 from django.contrib.auth.views import redirect_to_login
 from django.contrib.contenttypes.models import ContentType
 from django.core.paginator import Paginator
-from django.db.models import Count, Sum
-from django.db.models.functions import TruncDate
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import TemplateView
@@ -19,7 +17,8 @@ from wagtail.admin.admin_url_finder import AdminURLFinder
 from wagtail.admin.views.generic.base import WagtailAdminTemplateMixin
 from wagtail.admin.widgets.datetime import AdminDateInput
 
-from djinsight.models import PageViewEvent, PageViewStatistics
+from djinsight.dashboard import PERIOD_PRESETS, get_dashboard_data
+from djinsight.models import PageViewStatistics
 
 
 class AnalyticsFilterForm(forms.Form):
@@ -63,13 +62,6 @@ class AnalyticsFilterForm(forms.Form):
 
 PAGE_SIZE = 25
 
-PERIOD_PRESETS = {
-    "today": timedelta(days=1),
-    "week": timedelta(days=7),
-    "month": timedelta(days=30),
-    "year": timedelta(days=365),
-}
-
 
 class AnalyticsDashboardView(WagtailAdminTemplateMixin, TemplateView):
     """Combined analytics dashboard: page views + traffic sources + devices."""
@@ -126,7 +118,9 @@ class AnalyticsDashboardView(WagtailAdminTemplateMixin, TemplateView):
 
         # Available content types for filter
         tracked_cts = (
-            PageViewStatistics.objects.values("content_type__app_label", "content_type__model")
+            PageViewStatistics.objects.values(
+                "content_type__app_label", "content_type__model"
+            )
             .distinct()
             .order_by("content_type__app_label", "content_type__model")
         )
@@ -147,31 +141,36 @@ class AnalyticsDashboardView(WagtailAdminTemplateMixin, TemplateView):
         date_from, date_to, period = self._get_date_range()
         ct_filter = self.request.GET.get("content_type", "")
 
-        # --- Page Views table ---
-        qs = PageViewStatistics.objects.select_related("content_type").order_by("-total_views")
-
-        if date_from:
-            qs = qs.filter(last_viewed_at__gte=date_from)
-        if date_to:
-            qs = qs.filter(last_viewed_at__lte=date_to)
-
+        ct = None
         if ct_filter:
             try:
                 app_label, model = ct_filter.split(".")
                 ct = ContentType.objects.get_by_natural_key(app_label, model)
-                qs = qs.filter(content_type=ct)
             except (ValueError, ContentType.DoesNotExist):
                 pass
 
-        aggregates = qs.aggregate(
-            total_views=Sum("total_views"),
-            total_unique=Sum("unique_views"),
+        # Totals, chart, sources and devices come from the rollups, or from
+        # the precomputed snapshot for preset periods
+        data = get_dashboard_data(period, ct, date_from, date_to)
+
+        # --- Page Views table ---
+        qs = PageViewStatistics.objects.select_related("content_type").order_by(
+            "-total_views"
         )
-        context["total_views"] = aggregates["total_views"] or 0
-        context["total_unique"] = aggregates["total_unique"] or 0
-        context["total_objects"] = qs.count()
 
-        # Pagination
+        if date_from:
+            qs = qs.filter(last_viewed_at__gte=date_from)
+        if date_to:
+            qs = qs.filter(last_viewed_at__lte=date_to)
+        if ct:
+            qs = qs.filter(content_type=ct)
+
+        context["total_views"] = data["total_views"]
+        context["total_unique"] = data["total_unique"]
+        context["total_objects"] = data["total_objects"]
+
+        # The table filters on last_viewed_at, which the snapshot window does
+        # not match, so the paginator counts the queryset itself
         paginator = Paginator(qs, PAGE_SIZE)
         page_number = self.request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
@@ -181,79 +180,20 @@ class AnalyticsDashboardView(WagtailAdminTemplateMixin, TemplateView):
 
         context["current_period"] = period
 
-        # --- Event filters (shared by chart, traffic sources, devices) ---
-        event_filters = {}
-        if date_from:
-            event_filters["timestamp__gte"] = date_from
-        if date_to:
-            event_filters["timestamp__lte"] = date_to
-        if ct_filter:
-            try:
-                app_label, model = ct_filter.split(".")
-                ct = ContentType.objects.get_by_natural_key(app_label, model)
-                event_filters["content_type"] = ct
-            except (ValueError, ContentType.DoesNotExist):
-                pass
-
         # --- Daily chart data (views + unique) ---
-        daily_events = (
-            PageViewEvent.objects.filter(**event_filters)
-            .annotate(day=TruncDate("timestamp"))
-            .values("day")
-            .annotate(
-                total=Count("id"),
-                unique=Count("session_key", distinct=True),
-            )
-            .order_by("day")
-        )
-        views_by_day = {entry["day"]: entry for entry in daily_events}
-
-        # Build complete series filling gaps with 0
-
-        if date_from and date_to:
-            start_date = date_from.date() if hasattr(date_from, "date") else date_from
-            end_date = date_to.date() if hasattr(date_to, "date") else date_to
-        elif date_from:
-            start_date = date_from.date() if hasattr(date_from, "date") else date_from
-            end_date = timezone.now().date()
-        elif views_by_day:
-            start_date = min(views_by_day.keys())
-            end_date = max(views_by_day.keys())
-        else:
-            start_date = (timezone.now() - timedelta(days=30)).date()
-            end_date = timezone.now().date()
-
-        chart_labels = []
-        chart_views = []
-        chart_unique = []
-        current = start_date
-        while current <= end_date:
-            chart_labels.append(current.strftime("%Y-%m-%d"))
-            entry = views_by_day.get(current, {})
-            chart_views.append(entry.get("total", 0))
-            chart_unique.append(entry.get("unique", 0))
-            current += timedelta(days=1)
-
-        context["chart_labels_json"] = json.dumps(chart_labels)
-        context["chart_views_json"] = json.dumps(chart_views)
-        context["chart_unique_json"] = json.dumps(chart_unique)
+        context["chart_labels_json"] = json.dumps(data["chart"]["labels"])
+        context["chart_views_json"] = json.dumps(data["chart"]["views"])
+        context["chart_unique_json"] = json.dumps(data["chart"]["unique"])
 
         # Build query string for pagination links (without page param)
         qs_params = self.request.GET.copy()
         qs_params.pop("page", None)
         context["pagination_qs"] = qs_params.urlencode()
 
-        # --- Traffic Sources & Devices ---
-        events = PageViewEvent.objects.filter(**event_filters)
-
         # Traffic sources
-        source_counter = Counter()
-        for referrer in events.values_list("referrer", flat=True).iterator():
-            source_counter[self._classify_referrer(referrer)] += 1
-
-        source_total = sum(source_counter.values())
+        source_total = sum(views for _name, views in data["sources"])
         context["sources"] = []
-        for name, views in source_counter.most_common():
+        for name, views in data["sources"]:
             pct = views / source_total * 100 if source_total else 0
             context["sources"].append({
                 "source": name,
@@ -264,13 +204,9 @@ class AnalyticsDashboardView(WagtailAdminTemplateMixin, TemplateView):
         context["source_total"] = source_total
 
         # Device breakdown
-        device_counter = Counter()
-        for ua in events.values_list("user_agent", flat=True).iterator():
-            device_counter[self._classify_device(ua)] += 1
-
-        device_total = sum(device_counter.values())
+        device_total = sum(views for _name, views in data["devices"])
         context["devices"] = []
-        for name, views in device_counter.most_common():
+        for name, views in data["devices"]:
             pct = views / device_total * 100 if device_total else 0
             context["devices"].append({
                 "device": name,
@@ -350,29 +286,3 @@ class AnalyticsDashboardView(WagtailAdminTemplateMixin, TemplateView):
         "bot": _("Bot"),
         "unknown": _("Unknown"),
     }
-
-    @staticmethod
-    def _classify_referrer(referrer):
-        if not referrer:
-            return "direct"
-        referrer = referrer.lower()
-        search = ["google.", "bing.", "yahoo.", "duckduckgo.", "baidu.", "yandex."]
-        social = ["facebook.", "twitter.", "t.co", "instagram.", "linkedin.", "reddit.", "youtube."]
-        if any(s in referrer for s in search):
-            return "search"
-        if any(s in referrer for s in social):
-            return "social"
-        return "referral"
-
-    @staticmethod
-    def _classify_device(user_agent):
-        if not user_agent:
-            return "unknown"
-        ua = user_agent.lower()
-        if any(bot in ua for bot in ["bot", "spider", "crawler", "slurp"]):
-            return "bot"
-        if any(m in ua for m in ["iphone", "android", "mobile"]):
-            return "mobile"
-        if any(t in ua for t in ["ipad", "tablet"]):
-            return "tablet"
-        return "desktop"
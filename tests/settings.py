@@ -1,3 +1,5 @@
+import os
+
 SECRET_KEY = "test-secret-key-for-djinsight"
 DEBUG = True
 
@@ -17,6 +19,14 @@ DATABASES = {
     }
 }
 
+# Run the suite against PostgreSQL (connection taken from the PG* environment
+# variables) to cover the partitioning code paths
+if os.environ.get("DJINSIGHT_TEST_DATABASE") == "postgresql":
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("PGDATABASE", "djinsight"),
+    }
+
 DJINSIGHT = {
     "ENABLE_TRACKING": True,
     "USE_REDIS": False,